@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""포트 발견 엔진 벤치마크: 내장 connect 엔진 vs rustscan (루프백, 외부 네트워크 불필요)
+
+127.0.0.1 ~ 127.0.0.N(리눅스는 127/8 전체가 루프백)에 호스트마다 임의 포트 K개를 열고
+전체 포트(1-65535)를 스캔해 소요 시간, connect/s, 정확도(열어 둔 포트 발견 여부)를 비교한다.
+- connect: ConnectScanner.iter_open (첫 오픈 포트까지 시간 포함)
+- rustscan: rustscan -g -a <호스트들> (PATH에 있을 때만, benchmarks/stubs 스텁은 제외)
+
+루프백은 닫힌 포트가 즉시 RST를 돌려주므로 엔진 자체의 처리량 상한을 잰다.
+실제 네트워크에서는 응답 없는 포트의 타임아웃이 소요 시간을 지배한다.
+
+Usage:
+    python benchmarks/bench_connect_scan.py --hosts 8
+    python benchmarks/bench_connect_scan.py --hosts 4 --sockets 8192 --ports 1-10000
+"""
+import argparse
+import asyncio
+import random
+import resource
+import shutil
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+from phases.phase2 import parse_rustscan_grepable  # noqa: E402
+from utils.connect_scan import DEFAULT_MAX_SOCKETS, ConnectScanner  # noqa: E402
+from utils.subprocess_runner import run_command  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="connect 엔진 vs rustscan 포트 발견 벤치마크 (루프백)")
+    parser.add_argument("--hosts", type=int, default=8, help="루프백 호스트 수 (127.0.0.1~N, 기본값: 8)")
+    parser.add_argument("--open-ports", type=int, default=5, help="호스트당 열어 둘 포트 수 (기본값: 5)")
+    parser.add_argument("--ports", default="1-65535", help="스캔 포트 범위 (기본값: 1-65535)")
+    parser.add_argument(
+        "--sockets", type=int, default=DEFAULT_MAX_SOCKETS,
+        help=f"connect 엔진 동시 소켓 수 / rustscan batch (기본값: {DEFAULT_MAX_SOCKETS})",
+    )
+    parser.add_argument("--timeout", type=int, default=1000, help="포트별 타임아웃 ms (기본값: 1000)")
+    parser.add_argument("--seed", type=int, default=1, help="열린 포트 선택 시드")
+    return parser.parse_args()
+
+
+def port_range(spec: str) -> range:
+    """'A-B' 포트 범위"""
+    first, _, last = spec.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+async def open_listeners(hosts: list[str], ports: range, per_host: int, seed: int) -> tuple[list, dict]:
+    """호스트마다 범위 안의 임의 포트에 리스너 생성 (사용 중인 포트는 건너뜀)"""
+    rng = random.Random(seed)
+    servers, expected = [], {}
+    for host in hosts:
+        expected[host] = set()
+        while len(expected[host]) < per_host:
+            port = rng.choice(ports)
+            try:
+                servers.append(await asyncio.start_server(lambda r, w: w.close(), host, port))
+            except OSError:
+                continue
+            expected[host].add(port)
+    return servers, expected
+
+
+def report(name: str, elapsed: float, attempts: int, found: dict, expected: dict, extra: str = "") -> None:
+    """결과 1줄 출력 (missed: 열어 둔 포트를 못 찾은 수)"""
+    missed = sum(len(ports - set(found.get(host, []))) for host, ports in expected.items())
+    print(
+        f"  {name:<9} {elapsed:7.2f}s  {attempts / elapsed:9,.0f} connect/s  "
+        f"missed={missed}/{sum(map(len, expected.values()))}{extra}"
+    )
+
+
+async def bench_connect(hosts: list[str], ports: range, args: argparse.Namespace, expected: dict) -> None:
+    """내장 connect 엔진"""
+    scanner = ConnectScanner(args.sockets)
+    found: dict[str, list[int]] = {}
+    first = None
+    start = time.perf_counter()
+    async for host, port in scanner.iter_open(hosts, ports, timeout_ms=args.timeout):
+        first = first or time.perf_counter() - start
+        found.setdefault(host, []).append(port)
+    elapsed = time.perf_counter() - start
+    stats = scanner.stats
+    report(
+        "connect", elapsed, stats.attempts, found, expected,
+        f"  first-open={first or 0:.2f}s  filtered={stats.filtered} errors={stats.errors}",
+    )
+
+
+async def bench_rustscan(hosts: list[str], ports: range, args: argparse.Namespace, expected: dict) -> None:
+    """rustscan -g (설치된 경우만)"""
+    rustscan = shutil.which("rustscan")
+    if rustscan is None or Path(rustscan).resolve().parent == BENCH_DIR / "stubs":
+        print("  rustscan  (PATH에 없음, 건너뜀)")
+        return
+    cmd = [
+        rustscan, "-a", ",".join(hosts), "-r", f"{ports.start}-{ports.stop - 1}",
+        "-b", str(args.sockets), "-t", str(args.timeout), "--ulimit", str(args.sockets + 1024), "-g",
+    ]
+    start = time.perf_counter()
+    result = await run_command(cmd, timeout=3600)
+    elapsed = time.perf_counter() - start
+    found = parse_rustscan_grepable(result.stdout)
+    report("rustscan", elapsed, len(hosts) * len(ports), found, expected)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """리스너 준비 후 엔진별 1회 측정"""
+    hosts = [f"127.0.0.{i}" for i in range(1, args.hosts + 1)]
+    ports = port_range(args.ports)
+    servers, expected = await open_listeners(hosts, ports, args.open_ports, args.seed)
+    try:
+        print(f"{len(hosts)}개 호스트 × {len(ports):,}개 포트 = {len(hosts) * len(ports):,} connect")
+        await bench_connect(hosts, ports, args, expected)
+        await bench_rustscan(hosts, ports, args, expected)
+    finally:
+        for server in servers:
+            server.close()
+
+
+def main() -> int:
+    """벤치마크 진입점"""
+    args = parse_args()
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = min(hard, args.sockets + 1024)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""nmap 호스트 발견 출력 파서 벤치마크 (네트워크 불필요)
+
+합성 nmap -sn 출력(-oG, -oX)을 메모리에 만들고 다음 파서의 처리량을 비교한다.
+- legacy-regex: 기존 방식 ("Status: Up" 포함 검사 + 줄마다 re.search, IPv4 전용)
+- grepable-line: iter_grepable_hosts 줄 단위 (CommandStream처럼 줄이 하나씩 도착하는 경우)
+- grepable-stream: GrepableStreamParser 청크 단위
+- xml-stream: XmlStreamParser 청크 단위 (MAC/reason/srtt 포함)
+- xml-file: parse_xml_file (Phase 1 샤드 종료 후 스레드에서 -oX 파일 파싱)
+
+--subprocess: 출력을 파일로 쓰고 cat 자식 프로세스에서 읽어 Phase 1 경로 전체를 측정
+- legacy-lines: stream_command 줄마다 await + 기존 정규식 (-oG)
+- grepable-chunks: stream_command_chunks 청크마다 await + GrepableStreamParser (-oG, 현재 Phase 1)
+
+Usage:
+    python benchmarks/bench_nmap_parser.py --lines 2000000
+    python benchmarks/bench_nmap_parser.py --lines 2000000 --ipv6 --chunk-size 65536
+"""
+import argparse
+import asyncio
+import ipaddress
+import re
+import sys
+import tempfile
+import time
+from contextlib import aclosing
+from pathlib import Path
+from typing import Callable
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+from utils.nmap_parser import (  # noqa: E402
+    GrepableStreamParser,
+    XmlStreamParser,
+    iter_grepable_hosts,
+    parse_xml_file,
+)
+from utils.subprocess_runner import stream_command, stream_command_chunks  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="nmap -oG/-oX 호스트 발견 파서 벤치마크")
+    parser.add_argument("--lines", type=int, default=2_000_000, help="합성 호스트 줄 수 (기본값: 2000000)")
+    parser.add_argument(
+        "--up-every", type=int, default=1,
+        help="N줄마다 Up 호스트 1개, 나머지는 Down (기본값: 1 = -v 없는 nmap처럼 Up만 출력)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="스트림 청크 크기 (기본값: 65536)")
+    parser.add_argument("--ipv6", action="store_true", help="IPv6 주소로 생성 (legacy-regex는 0개 발견)")
+    parser.add_argument("--subprocess", action="store_true", help="cat 자식 프로세스 스트림으로도 측정")
+    return parser.parse_args()
+
+
+def synthetic_hosts(count: int, ipv6: bool) -> list[str]:
+    """합성 주소 목록"""
+    base = ipaddress.ip_address("2001:db8::" if ipv6 else "10.0.0.0")
+    return [str(base + i) for i in range(1, count + 1)]
+
+
+def grepable_output(addresses: list[str], up_every: int) -> str:
+    """nmap -sn -oG 형식 출력"""
+    lines = ["# Nmap 7.94 scan initiated as: nmap -sn -oG -"]
+    lines += [
+        f"Host: {address} ()\tStatus: {'Up' if i % up_every == 0 else 'Down'}"
+        for i, address in enumerate(addresses)
+    ]
+    lines.append(f"# Nmap done -- {len(addresses)} IP addresses scanned")
+    return "\n".join(lines) + "\n"
+
+
+def xml_output(addresses: list[str], up_every: int) -> str:
+    """nmap -sn -oX 형식 출력 (Up 호스트만, 실제 nmap과 동일)"""
+    addrtype = "ipv6" if ":" in addresses[0] else "ipv4"
+    parts = ['<?xml version="1.0"?>\n<nmaprun scanner="nmap" args="nmap -sn -oX -">\n']
+    parts += [
+        f'<host><status state="up" reason="arp-response" reason_ttl="0"/>\n'
+        f'<address addr="{address}" addrtype="{addrtype}"/>\n'
+        f'<address addr="AA:BB:CC:DD:EE:{i % 256:02X}" addrtype="mac" vendor="Bench"/>\n'
+        f'<hostnames>\n</hostnames>\n<times srtt="{500 + i % 300}" rttvar="100" to="100000"/>\n</host>\n'
+        for i, address in enumerate(addresses)
+        if i % up_every == 0
+    ]
+    parts.append("<runstats></runstats>\n</nmaprun>\n")
+    return "".join(parts)
+
+
+def legacy_regex(text: str, chunk_size: int) -> int:
+    """기존 Phase 1 방식: 줄마다 포함 검사 + 컴파일되지 않은 re.search"""
+    found = 0
+    for line in text.splitlines():
+        if "Status: Up" in line:
+            match = re.search(r"Host:\s+(\d+\.\d+\.\d+\.\d+)", line)
+            if match:
+                found += 1
+    return found
+
+
+def grepable_line(text: str, chunk_size: int) -> int:
+    """iter_grepable_hosts 줄 단위"""
+    return sum(1 for _ in iter_grepable_hosts(text.splitlines()))
+
+
+def grepable_stream(text: str, chunk_size: int) -> int:
+    """GrepableStreamParser 청크 단위"""
+    parser = GrepableStreamParser()
+    found = 0
+    for start in range(0, len(text), chunk_size):
+        found += sum(1 for host in parser.feed(text[start:start + chunk_size]) if host.is_up)
+    return found + sum(1 for host in parser.close() if host.is_up)
+
+
+def xml_stream(text: str, chunk_size: int) -> int:
+    """XmlStreamParser 청크 단위 (MAC/reason/srtt까지 추출)"""
+    parser = XmlStreamParser()
+    found = 0
+    for start in range(0, len(text), chunk_size):
+        found += sum(1 for host in parser.feed(text[start:start + chunk_size]) if host.is_up)
+    return found + sum(1 for host in parser.close() if host.is_up)
+
+
+async def legacy_lines(path: Path) -> int:
+    """기존 Phase 1 경로: 줄마다 await + 정규식"""
+    found = 0
+    async with aclosing(stream_command(["cat", str(path)])) as lines:
+        async for line in lines:
+            if "Status: Up" in line and re.search(r"Host:\s+(\d+\.\d+\.\d+\.\d+)", line):
+                found += 1
+    return found
+
+
+async def grepable_chunks(path: Path) -> int:
+    """현재 Phase 1 경로: 청크마다 await + GrepableStreamParser"""
+    parser = GrepableStreamParser()
+    found = 0
+    async with aclosing(stream_command_chunks(["cat", str(path)])) as chunks:
+        async for chunk in chunks:
+            found += len(parser.feed(chunk))
+    return found + len(parser.close())
+
+
+def xml_file(path: Path) -> int:
+    """Phase 1 상세 정보 경로: -oX 파일 청크 읽기 + XmlStreamParser"""
+    return len(parse_xml_file(path))
+
+
+def measure_file(name: str, parse: Callable, text: str, is_async: bool = False) -> None:
+    """출력을 임시 파일에 쓰고 1회 측정 (is_async면 cat 자식 프로세스 스트림)"""
+    with tempfile.NamedTemporaryFile("w", suffix=".out") as f:
+        f.write(text)
+        f.flush()
+        start = time.perf_counter()
+        found = asyncio.run(parse(Path(f.name))) if is_async else parse(Path(f.name))
+        elapsed = time.perf_counter() - start
+    print(f"  {name:<16} {elapsed:7.3f}s  up={found} ({1e6 * elapsed / max(found, 1):.1f}µs/host)")
+
+
+def measure(name: str, parse: Callable[[str, int], int], text: str, chunk_size: int, lines: int) -> None:
+    """파서 1회 실행 후 결과 출력"""
+    start = time.perf_counter()
+    found = parse(text, chunk_size)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<16} {elapsed:7.3f}s  {lines / elapsed / 1e6:6.2f}M lines/s  "
+        f"{len(text) / elapsed / 2**20:7.1f} MiB/s  up={found} ({1e6 * elapsed / max(found, 1):.1f}µs/host)"
+    )
+
+
+def main() -> int:
+    """벤치마크 진입점"""
+    args = parse_args()
+    addresses = synthetic_hosts(args.lines, args.ipv6)
+
+    grepable = grepable_output(addresses, args.up_every)
+    print(f"-oG: {args.lines:,}줄 ({len(grepable) / 2**20:.1f} MiB)")
+    measure("legacy-regex", legacy_regex, grepable, args.chunk_size, args.lines)
+    measure("grepable-line", grepable_line, grepable, args.chunk_size, args.lines)
+    measure("grepable-stream", grepable_stream, grepable, args.chunk_size, args.lines)
+    if args.subprocess:
+        measure_file("legacy-lines", legacy_lines, grepable, is_async=True)
+        measure_file("grepable-chunks", grepable_chunks, grepable, is_async=True)
+    del grepable
+
+    xml = xml_output(addresses, args.up_every)
+    xml_lines = xml.count("\n")
+    print(f"-oX: {xml_lines:,}줄 ({len(xml) / 2**20:.1f} MiB, Up 호스트만)")
+    measure("xml-stream", xml_stream, xml, args.chunk_size, xml_lines)
+    measure_file("xml-file", xml_file, xml)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
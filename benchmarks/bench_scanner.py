@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""오케스트레이션 오버헤드 벤치마크 (네트워크 불필요)
+
+benchmarks/stubs의 nmap/rustscan/ping 스텁을 PATH 앞에 두고 합성 서브넷에 대해
+Scanner.run을 실행한 뒤 다음을 보고한다.
+- hosts/sec: 활성 호스트 수 / 전체 소요 시간
+- peak RSS: 오케스트레이터 프로세스, 자식 프로세스 최대값
+- 프로세스 실행 수: 도구별 스텁 실행 횟수
+- 이벤트 루프 지연: 주기 타이머의 초과 지연 (평균/p99/최대)
+
+--compare로 이전 결과(JSON)를 지정하면 허용 오차를 넘는 회귀 시 종료 코드 1을 반환한다.
+
+Usage:
+    python benchmarks/bench_scanner.py --alive-hosts 4096
+    python benchmarks/bench_scanner.py --alive-hosts 4096 --output bench.json
+    python benchmarks/bench_scanner.py --alive-hosts 4096 --compare bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import ipaddress
+import json
+import math
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+STUBS_DIR = BENCH_DIR / "stubs"
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+from scanner.config import Config  # noqa: E402
+from scanner.scanner import Scanner  # noqa: E402
+
+LAG_INTERVAL = 0.01  # 이벤트 루프 지연 측정 주기 (초)
+
+
+def parse_args() -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Scanner 오케스트레이션 벤치마크 (스텁 nmap/rustscan)")
+    parser.add_argument("--alive-hosts", type=int, default=4096, help="합성 활성 호스트 수 (기본값: 4096)")
+    parser.add_argument("--alive-every", type=int, default=4, help="N개 주소마다 활성 호스트 1개 (기본값: 4)")
+    parser.add_argument("--subnet-prefix", type=int, default=22, help="합성 서브넷 크기 (기본값: /22)")
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 실행당 지연 (초, 기본값: 0.05)")
+    parser.add_argument("--ports", default="22,80,443", help="스텁이 보고할 오픈 포트 (기본값: 22,80,443)")
+    parser.add_argument("--parallel-discovery", type=int, default=2)
+    parser.add_argument("--parallel-hosts", type=int, default=5)
+    parser.add_argument("--parallel-services", type=int, default=5)
+    parser.add_argument("--batch-hosts", type=int, default=1)
+    parser.add_argument("--stream", action="store_true", help="스트리밍 모드로 실행")
+    parser.add_argument("--max-rate", type=int, default=0, help="전역 pps 예산 (기본값: 0, 제한 없음)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON (회귀 시 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀 허용 오차 (기본값: 0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="Scanner 로그 출력")
+    return parser.parse_args()
+
+
+def synthetic_subnets(alive_hosts: int, alive_every: int, prefix: int) -> list[str]:
+    """활성 호스트 수를 채우는 10.0.0.0/8 내 연속 서브넷 목록"""
+    per_subnet = max(1, (2 ** (32 - prefix) - 2) // alive_every)
+    count = math.ceil(alive_hosts / per_subnet)
+    if count > 2 ** (prefix - 8):
+        raise ValueError(f"10.0.0.0/8에 /{prefix} 서브넷 {count}개를 만들 수 없음")
+    subnets = ipaddress.ip_network("10.0.0.0/8").subnets(new_prefix=prefix)
+    return [str(subnet) for _, subnet in zip(range(count), subnets)]
+
+
+async def monitor_loop_lag(samples: list[float]) -> None:
+    """주기 타이머의 초과 지연 기록 (이벤트 루프 블로킹 측정)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+
+
+async def run_scanner(config: Config, lag_samples: list[float]) -> float:
+    """Scanner.run 실행 (소요 시간 반환)"""
+    monitor = asyncio.create_task(monitor_loop_lag(lag_samples))
+    start = time.perf_counter()
+    try:
+        await Scanner(config).run()
+    finally:
+        elapsed = time.perf_counter() - start
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+    return elapsed
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (빈 목록이면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    """임시 디렉토리에서 벤치마크 1회 실행"""
+    subnets = synthetic_subnets(args.alive_hosts, args.alive_every, args.subnet_prefix)
+
+    with tempfile.TemporaryDirectory(prefix="nmap_scan_bench_") as tmp:
+        tmp_dir = Path(tmp)
+        targets = tmp_dir / "targets.json"
+        targets.write_text(json.dumps({"subnets": subnets, "exclude": []}))
+        spawn_log = tmp_dir / "spawns.log"
+        scan_dir = tmp_dir / "scan"
+        scan_dir.mkdir()
+
+        os.environ.update({
+            "PATH": f"{STUBS_DIR}{os.pathsep}{os.environ.get('PATH', '')}",
+            "BENCH_LATENCY": str(args.latency),
+            "BENCH_ALIVE_EVERY": str(args.alive_every),
+            "BENCH_PORTS": args.ports,
+            "BENCH_SPAWN_LOG": str(spawn_log),
+        })
+
+        config = Config(
+            script_dir=tmp_dir,
+            scan_dir=scan_dir,
+            json_file=targets,
+            subnets=subnets,
+            max_parallel_discovery=args.parallel_discovery,
+            max_parallel_hosts=args.parallel_hosts,
+            max_parallel_services=args.parallel_services,
+            hosts_per_scan=args.batch_hosts,
+            stream_hosts=args.stream,
+            max_rate=args.max_rate,
+        )
+        config.validate()
+
+        lag_samples: list[float] = []
+        sink = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with sink:
+            elapsed = asyncio.run(run_scanner(config, lag_samples))
+
+        alive = sum(
+            len(path.read_text().split()) for path in scan_dir.glob("alive_hosts_*.txt")
+        )
+        spawns = Counter(spawn_log.read_text().split()) if spawn_log.exists() else Counter()
+        metrics_file = scan_dir / "metrics.json"
+        stages = json.loads(metrics_file.read_text())["stages"] if metrics_file.exists() else {}
+
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "config": {
+            "subnets": len(subnets),
+            "subnet_prefix": args.subnet_prefix,
+            "latency": args.latency,
+            "ports": args.ports,
+            "parallel_discovery": args.parallel_discovery,
+            "parallel_hosts": args.parallel_hosts,
+            "parallel_services": args.parallel_services,
+            "batch_hosts": args.batch_hosts,
+            "stream": args.stream,
+            "max_rate": args.max_rate,
+        },
+        "alive_hosts": alive,
+        "wall_seconds": round(elapsed, 3),
+        "hosts_per_sec": round(alive / elapsed, 2) if elapsed else 0.0,
+        "peak_rss_mb": round(self_usage.ru_maxrss / 1024, 1),          # Linux: KB 단위
+        "child_peak_rss_mb": round(child_usage.ru_maxrss / 1024, 1),
+        "orchestrator_cpu_seconds": round(self_usage.ru_utime + self_usage.ru_stime, 3),
+        "spawns": {**dict(sorted(spawns.items())), "total": sum(spawns.values())},
+        "loop_lag_ms": {
+            "mean": round(1000 * sum(lag_samples) / len(lag_samples), 3) if lag_samples else 0.0,
+            "p99": round(1000 * percentile(lag_samples, 99), 3),
+            "max": round(1000 * max(lag_samples, default=0.0), 3),
+        },
+        "stages": {
+            stage: {key: summary[key] for key in ("runs", "p50_seconds", "p90_seconds", "peak_active")}
+            for stage, summary in stages.items()
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """이전 결과 대비 회귀 항목 목록"""
+    regressions = []
+    if result["hosts_per_sec"] < baseline["hosts_per_sec"] * (1 - tolerance):
+        regressions.append(f"hosts/sec {baseline['hosts_per_sec']} → {result['hosts_per_sec']}")
+    if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        regressions.append(f"peak RSS {baseline['peak_rss_mb']}MB → {result['peak_rss_mb']}MB")
+    if result["spawns"]["total"] > baseline["spawns"]["total"]:
+        regressions.append(f"process spawns {baseline['spawns']['total']} → {result['spawns']['total']}")
+    # 지연은 절대값이 작아 비율만으로는 흔들리므로 5ms 여유를 둔다
+    if result["loop_lag_ms"]["p99"] > baseline["loop_lag_ms"]["p99"] * (1 + tolerance) + 5:
+        regressions.append(f"loop lag p99 {baseline['loop_lag_ms']['p99']}ms → {result['loop_lag_ms']['p99']}ms")
+    return regressions
+
+
+def print_report(result: dict) -> None:
+    """결과 요약 출력"""
+    spawns = ", ".join(f"{tool}={count}" for tool, count in result["spawns"].items())
+    lag = result["loop_lag_ms"]
+    print(f"활성 호스트:      {result['alive_hosts']}개 ({result['config']['subnets']}개 서브넷)")
+    print(f"소요 시간:        {result['wall_seconds']}s")
+    print(f"처리량:           {result['hosts_per_sec']} hosts/sec")
+    print(f"peak RSS:         {result['peak_rss_mb']}MB (자식 최대 {result['child_peak_rss_mb']}MB)")
+    print(f"오케스트레이터 CPU: {result['orchestrator_cpu_seconds']}s")
+    print(f"프로세스 실행:    {spawns}")
+    print(f"루프 지연:        평균 {lag['mean']}ms / p99 {lag['p99']}ms / 최대 {lag['max']}ms")
+    for stage, summary in result["stages"].items():
+        print(
+            f"  {stage:<13} runs={summary['runs']:<6} p50={summary['p50_seconds']}s "
+            f"p90={summary['p90_seconds']}s peak={summary['peak_active']}"
+        )
+
+
+def main() -> int:
+    """벤치마크 진입점"""
+    args = parse_args()
+    result = run_benchmark(args)
+    print_report(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print("회귀 감지:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+        print(f"회귀 없음 (허용 오차 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""타겟 로더 / 제외 인덱스 벤치마크 (합성 데이터, 외부 도구 불필요)
+
+- load: 임의 IP/CIDR/범위 텍스트 인벤토리 N줄을 load_targets로 로드 (병합/분할 포함)
+- filter: 제외 CIDR M개로 만든 ExclusionIndex로 호스트 H개 필터링
+  (기존 방식인 문자열 집합 차집합은 CIDR을 처리하지 못하므로 참고용 속도만 출력)
+
+Usage:
+    python benchmarks/bench_targets.py
+    python benchmarks/bench_targets.py --entries 1000000 --excludes 100000 --hosts 1000000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+from utils.exclusion import ExclusionIndex  # noqa: E402
+from utils.json_loader import load_targets  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="타겟 로더 / 제외 인덱스 벤치마크")
+    parser.add_argument("--entries", type=int, default=200_000, help="인벤토리 줄 수 (기본값: 200000)")
+    parser.add_argument("--excludes", type=int, default=50_000, help="제외 CIDR 수 (기본값: 50000)")
+    parser.add_argument("--hosts", type=int, default=500_000, help="필터링할 호스트 수 (기본값: 500000)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드")
+    return parser.parse_args()
+
+
+def random_ip(rng: random.Random) -> str:
+    """10.0.0.0/8 내 임의 IPv4"""
+    return f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+
+
+def write_inventory(path: Path, entries: int, rng: random.Random) -> None:
+    """IP 80%, CIDR 15%, 범위 5% 인벤토리 기록"""
+    with open(path, "w") as f:
+        for _ in range(entries):
+            kind = rng.random()
+            if kind < 0.80:
+                f.write(f"{random_ip(rng)}\n")
+            elif kind < 0.95:
+                f.write(f"10.{rng.randrange(256)}.{rng.randrange(256)}.0/{rng.choice([24, 26, 28])}\n")
+            else:
+                f.write(f"{random_ip(rng).rpartition('.')[0]}.1-{rng.randrange(2, 255)}\n")
+
+
+def bench_load(args: argparse.Namespace, rng: random.Random) -> None:
+    """load_targets 처리량"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "inventory.txt"
+        write_inventory(path, args.entries, rng)
+        start = time.perf_counter()
+        targets = load_targets(path)
+        elapsed = time.perf_counter() - start
+    print(
+        f"  load    {elapsed:7.2f}s  {args.entries / elapsed:11,.0f} entries/s  "
+        f"→ {len(targets.subnets):,} subnets, {targets.addresses:,} addresses"
+    )
+
+
+def bench_filter(args: argparse.Namespace, rng: random.Random) -> None:
+    """ExclusionIndex 생성/필터링 vs 문자열 집합"""
+    excludes = [
+        f"10.{rng.randrange(256)}.{rng.randrange(256)}.0/{rng.choice([24, 26, 28, 32])}"
+        for _ in range(args.excludes)
+    ]
+    hosts = [random_ip(rng) for _ in range(args.hosts)]
+
+    start = time.perf_counter()
+    index = ExclusionIndex(excludes)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    kept = index.filter(hosts)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  index   {built:7.2f}s  {len(index):,} ranges ({index.address_count:,} addresses)\n"
+        f"  filter  {elapsed:7.2f}s  {args.hosts / elapsed:11,.0f} hosts/s  "
+        f"kept={len(kept):,}/{args.hosts:,}"
+    )
+
+    start = time.perf_counter()
+    exact = set(excludes)
+    legacy = [host for host in hosts if host not in exact]
+    elapsed = time.perf_counter() - start
+    print(f"  set     {elapsed:7.2f}s  (기존 정확 일치, CIDR 미지원: kept={len(legacy):,})")
+
+
+def main() -> int:
+    """벤치마크 진입점"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"인벤토리 {args.entries:,}줄, 제외 {args.excludes:,}개, 호스트 {args.hosts:,}개")
+    bench_load(args, rng)
+    bench_filter(args, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,8 +19,11 @@ nmap -sn으로 활성 호스트 발견 (정확도 우선 최적화)
 """
 import asyncio
 import ipaddress
+import json
+from contextlib import aclosing
+from dataclasses import asdict
 from pathlib import Path
-from typing import Set
+from typing import Optional, Set
 import sys
 import re
 
@@ -28,12 +31,26 @@ import re
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scanner.config import Config
-from scanner.logger import ColorLogger
-from utils.subprocess_runner import run_command, CommandResult
+from scanner.logger import ColorLogger, ProgressTracker
+from scanner.metrics import ScanMetrics
+from scanner.rate_governor import RateGovernor
+from utils.subprocess_runner import run_command, stream_command_chunks, CommandResult
+from utils.exclusion import ExclusionIndex
+from utils.ip_ranges import (
+    cidr_size, host_bounds, iter_uncovered_ranges, pack_cidrs, sorted_ip_ints, subtract_ranges, unit_name,
+    write_ip_ranges,
+)
+from utils.nmap_parser import DiscoveredHost, GrepableStreamParser, parse_xml_file
+
+
+def ip_sort_key(ip: str) -> tuple[int, int]:
+    """IPv4/IPv6 혼합 정렬 키 (버전, 정수값)"""
+    address = ipaddress.ip_address(ip)
+    return address.version, int(address)
 
 
 def expand_subnets(subnets: list[str]) -> set[str]:
-    """CIDR을 개별 IP로 확장"""
+    """CIDR을 개별 IP로 확장 (소규모 네트워크 전용, 대규모는 write_dead_hosts 사용)"""
     all_ips = set()
     for subnet in subnets:
         network = ipaddress.ip_network(subnet, strict=False)
@@ -41,23 +58,66 @@ def expand_subnets(subnets: list[str]) -> set[str]:
     return all_ips
 
 
+def write_dead_hosts(
+    dead_file: Path, cidrs: list[str], alive_hosts: Set[str], exclusions: ExclusionIndex
+) -> int:
+    """
+    서브넷(묶음 단위면 CIDR마다)에서 alive/exclude를 제외한 dead 호스트를 정렬 순서로 파일에 기록
+
+    서브넷 전체를 문자열 집합으로 확장하지 않고, alive 정렬 정수 배열의 여집합 구간에서
+    제외 구간을 빼서 스트리밍으로 기록하므로 /8, /12도 제한된 메모리로 처리한다.
+
+    Returns:
+        기록한 dead 호스트 수
+    """
+    alive_ints = sorted_ip_ints(alive_hosts)
+    written = 0
+    with open(dead_file, "w") as f:
+        for cidr in cidrs:
+            network = ipaddress.ip_network(cidr, strict=False)
+            first, last = host_bounds(network)
+            ranges = subtract_ranges(
+                iter_uncovered_ranges(first, last, alive_ints),
+                exclusions.overlapping(first, last, network.version),
+            )
+            written += write_ip_ranges(f, ranges, version=network.version)
+    return written
+
+
 class HostDiscovery:
     """활성 호스트 발견 및 RTT 측정 클래스"""
 
-    def __init__(self, config: Config, subnet: str, label: str):
+    def __init__(
+        self,
+        config: Config,
+        subnet: str,
+        label: str,
+        rate_governor: Optional[RateGovernor] = None,
+        metrics: Optional[ScanMetrics] = None,
+    ):
         """
         Args:
             config: 스캐너 설정
-            subnet: 스캔할 서브넷 (예: 192.168.1.0/24)
+            subnet: 스캔할 서브넷 (예: 192.168.1.0/24) 또는 묶음 스캔 단위 이름 (config.scan_units)
             label: 서브넷 식별 레이블 (파일명에 사용)
+            rate_governor: 전역 pps 예산 (None이면 제한 없음)
+            metrics: 스캔 계측 수집기 (샤드별 소요 시간, 재시도)
         """
         self.config = config
+        self.rate_governor = rate_governor or RateGovernor(0)
+        self.metrics = metrics or ScanMetrics()
         self.subnet = subnet
+        self.cidrs = config.subnet_cidrs(subnet)
         self.label = label
         self.scan_dir = config.scan_dir
         self.logger = ColorLogger
+        self.rtt_samples: list[float] = []  # profile_rtt 측정값 (ms)
+        self.failed_shards: list[str] = []  # 재시도 후에도 실패한 샤드
+        self.host_details: dict[str, DiscoveredHost] = {}  # nmap -sn MAC/벤더/reason/srtt
 
-    async def health_check_hybrid(self) -> Set[str]:
+    async def health_check_hybrid(
+        self, host_queue: Optional[asyncio.Queue] = None
+    ) -> Set[str]:
         """
         nmap -sn으로 활성 호스트 발견 (T4 + 안정성 최적화)
 
@@ -68,17 +128,22 @@ class HostDiscovery:
         - initial-rtt-timeout=700ms (느린 호스트 감지 개선)
         - host-timeout=30s (효율적 대기 시간)
 
+        Args:
+            host_queue: 스트리밍 모드 큐. 지정 시 활성 호스트를 발견 즉시 put
+                        (exclude 제외, 종료 sentinel은 호출자가 put)
+
         Returns:
             활성 호스트 IP 집합
         """
         self.logger.phase("Phase 1", f"[{self.label}] Starting nmap host discovery...")
 
-        # nmap 실행
+        # nmap 실행 (대규모 서브넷은 샤드 단위 병렬)
         try:
-            alive_hosts = await self._run_nmap_ping()
+            alive_hosts = await self._run_nmap_ping(host_queue)
         except Exception as e:
             self.logger.warning(f"nmap 실패: {e}")
             alive_hosts = set()
+            self.failed_shards = [unit_name(self.cidrs)]
 
         # exclude IP 필터링
         alive_hosts = self._filter_exclude_ips(alive_hosts)
@@ -94,37 +159,37 @@ class HostDiscovery:
         output_file = self.scan_dir / f"alive_hosts_{self.label}.txt"
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with open(output_file, "w") as f:
-            for ip in sorted(alive_hosts, key=ipaddress.IPv4Address):
+            for ip in sorted(alive_hosts, key=ip_sort_key):
                 f.write(f"{ip}\n")
 
-        # dead_hosts 생성
-        all_ips = expand_subnets([self.subnet])
-        exclude_set = set(self.config.exclude_ips)
-        alive_set = set(alive_hosts)
-        dead_ips = (all_ips - exclude_set) - alive_set
+        # 호스트 상세 (MAC/벤더/응답 사유/지연)
+        details_file = self.scan_dir / f"host_details_{self.label}.jsonl"
+        with open(details_file, "w") as f:
+            for ip in sorted(alive_hosts, key=ip_sort_key):
+                if ip in self.host_details:
+                    f.write(json.dumps(asdict(self.host_details[ip]), ensure_ascii=False) + "\n")
 
+        # dead_hosts 생성 (정수 구간 여집합 스트리밍)
         dead_file = self.scan_dir / f"dead_hosts_{self.label}.txt"
-        with open(dead_file, "w") as f:
-            f.write("\n".join(sorted(dead_ips, key=ipaddress.IPv4Address)))
+        write_dead_hosts(dead_file, self.cidrs, alive_hosts, self.config.exclusions)
 
         self.logger.success(
             f"[{self.label}] Found {len(alive_hosts)} alive hosts → {output_file}"
         )
         return alive_hosts
 
-    def _get_scan_params(self, subnet: str) -> dict:
+    def _get_scan_params(self, shard: list[str]) -> dict:
         """네트워크 크기에 따라 최적 파라미터 반환 (T4 + 안정성 최적화)
 
         T5→T4 변경으로 타이밍 충돌 해소, initial_rtt_timeout=700ms로 정확도 향상
 
         Args:
-            subnet: CIDR 표기법 서브넷 (예: 192.168.1.0/24)
+            shard: 샤드 CIDR 목록 (예: ["192.168.1.0/24"], 묶음 단위면 여러 개)
 
         Returns:
             dict: hostgroup, min_rate, max_retries, host_timeout, initial_rtt_timeout 파라미터
         """
-        network = ipaddress.ip_network(subnet)
-        host_count = network.num_addresses - 2  # 네트워크/브로드캐스트 제외
+        host_count = sum(map(cidr_size, shard)) - 2  # 네트워크/브로드캐스트 제외
 
         if host_count <= 256:  # /24
             return {
@@ -151,24 +216,31 @@ class HostDiscovery:
                 'initial_rtt_timeout': '700ms'
             }
 
-    async def _run_nmap_ping(self) -> Set[str]:
-        """nmap -sn으로 활성 호스트 발견 (T4 + 안정성 최적화)
+    def _build_nmap_ping_cmd(
+        self,
+        shard: list[str],
+        max_rate: Optional[int] = None,
+        xml_file: Optional[Path] = None,
+        exclude_file: Optional[Path] = None,
+        target_file: Optional[Path] = None,
+    ) -> list[str]:
+        """nmap -sn 명령어 생성 (네트워크 크기별 동적 파라미터)
 
-        최적화 내용:
-        - T4 타이밍 (T5 충돌 해소, 안정성)
-        - DNS 비활성화 (-n): DNS 조회 스킵
-        - max-retries=3: 안정적 속도와 정확도
-        - min-rate=10000: 높은 속도
-        - initial-rtt-timeout=700ms: 느린 호스트 감지 개선
-        - host-timeout=30s: 효율적 대기 시간
-        - 네트워크 크기별 동적 파라미터 조정
+        Args:
+            shard: 샤드 CIDR 목록
+            max_rate: 전역 예산에서 할당받은 pps (지정 시 --max-rate, min-rate도 이하로 제한)
+            xml_file: -oX 출력 파일 (MAC/벤더/reason/srtt 수집용, stdout은 -oG 유지)
+            exclude_file: --excludefile (샤드와 겹치는 제외 CIDR, 제외 대상은 probe하지 않음)
+            target_file: -iL 타겟 목록 파일 (묶음 샤드, 지정 시 shard 대신 사용)
         """
         # 네트워크 크기별 최적 파라미터 가져오기
-        params = self._get_scan_params(self.subnet)
+        params = self._get_scan_params(shard)
+        if max_rate is not None:
+            params['min_rate'] = min(params['min_rate'], max_rate)
 
         cmd = [
             "nmap",
-            self.subnet,
+            *(["-iL", str(target_file)] if target_file is not None else shard),
             "-sn",                                             # Ping scan (no port scan)
             "-n",                                              # DNS 비활성화
             "-T4",                                             # Aggressive timing (안정성, T5 충돌 해소)
@@ -179,38 +251,195 @@ class HostDiscovery:
             "--initial-rtt-timeout", params['initial_rtt_timeout'],  # 초기 RTT 타임아웃
             "-oG", "-"                                         # Grepable output to stdout
         ]
+        if xml_file is not None:
+            cmd[-2:-2] = ["-oX", str(xml_file)]               # 상세 정보는 파일로 (스트리밍 경로와 분리)
+        if exclude_file is not None:
+            cmd[-2:-2] = ["--excludefile", str(exclude_file)]  # 제외 대상 패킷 0
+        if max_rate is not None:
+            cmd[-2:-2] = ["--max-rate", str(max_rate)]        # 전역 pps 예산 할당분
+        return cmd
+
+    def _shard_subnet(self) -> list[list[str]]:
+        """서브넷을 discovery_shard_prefix 크기 샤드(CIDR 목록)로 분할
+
+        - 단독 CIDR: /shard_prefix 서브넷으로 분할 (작으면 그대로)
+        - 묶음 단위: 작은 CIDR들을 샤드 크기까지 다시 묶음 (샤드마다 nmap -iL 1회)
+        """
+        shard_prefix = self.config.discovery_shard_prefix
+        if len(self.cidrs) > 1:
+            return list(pack_cidrs(self.cidrs, 1 << (32 - shard_prefix)))
+        network = ipaddress.ip_network(self.cidrs[0], strict=False)
+        if network.version != 4 or network.prefixlen >= shard_prefix:
+            return [[str(network)]]
+        return [[str(shard)] for shard in network.subnets(new_prefix=shard_prefix)]
+
+    async def _run_nmap_ping(
+        self, host_queue: Optional[asyncio.Queue] = None
+    ) -> Set[str]:
+        """nmap -sn으로 활성 호스트 발견 (T4 + 안정성 최적화)
+
+        최적화 내용:
+        - T4 타이밍 (T5 충돌 해소, 안정성)
+        - DNS 비활성화 (-n): DNS 조회 스킵
+        - max-retries=3: 안정적 속도와 정확도
+        - min-rate=10000: 높은 속도
+        - initial-rtt-timeout=700ms: 느린 호스트 감지 개선
+        - host-timeout=30s: 효율적 대기 시간
+        - 네트워크 크기별 동적 파라미터 조정
+        - 대규모 서브넷 샤딩: /N 샤드를 워커 풀로 병렬 실행, 실패 샤드만 재시도
+
+        Args:
+            host_queue: 스트리밍 모드 큐 (지정 시 발견 즉시 put, exclude 제외)
+        """
+        shards = self._shard_subnet()
+        workers = asyncio.Semaphore(self.config.discovery_shard_workers)
+        hosts: Set[str] = set()
+
+        params = self._get_scan_params(shards[0])
         self.logger.info(
             f"[{self.label}] Running nmap ping scan (Accuracy Priority) "
             f"(T4, hostgroup={params['hostgroup']}, min-rate={params['min_rate']}, "
-            f"retries={params['max_retries']}, host-timeout={params['host_timeout']})"
+            f"retries={params['max_retries']}, host-timeout={params['host_timeout']}, "
+            f"shards={len(shards)}, workers={self.config.discovery_shard_workers}"
+            f"{f', global max-rate={self.rate_governor.max_rate}' if self.rate_governor.enabled else ''}"
+            f"{', streaming' if host_queue is not None else ''})"
         )
 
-        try:
-            result = await run_command(cmd, timeout=120)
-            hosts = set()
-            # nmap -oG 출력에서 "Host: IP (hostname) Status: Up" 파싱
-            for line in result.stdout.splitlines():
-                if "Status: Up" in line:
-                    match = re.search(r"Host:\s+(\d+\.\d+\.\d+\.\d+)", line)
-                    if match:
-                        hosts.add(match.group(1))
+        # 샤드가 여러 개면 서브넷별 진행률 막대 (완료 샤드 수)
+        progress = ProgressTracker(len(shards), f"[{self.label}] nmap -sn shards") if len(shards) > 1 else None
 
-            self.logger.success(f"[{self.label}] nmap found {len(hosts)} hosts")
-            return hosts
-        except asyncio.TimeoutError:
-            self.logger.warning(f"[{self.label}] nmap ping scan timeout (120s)")
-            return set()
-        except Exception as e:
-            self.logger.warning(f"[{self.label}] nmap ping scan failed: {e}")
-            return set()
+        pending = shards
+        for attempt in range(self.config.discovery_shard_retries + 1):
+            results = await asyncio.gather(
+                *(self._ping_shard(shard, hosts, host_queue, workers, progress) for shard in pending)
+            )
+            pending = [shard for shard, ok in zip(pending, results) if not ok]
+            if not pending:
+                break
+            if attempt < self.config.discovery_shard_retries:
+                self.metrics.incr("phase1_shard_retries", len(pending))
+                self.logger.warning(
+                    f"[{self.label}] Retrying {len(pending)}/{len(shards)} failed shards"
+                )
+
+        if progress is not None:
+            progress.close()
+        self.failed_shards = [unit_name(shard) for shard in pending]
+        self.metrics.incr("phase1_shards_failed", len(pending))
+        if pending:
+            self.logger.warning(
+                f"[{self.label}] {len(pending)} shards failed after retries: "
+                f"{', '.join(self.failed_shards[:5])}{' ...' if len(pending) > 5 else ''}"
+            )
+
+        self.logger.success(f"[{self.label}] nmap found {len(hosts)} hosts")
+        return hosts
+
+    async def _ping_shard(
+        self,
+        shard: list[str],
+        hosts: Set[str],
+        host_queue: Optional[asyncio.Queue],
+        workers: asyncio.Semaphore,
+        progress: Optional[ProgressTracker] = None,
+    ) -> bool:
+        """단일 샤드 nmap -sn 실행 (발견 호스트를 hosts에 병합)
+
+        타임아웃/실패 시에도 그때까지 발견한 호스트는 유지한다.
+
+        Returns:
+            샤드 완료 여부 (False면 재시도 대상)
+        """
+        exclusions = self.config.exclusions
+        name = unit_name(shard)
+        networks = [ipaddress.ip_network(cidr, strict=False) for cidr in shard]
+        if all(exclusions.covers(*host_bounds(network), network.version) for network in networks):
+            self.logger.debug(f"[{self.label}] Shard fully excluded, skipping: {name}")
+            if progress is not None:
+                progress.update()
+            return True
+        requested = self._get_scan_params(shard)['min_rate']
+
+        async with workers, self.rate_governor.lease(requested) as rate:
+            max_rate = rate if self.rate_governor.enabled else None
+            file_id = f"{self.label}_{name.replace('/', '_').replace(':', '-')}"
+            xml_file = self.scan_dir / f".nmap_sn_{file_id}.xml"
+            exclude_file = self.scan_dir / f".nmap_exclude_{file_id}.txt"
+            if not exclusions.write_excludefile(exclude_file, networks):
+                exclude_file = None
+            target_file = None
+            if len(shard) > 1:
+                target_file = self.scan_dir / f".nmap_targets_{file_id}.txt"
+                target_file.write_text("".join(f"{cidr}\n" for cidr in shard))
+            cmd = self._build_nmap_ping_cmd(
+                shard, max_rate=max_rate, xml_file=xml_file, exclude_file=exclude_file,
+                target_file=target_file,
+            )
+            with self.metrics.timer("nmap_sn", self.subnet) as timing:
+                parser = GrepableStreamParser()
+                try:
+                    # nmap -oG 출력을 청크 단위로 읽어 청크마다 정규식 1회로 Up 호스트 추출
+                    async with aclosing(stream_command_chunks(cmd, timeout=120, check=True)) as chunks:
+                        async for chunk in chunks:
+                            for found in parser.feed(chunk):
+                                await self._add_host(found, hosts, host_queue, exclusions)
+                    for found in parser.close():
+                        await self._add_host(found, hosts, host_queue, exclusions)
+                    if progress is not None:
+                        progress.update()
+                    return True
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"[{self.label}] nmap ping scan timeout (120s): {name}")
+                except Exception as e:
+                    self.logger.warning(f"[{self.label}] nmap ping scan failed ({name}): {e}")
+                finally:
+                    for temp_file in (exclude_file, target_file):
+                        if temp_file is not None:
+                            temp_file.unlink(missing_ok=True)
+                    # 실패/타임아웃이어도 그때까지 기록된 상세 정보는 병합
+                    await self._merge_host_details(xml_file, hosts)
+                timing.ok = False
+                return False
+
+    async def _merge_host_details(self, xml_file: Path, hosts: Set[str]) -> None:
+        """샤드 -oX 파일의 MAC/벤더/reason/srtt를 host_details에 병합 (파싱은 스레드에서, 파일 삭제)
+
+        중단된 nmap의 불완전한 XML도 닫힌 <host>까지는 반영한다.
+        """
+        if not xml_file.exists():
+            return
+        try:
+            details = await asyncio.to_thread(parse_xml_file, xml_file)
+        except OSError as e:
+            self.logger.warning(f"[{self.label}] Failed to read nmap XML ({xml_file.name}): {e}")
+            return
+        finally:
+            xml_file.unlink(missing_ok=True)
+        for found in details:
+            if found.address in hosts:
+                self.host_details[found.address] = found
+
+    async def _add_host(
+        self,
+        found: DiscoveredHost,
+        hosts: Set[str],
+        host_queue: Optional[asyncio.Queue],
+        exclusions: ExclusionIndex,
+    ) -> None:
+        """발견 호스트 병합 (Up만, 스트리밍 모드면 exclude 제외 후 큐에 put)"""
+        if not found.is_up or found.address in hosts:
+            return
+        hosts.add(found.address)
+        self.host_details[found.address] = found
+        if host_queue is not None and found.address not in exclusions:
+            await host_queue.put(found.address)
 
     def _filter_exclude_ips(self, hosts: Set[str]) -> Set[str]:
-        """exclude IP 필터링"""
-        if not self.config.exclude_ips:
+        """exclude IP/CIDR/범위 필터링 (nmap --excludefile을 통과한 경우 대비)"""
+        if not self.config.exclusions:
             return hosts
 
-        exclude_set = set(self.config.exclude_ips)
-        filtered = hosts - exclude_set
+        filtered = set(self.config.exclusions.filter(hosts))
         excluded_count = len(hosts) - len(filtered)
 
         if excluded_count > 0:
@@ -239,12 +468,24 @@ class HostDiscovery:
             f"[{self.label}] Profiling RTT for {len(sample_hosts)} sample hosts..."
         )
 
-        # 병렬로 RTT 측정
-        tasks = [self._measure_rtt(host) for host in sample_hosts]
+        # nmap -sn이 보고한 srtt가 있는 샘플은 ping 생략
+        known_rtts = [
+            self.host_details[host].latency_ms
+            for host in sample_hosts
+            if host in self.host_details and self.host_details[host].latency_ms is not None
+        ]
+        ping_hosts = [
+            host for host in sample_hosts
+            if host not in self.host_details or self.host_details[host].latency_ms is None
+        ]
+
+        # 나머지는 병렬로 ping 측정
+        tasks = [self._measure_rtt(host) for host in ping_hosts]
         rtt_results = await asyncio.gather(*tasks)
 
         # None이 아닌 값만 필터링
-        rtt_values = [rtt for rtt in rtt_results if rtt is not None]
+        rtt_values = known_rtts + [rtt for rtt in rtt_results if rtt is not None]
+        self.rtt_samples = rtt_values
 
         if not rtt_values:
             self.logger.warning(
@@ -260,7 +501,7 @@ class HostDiscovery:
             f.write(f"{avg_rtt:.2f}\n")
 
         self.logger.success(
-            f"[{self.label}] Average RTT: {avg_rtt:.2f} ms (sampled {len(rtt_values)}/{len(sample_hosts)} hosts)"
+            f"[{self.label}] Average RTT: {avg_rtt:.2f} ms (sampled {len(rtt_values)}/{len(sample_hosts)} hosts, {len(known_rtts)} from nmap srtt)"
         )
         return avg_rtt
 
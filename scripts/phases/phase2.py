@@ -1,25 +1,218 @@
-"""Phase 2: 전체 포트 스캔 (rustscan 병렬 실행)"""
+"""Phase 2: 전체 포트 스캔 (포트 발견 → 서비스 탐지 2단계 파이프라인)
+
+- 포트 발견: rustscan -g (nmap pass-through 없음) 또는 내장 asyncio connect 엔진(--port-engine connect),
+  전역 host_slots 공유
+- 서비스 탐지: nmap -sV -sC -p <발견 포트>, 전역 service_slots 공유
+- 슬롯은 AIMD 제한기: 실패/타임아웃 시 한도 축소, 정상 완료가 이어지면 확대
+
+두 단계는 큐로 연결되어, 느린 NSE 스크립트가 빠른 포트 스윕을 막지 않는다.
+
+상위 포트 모드(--top-ports N): 포트 발견을 두 패스로 나눈다.
+- 상위 포트 패스: 이전 스캔에서 자주 열린 N개 포트만 스캔하고 바로 서비스 탐지로 전달
+- 전체 스윕 패스: 1-65535를 낮은 우선순위 슬롯으로 스캔, 새로 발견한 포트만 서비스 탐지 (결과는 이어쓰기)
+"""
 import asyncio
+import re
 import resource
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+from scanner.baseline import Baseline
+from scanner.concurrency import AdaptiveLimiter
 from scanner.config import Config
+from scanner.journal import ScanJournal
 from scanner.logger import ColorLogger, ProgressTracker
+from scanner.metrics import ScanMetrics
+from scanner.rate_governor import RateGovernor
+from utils.connect_scan import ALL_PORTS, ConnectScanner
 from utils.subprocess_runner import run_command
-from utils.rtt_optimizer import get_safe_rustscan_params
+from utils.results_store import HostResult, PortResult, ResultsStore, parse_nmap_xml
+from utils.service_cache import (
+    HOST_SCRIPTS_PORT,
+    ServiceCache,
+    banner_fingerprint,
+    grab_banner,
+    host_fingerprint,
+)
+from utils.rtt_optimizer import RustscanParams, get_safe_rustscan_params
+
+# nmap -oN 출력 구분자
+_NMAP_RUN_HEADER = "# Nmap "
+_NMAP_REPORT_PREFIX = "Nmap scan report for "
+
+# 서비스 탐지 nmap이 전역 예산에 요청하는 pps (발견 포트만 스캔하므로 작게)
+SERVICE_SCAN_RATE = 300
+
+_NMAP_HOST_TIMEOUT = "due to host timeout"  # "Skipping host X due to host timeout"
+
+_NMAP_PORT_LINE_RE = re.compile(r"^(\d+)/(tcp|udp|sctp)\s")
+_NMAP_HOST_SCRIPTS = "Host script results:"
+
+# rustscan -g 출력: "192.168.1.10 -> [22,80,443]"
+_RUSTSCAN_GREPABLE_RE = re.compile(r"^(\S+)\s+->\s+\[([\d,\s]*)\]")
+
+
+def split_nmap_output(text: str) -> dict[str, str]:
+    """
+    여러 호스트가 담긴 nmap -oN 출력을 호스트별로 분리 (--append-output 누적 출력 포함)
+
+    각 호스트 블록 앞뒤에 해당 실행의 헤더(# Nmap ... initiated)와
+    종료 줄(# Nmap done)을 붙여 단일 호스트 스캔 결과와 같은 형식으로 만든다.
+
+    Returns:
+        {호스트 IP: nmap -oN 텍스트}
+    """
+    results: dict[str, list[str]] = {}
+    header: list[str] = []
+    current: Optional[list[str]] = None
+    run_hosts: list[str] = []
+
+    def close_run(footer: list[str]) -> None:
+        for host in run_hosts:
+            results[host].extend(footer)
+        run_hosts.clear()
+
+    for line in text.splitlines():
+        if line.startswith(_NMAP_RUN_HEADER):
+            if "initiated" in line:
+                close_run([])
+                header = [line]
+                current = None
+            else:
+                # "# Nmap done ..." 또는 기타 주석: 현재 실행의 모든 호스트에 공통
+                close_run([line])
+                current = None
+            continue
+
+        if line.startswith(_NMAP_REPORT_PREFIX):
+            host = line[len(_NMAP_REPORT_PREFIX):].split()[-1].strip("()")
+            current = results.setdefault(host, [])
+            current.extend(header)
+            current.append(line)
+            run_hosts.append(host)
+            continue
+
+        if current is not None:
+            current.append(line)
+        elif line.strip():
+            header.append(line)
+
+    return {host: "\n".join(lines) + "\n" for host, lines in results.items()}
+
+
+def split_port_blocks(text: str) -> tuple[dict[tuple[int, str], str], str]:
+    """
+    단일 호스트 nmap -oN 출력을 포트별 블록으로 분리 (서비스 캐시 저장용)
+
+    포트 블록은 "22/tcp open ssh ..." 줄과 뒤따르는 "|" 스크립트 출력 줄이다.
+    이어쓰기(상위 포트 모드 tail, 캐시 적중 추가)로 같은 포트가 다시 나오면 마지막 블록만 남긴다.
+
+    Returns:
+        ({(port, protocol): 블록 텍스트}, "Host script results:" 블록 텍스트)
+
+    Examples:
+        >>> blocks, _ = split_port_blocks("22/tcp open ssh v1\\n| key: a\\n\\n22/tcp open ssh v2\\n80/tcp open http")
+        >>> blocks
+        {(22, 'tcp'): '22/tcp open ssh v2', (80, 'tcp'): '80/tcp open http'}
+    """
+    blocks: dict[tuple[int, str], list[str]] = {}
+    host_block: list[str] = []
+    current: Optional[list[str]] = None
+
+    for line in text.splitlines():
+        match = _NMAP_PORT_LINE_RE.match(line)
+        if match:
+            current = blocks[(int(match.group(1)), match.group(2))] = [line]
+        elif line.startswith(_NMAP_HOST_SCRIPTS):
+            current = host_block
+            current.append(line)
+        elif current is not None and line.startswith("|"):
+            current.append(line)
+        else:
+            current = None
+
+    return (
+        {key: "\n".join(lines) for key, lines in blocks.items()},
+        "\n".join(host_block),
+    )
+
+
+def parse_rustscan_grepable(text: str) -> dict[str, list[int]]:
+    """
+    rustscan -g 출력 파싱
+
+    Returns:
+        {호스트 IP: 정렬된 오픈 포트 목록}
+    """
+    results: dict[str, set[int]] = {}
+    for line in text.splitlines():
+        match = _RUSTSCAN_GREPABLE_RE.match(line.strip())
+        if not match:
+            continue
+        ports = {int(port) for port in match.group(2).split(",") if port.strip()}
+        results.setdefault(match.group(1), set()).update(ports)
+    return {host: sorted(ports) for host, ports in results.items()}
 
 
 class PortScanner:
-    """rustscan 기반 전체 포트 스캐너 (rustscan 포트 발견 + nmap -sV -sC 분석)"""
+    """전체 포트 스캐너 (rustscan/connect 포트 발견 + nmap -sV -sC 분석)"""
 
-    def __init__(self, config: Config, scan_dir: Path):
+    def __init__(
+        self,
+        config: Config,
+        scan_dir: Path,
+        host_slots: Optional[AdaptiveLimiter] = None,
+        service_slots: Optional[AdaptiveLimiter] = None,
+        journal: Optional[ScanJournal] = None,
+        results_store: Optional[ResultsStore] = None,
+        baseline: Optional[Baseline] = None,
+        service_cache: Optional[ServiceCache] = None,
+        rate_governor: Optional[RateGovernor] = None,
+        metrics: Optional[ScanMetrics] = None,
+        connect_scanner: Optional[ConnectScanner] = None,
+        top_ports: Optional[list[int]] = None,
+    ):
+        """
+        Args:
+            config: 스캐너 설정
+            scan_dir: 결과 저장 디렉토리
+            host_slots: 서브넷 간 공유하는 전역 포트 발견(rustscan) 슬롯
+            service_slots: 서브넷 간 공유하는 전역 서비스 탐지(nmap) 슬롯
+                           (None이면 서브넷 단독 실행)
+            journal: 체크포인트 저널 (완료 호스트 스킵 및 진행 기록, None이면 미사용)
+            results_store: nmap XML 결과를 적재할 저장소 (None이면 XML 파일만 생성)
+            baseline: 증분 재스캔 베이스라인 (알려진 호스트는 기존 오픈 포트만 재확인)
+            service_cache: 서비스 탐지 캐시 (배너 지문이 같은 포트는 nmap 생략)
+            rate_governor: 전역 pps 예산 (rustscan batch, nmap --max-rate로 변환)
+            metrics: 스캔 계측 수집기 (rustscan/nmap 소요 시간, 큐 깊이)
+            connect_scanner: 서브넷 간 공유하는 connect 엔진 (port_engine=connect, None이면 새로 생성)
+            top_ports: 상위 포트 패스 포트 목록 (None이면 전체 스윕만)
+        """
         self.config = config
         self.scan_dir = scan_dir
+        self.engine = config.port_engine
+        self.host_slots = host_slots or AdaptiveLimiter.fixed(self.engine, config.max_parallel_hosts)
+        self.service_slots = service_slots or AdaptiveLimiter.fixed("nmap", config.max_parallel_services)
+        self.journal = journal
+        self.results_store = results_store
+        self.baseline = baseline
+        self.service_cache = service_cache
+        self.rate_governor = rate_governor or RateGovernor(0)
+        self.metrics = metrics or ScanMetrics()
+        self.connect_scanner = None
+        if self.engine == "connect":
+            self.connect_scanner = connect_scanner or ConnectScanner(config.connect_max_sockets)
+        self.top_ports = top_ports or None
+        # 상위 포트 모드 호스트 완료 추적: 서비스 탐지 대기 항목 수, 전체 스윕 완료, 실패 여부
+        self._open_items: dict[str, int] = defaultdict(int)
+        self._swept: set[str] = set()
+        self._tier_failed: set[str] = set()
+        self.subnet = ""  # scan()/scan_stream()에서 설정 (계측 레이블)
         self.logger = ColorLogger
 
     async def scan(
-        self, subnet: str, label: str
+        self, subnet: str, label: str, params: Optional[RustscanParams] = None
     ) -> None:
         """
         Phase 2 실행: 전체 포트 스캔
@@ -27,11 +220,13 @@ class PortScanner:
         Args:
             subnet: 스캔할 서브넷 (CIDR)
             label: 서브넷 레이블 (파일명용)
+            params: RTT 튜닝 파라미터 (None이면 안전 모드 고정값)
 
         Returns:
             None (각 호스트별 scan_{host}.nmap 파일 생성)
         """
         self.logger.header(f"Phase 2: 전체 포트 스캔 - {subnet}")
+        self.subnet = subnet
 
         # 사전 조건 확인
         alive_hosts_file = self.scan_dir / f"alive_hosts_{label}.txt"
@@ -39,63 +234,770 @@ class PortScanner:
             self.logger.warning(f"⏭ Phase 2 건너뜀: 활성 호스트 없음 ({subnet})")
             return None
 
-        # 안전 모드 파라미터 사용
-        params = get_safe_rustscan_params()
-        self.logger.info(f"안전 모드: Batch={params.batch_size}, Timeout={params.timeout}ms, 병렬={params.parallel_limit}")
+        params = self._resolve_params(params)
 
         # ulimit 검증 및 증가
-        self._verify_and_increase_ulimit(params.required_ulimit)
+        self._verify_and_increase_ulimit(self._required_ulimit(params))
 
         # 활성 호스트 목록 로드
         alive_hosts = alive_hosts_file.read_text().strip().split("\n")
         self.logger.info(f"Main 스캔 시작 ({len(alive_hosts)}개 호스트)")
 
         # Main 스캔 (전체 포트)
-        await self._run_main_scan(alive_hosts, label, params)
+        with self.metrics.timer("phase2", subnet):
+            await self._run_main_scan(alive_hosts, label, params)
 
-        self.logger.success(f"Phase 2 완료: rustscan+nmap 스캔 완료 ({len(alive_hosts)}개 호스트)")
+        self.logger.success(f"Phase 2 완료: {self.engine}+nmap 스캔 완료 ({len(alive_hosts)}개 호스트)")
 
         return None
 
+    async def scan_stream(
+        self,
+        subnet: str,
+        label: str,
+        host_queue: asyncio.Queue,
+        params: Optional[RustscanParams] = None,
+    ) -> int:
+        """
+        Phase 2 스트리밍 실행: Phase 1이 큐에 넣는 호스트를 도착 즉시 스캔
+
+        Args:
+            subnet: 스캔할 서브넷 (CIDR)
+            label: 서브넷 레이블 (파일명용)
+            host_queue: 활성 호스트 큐 (None sentinel로 종료)
+            params: RTT 튜닝 파라미터 (None이면 안전 모드 고정값)
+
+        Returns:
+            스캔한 호스트 수
+        """
+        self.logger.header(f"Phase 2: 전체 포트 스캔 (스트리밍) - {subnet}")
+        self.subnet = subnet
+
+        params = self._resolve_params(params)
+        self._verify_and_increase_ulimit(self._required_ulimit(params))
+
+        progress = ProgressTracker(0, f"{self.engine}+nmap 스캔 ({subnet})")
+        with self.metrics.timer("phase2", subnet):
+            scanned = await self._run_pipeline(self._queue_batches(host_queue), params, progress)
+
+        if scanned:
+            self.logger.success(f"Phase 2 완료: {self.engine}+nmap 스캔 완료 ({scanned}개 호스트)")
+        else:
+            self.logger.warning(f"⏭ Phase 2 건너뜀: 활성 호스트 없음 ({subnet})")
+        return scanned
+
+    def _resolve_params(self, params: Optional[RustscanParams]) -> RustscanParams:
+        """rustscan 파라미터 결정 및 로깅 (None이면 안전 모드, connect 엔진은 batch를 동시 connect 수로 사용)"""
+        if params is None:
+            params = get_safe_rustscan_params()
+            mode = "안전 모드"
+        else:
+            mode = "RTT 튜닝"
+        self.logger.info(
+            f"{mode} ({self.engine}): Batch={params.batch_size}, Timeout={params.timeout}ms, "
+            f"병렬={params.parallel_limit}"
+        )
+        return params
+
+    def _required_ulimit(self, params: RustscanParams) -> int:
+        """포트 발견 엔진별 필요 ulimit (connect 엔진은 전역 소켓 예산 기준)"""
+        if self.connect_scanner is not None:
+            return self.connect_scanner.required_ulimit
+        return params.required_ulimit
+
     async def _run_main_scan(
-        self, hosts: list[str], label: str, params
+        self, hosts: list[str], label: str, params: RustscanParams
     ) -> None:
-        """Main 스캔 실행 (전체 포트, nmap -sV -sC pass-through)"""
-        progress = ProgressTracker(len(hosts), "rustscan+nmap 스캔")
-
-        semaphore = asyncio.Semaphore(params.parallel_limit)
-
-        async def scan_host(host: str) -> None:
-            async with semaphore:
-                host_safe = host.replace(".", "_").replace("/", "_")
-
-                cmd = [
-                    "rustscan",
-                    "-a", host,
-                    "-b", str(params.batch_size),
-                    "-t", str(params.timeout),
-                    "--ulimit", str(params.required_ulimit),
-                    "--",                                      # nmap pass-through
-                    "-Pn",                                     # 호스트 발견 스킵 (Phase 1 완료)
-                    "-T4",                                     # T3→T4 (Phase 1 검증 완료)
-                    "-sV", "-sC",                              # -A → -sV -sC (OS/traceroute 제거)
-                    "-n",                                      # DNS 비활성화
-                    "--max-retries", "2",                      # 재시도 최소화
-                    "--host-timeout", "240s",                  # 개별 호스트 4분 제한
-                    "-v",                                      # 상세 출력
-                    "-oN", str(self.scan_dir / f"scan_{host_safe}.nmap")
-                ]
+        """Main 스캔 실행 (전체 포트 발견 → nmap -sV -sC)"""
+        progress = ProgressTracker(0, f"{self.engine}+nmap 스캔 ({self.subnet or label})")
+        await self._run_pipeline(self._list_batches(hosts), params, progress)
+
+    async def _list_batches(self, hosts: list[str]) -> AsyncIterator[list[str]]:
+        """호스트 목록을 hosts_per_scan 크기 배치로 분할"""
+        batch = self.config.hosts_per_scan
+        for i in range(0, len(hosts), batch):
+            yield hosts[i:i + batch]
+
+    async def _queue_batches(self, host_queue: asyncio.Queue) -> AsyncIterator[list[str]]:
+        """큐에 이미 도착한 호스트를 최대 hosts_per_scan개까지 묶음 (대기 없음)"""
+        while True:
+            host = await host_queue.get()
+            self.metrics.observe_queue("host_queue", host_queue.qsize())
+            if host is None:
+                return
+
+            batch = [host]
+            while len(batch) < self.config.hosts_per_scan and not host_queue.empty():
+                queued = host_queue.get_nowait()
+                if queued is None:
+                    yield batch
+                    return
+                batch.append(queued)
+            yield batch
+
+    async def _run_pipeline(
+        self,
+        batches: AsyncIterator[list[str]],
+        params: RustscanParams,
+        progress: ProgressTracker,
+    ) -> int:
+        """포트 발견 → 서비스 탐지 2단계 파이프라인 실행
+
+        Returns:
+            처리한 호스트 수
+        """
+        service_queue: asyncio.Queue = asyncio.Queue()
+        # 서브넷 포트 발견 한도: ulimit(FD) 예산 때문에 parallel_limit 이상으로는 늘리지 않고 축소만
+        if self.config.adaptive_concurrency:
+            semaphore = AdaptiveLimiter(
+                f"{self.engine}(subnet)", params.parallel_limit, maximum=params.parallel_limit
+            )
+        else:
+            semaphore = AdaptiveLimiter.fixed(f"{self.engine}(subnet)", params.parallel_limit)
+
+        # 서비스 워커는 전역 슬롯 최대 한도만큼 (AIMD로 한도가 늘어나면 모두 실제로 실행 가능)
+        workers = [
+            asyncio.create_task(self._service_worker(service_queue, progress))
+            for _ in range(self.service_slots.maximum)
+        ]
+
+        scanned = 0
+        discovery_tasks = []
+        try:
+            async for batch in batches:
+                batch = self._drop_excluded(batch)
+                if not batch:
+                    continue
+                progress.total += len(batch)
+                scanned += len(batch)
+                batch = self._resume_from_journal(batch, service_queue, progress)
+                new_hosts, known_ports = self._split_by_baseline(batch)
+                if known_ports:
+                    discovery_tasks.append(asyncio.create_task(
+                        self._verify_known_ports(known_ports, params, semaphore, service_queue, progress)
+                    ))
+                if new_hosts:
+                    discover = self._discover_ports_tiered if self.top_ports else self._discover_ports
+                    discovery_tasks.append(asyncio.create_task(
+                        discover(new_hosts, params, semaphore, service_queue, progress)
+                    ))
+            await asyncio.gather(*discovery_tasks)
+        finally:
+            # 포트 발견 종료 → 서비스 워커 종료 sentinel
+            for _ in workers:
+                service_queue.put_nowait(None)
+            await asyncio.gather(*workers, *discovery_tasks, return_exceptions=True)
+            progress.close()
+
+        return scanned
+
+    def _drop_excluded(self, hosts: list[str]) -> list[str]:
+        """제외 대상 호스트 제거 (재사용한 alive_hosts 파일, 코디네이터 작업 단위 대비)"""
+        kept = self.config.exclusions.filter(hosts)
+        if len(kept) < len(hosts):
+            self.metrics.incr("phase2_excluded_hosts", len(hosts) - len(kept))
+            self.logger.debug(f"제외 대상 {len(hosts) - len(kept)}개 호스트 스킵")
+        return kept
+
+    def _resume_from_journal(
+        self,
+        hosts: list[str],
+        service_queue: asyncio.Queue,
+        progress: ProgressTracker,
+    ) -> list[str]:
+        """저널 기준 완료 호스트 제외, 포트 발견만 끝난 호스트는 서비스 탐지 큐로 직행
+
+        Returns:
+            포트 발견이 필요한 호스트 목록
+        """
+        if self.journal is None:
+            return hosts
 
+        pending: list[str] = []
+        resumed: dict[str, list[int]] = {}
+        for host in hosts:
+            if host in self.journal.hosts_done:
+                progress.update()
+                continue
+            ports = self.journal.known_ports(host)
+            if ports is None:
+                pending.append(host)
+            elif ports:
+                resumed[host] = ports
+            else:
+                progress.update()
+
+        if resumed:
+            service_queue.put_nowait((resumed, None))
+        return pending
+
+    def _split_by_baseline(
+        self, hosts: list[str]
+    ) -> tuple[list[str], dict[str, list[int]]]:
+        """베이스라인 기준으로 (전체 스윕 대상, {알려진 호스트: 기존 오픈 포트}) 분리"""
+        if self.baseline is None:
+            return hosts, {}
+
+        new_hosts: list[str] = []
+        known: dict[str, list[int]] = {}
+        for host in hosts:
+            ports = self.baseline.known_ports(host)
+            if ports is None:
+                new_hosts.append(host)
+            else:
+                known[host] = ports
+        return new_hosts, known
+
+    async def _run_port_discovery(
+        self,
+        hosts: list[str],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        ports: Optional[list[int]] = None,
+        low_priority: bool = False,
+    ) -> tuple[dict[str, list[int]], bool]:
+        """설정된 엔진으로 포트 발견 (ports 지정 시 해당 포트만)
+
+        Args:
+            low_priority: 서브넷/전역 슬롯을 일반 작업이 없을 때만 획득 (상위 포트 모드 전체 스윕)
+
+        Returns:
+            ({호스트: 오픈 포트}, 정상 종료 여부)
+        """
+        if self.connect_scanner is not None:
+            return await self._run_connect_scan(hosts, params, semaphore, ports, low_priority)
+        return await self._run_rustscan(hosts, params, semaphore, ports, low_priority)
+
+    async def _run_connect_scan(
+        self,
+        hosts: list[str],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        ports: Optional[list[int]] = None,
+        low_priority: bool = False,
+    ) -> tuple[dict[str, list[int]], bool]:
+        """내장 connect 엔진 실행 (batch_size = 동시 connect 수, timeout = 포트별 타임아웃)
+
+        로컬 자원 오류(EMFILE, ENOBUFS 등)가 있으면 결과가 불완전하므로 실패로 보고한다.
+
+        Returns:
+            ({호스트: 오픈 포트}, 정상 종료 여부)
+        """
+        async with (
+            semaphore.slot(low_priority),
+            self.host_slots.slot(low_priority),
+            self.rate_governor.lease(params.packet_rate) as rate,
+        ):
+            with self.metrics.timer("connect", self.subnet, hosts) as timing:
                 try:
-                    await run_command(cmd, timeout=600)
-                    progress.update()
+                    open_ports, stats = await self.connect_scanner.scan(
+                        hosts,
+                        ports or ALL_PORTS,
+                        timeout_ms=params.timeout,
+                        concurrency=params.batch_size,
+                        rate=rate if self.rate_governor.enabled else None,
+                    )
+                    timing.ok = stats.errors == 0
+                    self.metrics.incr("connect_attempts", stats.attempts)
+                    self.metrics.incr("connect_filtered", stats.filtered)
+                    if stats.errors:
+                        self.metrics.incr("connect_errors", stats.errors)
+                        self.logger.debug(
+                            f"connect 로컬 오류 {stats.errors}건 ({', '.join(hosts)}): 결과 불완전"
+                        )
                 except Exception as e:
-                    self.logger.debug(f"스캔 실패 ({host}): {e}")
-                    progress.update()
+                    self.logger.debug(f"포트 발견 실패 ({', '.join(hosts)}): {e}")
+                    timing.ok = False
+                    open_ports = {}
+
+            semaphore.record(timing.ok)
+            self.host_slots.record(timing.ok)
+            if not timing.ok:
+                self.metrics.incr("connect_failures")
+            return open_ports, timing.ok
+
+    async def _run_rustscan(
+        self,
+        hosts: list[str],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        ports: Optional[list[int]] = None,
+        low_priority: bool = False,
+    ) -> tuple[dict[str, list[int]], bool]:
+        """rustscan -g 실행 (ports 지정 시 해당 포트만)
+
+        Returns:
+            ({호스트: 오픈 포트}, 정상 종료 여부)
+        """
+        # 서브넷 한도 → 전역 슬롯 → pps 예산 순서로 획득 (한 서브넷이 전역 슬롯 독점 방지)
+        async with (
+            semaphore.slot(low_priority),
+            self.host_slots.slot(low_priority),
+            self.rate_governor.lease(params.packet_rate) as rate,
+        ):
+            if self.rate_governor.enabled:
+                params = params.limited_to(rate)
+            cmd = [
+                "rustscan",
+                "-a", ",".join(hosts),
+                "-b", str(params.batch_size),
+                "-t", str(params.timeout),
+                "--ulimit", str(params.required_ulimit),
+                "-g",                                      # greppable: 포트 목록만 출력 (nmap 미실행)
+            ]
+            if ports:
+                cmd += ["-p", ",".join(str(port) for port in ports)]
+
+            with self.metrics.timer("rustscan", self.subnet, hosts) as timing:
+                try:
+                    # 필터링 호스트는 timeout마다 batch_size개씩만 끝나므로 축소된 batch 기준 최악 시간까지 허용
+                    probes = len(hosts) * len(ports or ALL_PORTS)
+                    deadline = 300 + max(60 * len(hosts), params.worst_case_seconds(probes))
+                    result = await run_command(cmd, timeout=deadline)
+                    timing.ok = result.success
+                    open_ports = parse_rustscan_grepable(result.stdout)
+                except Exception as e:
+                    self.logger.debug(f"포트 발견 실패 ({', '.join(hosts)}): {e}")
+                    timing.ok = False
+                    open_ports = {}
+
+            # AIMD: 서브넷/전역 한도에 결과 보고
+            semaphore.record(timing.ok)
+            self.host_slots.record(timing.ok)
+            if not timing.ok:
+                self.metrics.incr("rustscan_failures")
+            return open_ports, timing.ok
+
+    async def _discover_ports(
+        self,
+        hosts: list[str],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        service_queue: asyncio.Queue,
+        progress: ProgressTracker,
+    ) -> None:
+        """1단계: rustscan/connect로 오픈 포트 발견 후 서비스 탐지 큐에 전달"""
+        open_ports, completed = await self._run_port_discovery(hosts, params, semaphore)
+        found = {host: open_ports[host] for host in hosts if open_ports.get(host)}
+        await self._submit_ports(hosts, found, completed, service_queue, progress)
+
+    async def _discover_ports_tiered(
+        self,
+        hosts: list[str],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        service_queue: asyncio.Queue,
+        progress: ProgressTracker,
+    ) -> None:
+        """1단계 (상위 포트 모드): 상위 포트 패스 → 서비스 탐지, 이어서 낮은 우선순위 전체 스윕
+
+        호스트는 전체 스윕과 두 패스의 서비스 탐지가 모두 끝나야 완료(저널 host_done)로 기록한다.
+        """
+        top_ports, _ = await self._run_port_discovery(hosts, params, semaphore, ports=self.top_ports)
+        top_found = {host: top_ports[host] for host in hosts if top_ports.get(host)}
+        if top_found:
+            self.metrics.incr("top_ports_discovered", sum(len(ports) for ports in top_found.values()))
+            await self._queue_tier(top_found, "top", service_queue)
+
+        all_ports, completed = await self._run_port_discovery(
+            hosts, params, semaphore, low_priority=True
+        )
+        tail_found: dict[str, list[int]] = {}
+        for host in hosts:
+            ports = set(all_ports.get(host, [])) | set(top_found.get(host, []))
+            if completed and self.journal is not None:
+                self.journal.record_ports(host, sorted(ports))
+            tail = sorted(ports - set(top_found.get(host, [])))
+            if tail:
+                tail_found[host] = tail
+            if not completed:
+                self._tier_failed.add(host)
+            self._swept.add(host)
+
+        self.metrics.incr("hosts_port_scanned", len(hosts))
+        self.metrics.incr("ports_discovered", sum(len(ports) for ports in all_ports.values()))
+        if tail_found:
+            await self._queue_tier(tail_found, "tail", service_queue)
+        for host in hosts:
+            self._finish_tiered_host(host, progress)
+
+    async def _queue_tier(
+        self, found: dict[str, list[int]], tier: str, service_queue: asyncio.Queue
+    ) -> None:
+        """상위 포트 모드 서비스 탐지 항목 전달 (호스트별 대기 항목 수 증가)"""
+        for host in found:
+            self._open_items[host] += 1
+        await service_queue.put((found, tier))
+        self.metrics.observe_queue("service_queue", service_queue.qsize())
+
+    def _finish_tiered_host(self, host: str, progress: ProgressTracker) -> None:
+        """상위 포트 모드: 전체 스윕과 대기 중인 서비스 탐지가 모두 끝난 호스트를 완료 처리"""
+        if host not in self._swept or self._open_items.get(host):
+            return
+        self._swept.discard(host)
+        self._open_items.pop(host, None)
+        if self.journal is not None and host not in self._tier_failed:
+            self.journal.record_host(host)
+        self._tier_failed.discard(host)
+        progress.update()
+
+    async def _verify_known_ports(
+        self,
+        known_ports: dict[str, list[int]],
+        params: RustscanParams,
+        semaphore: AdaptiveLimiter,
+        service_queue: asyncio.Queue,
+        progress: ProgressTracker,
+    ) -> None:
+        """베이스라인 호스트: 기존 오픈 포트만 재확인
+
+        기존 포트가 모두 열려 있으면 변경 없음으로 보고 그 포트만 서비스 탐지로 보낸다.
+        닫힌 포트가 있거나 재확인에 실패한 호스트는 변경으로 보고 전체 스윕한다.
+        """
+        hosts = list(known_ports)
+        union_ports = sorted({port for ports in known_ports.values() for port in ports})
+
+        if union_ports:
+            open_ports, completed = await self._run_port_discovery(
+                hosts, params, semaphore, ports=union_ports
+            )
+        else:
+            # 베이스라인에서 오픈 포트가 없던 호스트: 재확인할 포트 없음
+            open_ports, completed = {}, True
+
+        unchanged: dict[str, list[int]] = {}
+        changed: list[str] = []
+        for host, ports in known_ports.items():
+            if completed and set(ports) <= set(open_ports.get(host, [])):
+                unchanged[host] = ports
+            else:
+                changed.append(host)
+
+        if unchanged:
+            found = {host: ports for host, ports in unchanged.items() if ports}
+            await self._submit_ports(list(unchanged), found, True, service_queue, progress)
+        if changed:
+            self.logger.debug(f"베이스라인 대비 변경 호스트 전체 스윕: {', '.join(changed)}")
+            await self._discover_ports(changed, params, semaphore, service_queue, progress)
+
+    async def _submit_ports(
+        self,
+        hosts: list[str],
+        found: dict[str, list[int]],
+        completed: bool,
+        service_queue: asyncio.Queue,
+        progress: ProgressTracker,
+    ) -> None:
+        """포트 발견 결과 저널 기록 후 서비스 탐지 큐에 전달"""
+        if completed and self.journal is not None:
+            for host in hosts:
+                self.journal.record_ports(host, found.get(host, []))
+                if host not in found:
+                    self.journal.record_host(host)
+
+        self.metrics.incr("hosts_port_scanned", len(hosts))
+        self.metrics.incr("ports_discovered", sum(len(ports) for ports in found.values()))
+
+        # 오픈 포트가 없는 호스트는 서비스 탐지 없이 완료
+        progress.update(len(hosts) - len(found))
+        if found:
+            await service_queue.put((found, None))
+            self.metrics.observe_queue("service_queue", service_queue.qsize())
+
+    async def _service_worker(
+        self, service_queue: asyncio.Queue, progress: ProgressTracker
+    ) -> None:
+        """2단계 워커: 큐에서 ({host: ports}, 패스)를 받아 nmap -sV -sC 실행
+
+        패스가 None이면 단일 스윕 결과, "top"/"tail"이면 상위 포트 모드
+        (전체 스윕 결과는 낮은 우선순위 슬롯에서 이전 출력 뒤에 이어씀).
+        """
+        while True:
+            item = await service_queue.get()
+            self.metrics.observe_queue("service_queue", service_queue.qsize())
+            if item is None:
+                return
+            host_ports, tier = item
+            async with self.service_slots.slot(low_priority=tier == "tail"):
+                completed = await self._detect_services(host_ports, append=tier == "tail")
+
+            if tier is None:
+                if completed and self.journal is not None:
+                    for host in host_ports:
+                        self.journal.record_host(host)
+                progress.update(len(host_ports))
+                continue
+
+            for host in host_ports:
+                self._open_items[host] -= 1
+                if not completed:
+                    self._tier_failed.add(host)
+                self._finish_tiered_host(host, progress)
+
+    async def _detect_services(self, host_ports: dict[str, list[int]], append: bool = False) -> bool:
+        """서비스 탐지 (캐시 조회 → 미스 포트만 nmap → 결과 병합 후 results.db 적재)
+
+        Args:
+            append: scan_{host}.nmap에 이어쓰기 (상위 포트 모드 전체 스윕 결과)
+
+        Returns:
+            nmap 정상 종료 여부 (모두 캐시 적중이면 True)
+        """
+        if self.service_cache is None:
+            completed, xml_file = await self._run_service_nmap(host_ports, append)
+            self._ingest_xml(xml_file, merge=append)
+            return completed
+
+        with self.metrics.timer("banner_grab", self.subnet, host_ports):
+            fingerprints = await self._fingerprint_ports(host_ports)
+        cached, to_scan = self._lookup_service_cache(host_ports, fingerprints)
+
+        completed = True
+        results: dict[str, HostResult] = {}
+        if to_scan:
+            completed, xml_file = await self._run_service_nmap(to_scan, append)
+            results = {host.host: host for host in parse_nmap_xml(xml_file)}
+            if completed:
+                self._update_service_cache(to_scan, fingerprints, results)
+
+        for host, entries in cached.items():
+            self._write_cached_output(host, entries, append=append or host in to_scan)
+            merged = results.setdefault(host, HostResult(host=host, state="up"))
+            known = {(port.port, port.protocol) for port in merged.ports}
+            for port_result, _ in entries:
+                if port_result.protocol == "host":
+                    merged.scripts.update(port_result.scripts)
+                elif (port_result.port, port_result.protocol) not in known:
+                    known.add((port_result.port, port_result.protocol))
+                    merged.ports.append(port_result)
+
+        if self.results_store is not None and results:
+            try:
+                self.results_store.ingest_hosts(list(results.values()), merge=append)
+            except Exception as e:
+                self.logger.debug(f"결과 저장소 적재 실패 ({', '.join(results)}): {e}")
+        return completed
+
+    async def _fingerprint_ports(
+        self, host_ports: dict[str, list[int]]
+    ) -> dict[str, dict[int, str]]:
+        """포트별 배너 지문 수집 (접속 실패/빈 배너 포트는 제외 → 캐시 미스)"""
+        limiter = asyncio.Semaphore(64)
+
+        async def fingerprint(host: str, port: int) -> tuple[str, int, Optional[str]]:
+            async with limiter:
+                banner = await grab_banner(host, port)
+            return host, port, banner_fingerprint(banner) if banner is not None else None
+
+        results = await asyncio.gather(
+            *(fingerprint(host, port) for host, ports in host_ports.items() for port in ports)
+        )
+        fingerprints: dict[str, dict[int, str]] = {host: {} for host in host_ports}
+        for host, port, fp in results:
+            if fp is not None:
+                fingerprints[host][port] = fp
+        return fingerprints
+
+    def _lookup_service_cache(
+        self,
+        host_ports: dict[str, list[int]],
+        fingerprints: dict[str, dict[int, str]],
+    ) -> tuple[dict[str, list[tuple[PortResult, str]]], dict[str, list[int]]]:
+        """캐시 조회
+
+        모든 포트가 적중해도 호스트 스크립트 항목이 없으면 호스트 전체를 재탐지한다.
+
+        Returns:
+            ({호스트: [(PortResult, 블록 텍스트)]}, {호스트: nmap 대상 포트})
+        """
+        cached: dict[str, list[tuple[PortResult, str]]] = {}
+        to_scan: dict[str, list[int]] = {}
+
+        for host, ports in host_ports.items():
+            hits: list[tuple[PortResult, str]] = []
+            misses: list[int] = []
+            for port in ports:
+                fp = fingerprints[host].get(port)
+                entry = self.service_cache.get(host, port, fp) if fp else None
+                if entry is None:
+                    misses.append(port)
+                else:
+                    hits.append(entry)
+
+            if not misses:
+                host_entry = self.service_cache.get(
+                    host, HOST_SCRIPTS_PORT, host_fingerprint(fingerprints[host]), protocol="host"
+                )
+                if host_entry is None:
+                    hits, misses = [], ports
+                else:
+                    hits.append(host_entry)
+
+            if misses:
+                to_scan[host] = misses
+            if hits:
+                cached[host] = hits
+
+        return cached, to_scan
+
+    def _update_service_cache(
+        self,
+        scanned: dict[str, list[int]],
+        fingerprints: dict[str, dict[int, str]],
+        results: dict[str, HostResult],
+    ) -> None:
+        """nmap 결과를 포트별 (PortResult, -oN 블록)으로 캐시에 저장 (이번에 탐지한 포트만, (포트, 프로토콜)당 1개)"""
+        entries: dict[tuple[str, int, str], tuple[str, str, PortResult, str]] = {}
+        for host, ports in scanned.items():
+            host_result = results.get(host)
+            scan_file = self._scan_file(host)
+            if host_result is None or not scan_file.exists():
+                continue
+
+            blocks, host_block = split_port_blocks(scan_file.read_text(errors="replace"))
+            for port_result in host_result.ports:
+                if port_result.port not in ports:
+                    continue
+                fp = fingerprints[host].get(port_result.port)
+                text = blocks.get((port_result.port, port_result.protocol))
+                if fp and text and port_result.state == "open":
+                    entries[(host, port_result.port, port_result.protocol)] = (host, fp, port_result, text)
+
+            # 호스트 스크립트: 호스트의 모든 포트 지문이 있을 때만 저장
+            if set(ports) <= set(fingerprints[host]):
+                host_entry = PortResult(
+                    port=HOST_SCRIPTS_PORT, protocol="host", state="", scripts=host_result.scripts
+                )
+                entries[(host, HOST_SCRIPTS_PORT, "host")] = (
+                    host, host_fingerprint(fingerprints[host]), host_entry, host_block
+                )
+
+        self.service_cache.put_many(list(entries.values()))
+
+    def _write_cached_output(
+        self, host: str, entries: list[tuple[PortResult, str]], append: bool
+    ) -> None:
+        """캐시 적중 결과를 scan_{host}.nmap에 기록 (부분 적중은 nmap 출력 뒤에 추가, 이미 있는 포트는 생략)"""
+        scan_file = self._scan_file(host)
+        written: set[tuple[int, str]] = set()
+        if append and scan_file.exists():
+            written = set(split_port_blocks(scan_file.read_text(errors="replace"))[0])
+
+        port_blocks = []
+        for result, text in sorted(entries, key=lambda entry: entry[0].port):
+            if result.protocol != "host" and text and (result.port, result.protocol) not in written:
+                written.add((result.port, result.protocol))
+                port_blocks.append(text)
+        host_blocks = [text for result, text in entries if result.protocol == "host" and text]
+
+        if append:
+            lines = ["", "# Cached service results (service cache, fingerprint-verified)"]
+        else:
+            lines = [
+                "# Nmap service results reused from service cache (fingerprint-verified)",
+                f"{_NMAP_REPORT_PREFIX}{host}",
+            ]
+        lines += ["PORT STATE SERVICE VERSION", *port_blocks]
+        if host_blocks:
+            lines += ["", *host_blocks]
+
+        with open(scan_file, "a" if append else "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    async def _run_service_nmap(
+        self, host_ports: dict[str, list[int]], append: bool = False
+    ) -> tuple[bool, Path]:
+        """nmap -sV -sC -p <발견 포트> 실행 (배치는 포트 합집합으로 1회 실행 후 분리)
+
+        Args:
+            append: 호스트별 scan_{host}.nmap 뒤에 이어쓰기 (XML은 *_tail.xml로 별도 기록)
+
+        Returns:
+            (nmap 정상 종료 여부, XML 출력 파일)
+        """
+        hosts = list(host_ports)
+        ports = sorted({port for host_port_list in host_ports.values() for port in host_port_list})
+        split_output = len(hosts) > 1 or append
+
+        if not split_output:
+            output_file = self._scan_file(hosts[0])
+            xml_file = output_file.with_suffix(".xml")
+        else:
+            if len(hosts) == 1:
+                batch_name = self._host_safe(hosts[0])
+            else:
+                batch_name = f"batch_{self._host_safe(hosts[0])}_{len(hosts)}"
+            if append:
+                batch_name += "_tail"
+            output_file = self.scan_dir / f".{batch_name}.nmap"
+            xml_file = self.scan_dir / f"scan_{batch_name}.xml"
+
+        cmd = [
+            "nmap",
+            "-Pn",                                     # 호스트 발견 스킵 (Phase 1 완료)
+            "-T4",                                     # T3→T4 (Phase 1 검증 완료)
+            "-sV", "-sC",                              # -A → -sV -sC (OS/traceroute 제거)
+            "-n",                                      # DNS 비활성화
+            "--max-retries", "2",                      # 재시도 최소화
+            "--host-timeout", "240s",                  # 개별 호스트 4분 제한
+            "-v",                                      # 상세 출력
+            "-p", ",".join(str(port) for port in ports),
+            "-oN", str(output_file),
+            "-oX", str(xml_file),                      # 구조화 결과 (results.db 적재용)
+            *hosts,
+        ]
+
+        try:
+            async with self.rate_governor.lease(SERVICE_SCAN_RATE) as rate:
+                if self.rate_governor.enabled:
+                    cmd[1:1] = ["--max-rate", str(rate)]  # 전역 pps 예산 할당분
+                with self.metrics.timer("nmap_service", self.subnet, hosts) as timing:
+                    result = await run_command(cmd, timeout=600)
+                    timing.ok = result.success
+            self.metrics.incr("hosts_service_scanned", len(hosts))
+
+            # --host-timeout 초과 호스트: 결과 불완전 → 혼잡 신호로 AIMD에 보고
+            host_timeouts = result.stdout.count(_NMAP_HOST_TIMEOUT)
+            if host_timeouts:
+                self.metrics.incr("nmap_host_timeouts", host_timeouts)
+                self.logger.debug(f"nmap host-timeout {host_timeouts}개 ({', '.join(hosts)})")
+            self.service_slots.record(result.success and not host_timeouts)
+            return result.success, xml_file
+        except Exception as e:
+            self.logger.debug(f"서비스 탐지 실패 ({', '.join(hosts)}): {e}")
+            self.metrics.incr("nmap_service_failures")
+            self.service_slots.record(False)
+            return False, xml_file
+        finally:
+            if split_output:
+                self._split_batch_output(output_file, append)
+
+    def _ingest_xml(self, xml_file: Path, merge: bool = False) -> None:
+        """nmap XML 결과를 results.db에 적재 (merge: 기존 포트 유지)"""
+        if self.results_store is None or not xml_file.exists():
+            return
+        try:
+            self.results_store.ingest_xml(xml_file, merge=merge)
+        except Exception as e:
+            self.logger.debug(f"결과 저장소 적재 실패 ({xml_file.name}): {e}")
+
+    def _split_batch_output(self, batch_file: Path, append: bool = False) -> None:
+        """배치 nmap 출력을 호스트별 scan_{host}.nmap 파일로 분리 (append면 기존 출력 뒤에 추가)"""
+        if not batch_file.exists():
+            return
+        for host, text in split_nmap_output(batch_file.read_text(errors="replace")).items():
+            with open(self._scan_file(host), "a" if append else "w") as f:
+                f.write(text)
+        batch_file.unlink()
 
-        tasks = [scan_host(host) for host in hosts]
-        await asyncio.gather(*tasks)
+    def _scan_file(self, host: str) -> Path:
+        """호스트별 nmap 결과 파일 경로"""
+        return self.scan_dir / f"scan_{self._host_safe(host)}.nmap"
 
+    @staticmethod
+    def _host_safe(host: str) -> str:
+        """파일명 안전 호스트 문자열"""
+        return host.replace(".", "_").replace("/", "_")
 
     def _verify_and_increase_ulimit(self, required_ulimit: int) -> None:
         """
@@ -4,17 +4,22 @@ import argparse
 import asyncio
 import getpass
 import os
+import socket
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # 부모 디렉토리를 import path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from scanner.config import Config
-from scanner.logger import ColorLogger
+from scanner.config import PORT_ENGINES, Config
+from scanner.distributed import Coordinator, Worker
+from scanner.logger import LOG_LEVELS, ColorLogger
 from scanner.scanner import Scanner
-from utils.json_loader import load_targets
+from utils.connect_scan import DEFAULT_MAX_SOCKETS
+from utils.json_loader import DEFAULT_SPLIT_PREFIX, TargetsData, load_targets
+from utils.service_cache import SERVICE_CACHE_FILENAME
 
 
 def parse_args() -> argparse.Namespace:
@@ -30,6 +35,25 @@ def parse_args() -> argparse.Namespace:
   # 커스텀 타겟 파일
   %(prog)s --json-file custom_targets.json
 
+  # 텍스트 인벤토리 (IP/CIDR/범위, 한 줄에 하나, '!'는 제외)
+  %(prog)s --json-file inventory.txt
+
+  # 증분 재스캔 (어제 결과 기준)
+  %(prog)s --baseline scans/rustscan_massive_20260212_020000
+
+  # rustscan 없이 내장 connect 엔진으로 포트 발견
+  %(prog)s --port-engine connect --connect-sockets 8192
+
+  # 상위 100개 포트 결과를 먼저 받고 전체 포트 스윕은 유휴 용량으로
+  %(prog)s --top-ports 100
+
+  # 중단된 스캔 재개
+  %(prog)s --resume scans/rustscan_massive_20260213_120000
+
+  # 분산 스캔: 코디네이터 1대 + 워커 N대 (SCAN_TOKEN 환경변수로 공유 토큰)
+  %(prog)s --coordinator 0.0.0.0:8765 --json-file targets.json
+  %(prog)s --worker http://10.0.0.1:8765
+
   # sudo 비밀번호 환경변수로 전달 (자동화)
   export SUDO_PASSWORD="your_password"
   %(prog)s
@@ -41,15 +65,189 @@ def parse_args() -> argparse.Namespace:
         "--json-file",
         type=Path,
         default=Path(__file__).parent / "targets.json",
-        help="타겟 JSON 파일 경로 (기본값: ./targets.json)",
+        help="타겟 파일 경로: JSON 또는 IP/CIDR/범위 텍스트 목록 (기본값: ./targets.json)",
+    )
+    parser.add_argument(
+        "--split-prefix",
+        type=int,
+        default=DEFAULT_SPLIT_PREFIX,
+        metavar="N",
+        help=(
+            f"병합 후 /N보다 큰 IPv4 네트워크를 /N 서브넷으로 분할 (0이면 분할 안 함, 기본값: {DEFAULT_SPLIT_PREFIX})"
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=Path,
+        metavar="SCAN_DIR",
+        help="중단된 스캔 디렉토리에서 재개 (journal.jsonl 기준 완료 작업 스킵)",
     )
 
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        metavar="SCAN_DIR",
+        help="증분 재스캔: 이전 스캔 디렉토리 기준으로 신규/변경 호스트만 전체 포트 스윕",
+    )
+
+    # 동시성
+    parser.add_argument(
+        "--parallel-discovery",
+        type=int,
+        default=2,
+        help="동시에 실행할 Phase 1 (nmap -sn) 서브넷 수 (기본값: 2)",
+    )
+    parser.add_argument(
+        "--parallel-hosts",
+        type=int,
+        default=5,
+        help="전체 서브넷 합산 동시 포트 발견(rustscan) 수 (기본값: 5)",
+    )
+    parser.add_argument(
+        "--parallel-services",
+        type=int,
+        default=5,
+        help="전체 서브넷 합산 동시 서비스 탐지(nmap -sV -sC) 수 (기본값: 5)",
+    )
+    parser.add_argument(
+        "--batch-hosts",
+        type=int,
+        default=1,
+        help="rustscan 1회 실행에 묶을 호스트 수 (기본값: 1)",
+    )
+    parser.add_argument(
+        "--port-engine",
+        choices=list(PORT_ENGINES),
+        default="rustscan",
+        help="Phase 2 포트 발견 엔진: rustscan 또는 내장 asyncio TCP connect (기본값: rustscan)",
+    )
+    parser.add_argument(
+        "--connect-sockets",
+        type=int,
+        default=DEFAULT_MAX_SOCKETS,
+        metavar="N",
+        help=f"connect 엔진 전역 동시 소켓 수 (모든 서브넷 공유, 기본값: {DEFAULT_MAX_SOCKETS})",
+    )
+    parser.add_argument(
+        "--top-ports",
+        type=int,
+        default=0,
+        metavar="N",
+        help="상위 포트 모드: 이전 스캔에서 자주 열린 N개 포트(부족하면 내장 목록)를 먼저 스캔해 "
+             "바로 서비스 탐지, 전체 포트 스윕은 낮은 우선순위로 실행 (기본값: 0, 비활성화)",
+    )
+    parser.add_argument(
+        "--shard-prefix",
+        type=int,
+        default=20,
+        help="Phase 1 샤드 크기 (이보다 큰 서브넷은 /N 샤드로 분할, 기본값: 20)",
+    )
+    parser.add_argument(
+        "--shard-workers",
+        type=int,
+        default=4,
+        help="서브넷당 동시 nmap -sn 샤드 수 (기본값: 4)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Phase 1에서 발견한 호스트를 즉시 Phase 2로 전달 (스트리밍 모드)",
+    )
+    parser.add_argument(
+        "--no-adaptive-rtt",
+        dest="adaptive_rtt",
+        action="store_false",
+        help="RTT 기반 rustscan 파라미터 튜닝 비활성화 (안전 모드 고정값 사용)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=int,
+        default=30000,
+        metavar="PPS",
+        help="전체 nmap/rustscan 합산 패킷 속도 상한 (0이면 제한 없음, 기본값: 30000)",
+    )
+    parser.add_argument(
+        "--summary-workers",
+        type=int,
+        metavar="N",
+        help="스캔 후 결과 집계(scan_*.nmap → summary.json/CSV) 프로세스 수 (기본값: CPU 수)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Prometheus 텍스트 형식 메트릭을 http://127.0.0.1:PORT/metrics로 제공",
+    )
+    parser.add_argument(
+        "--no-adaptive-concurrency",
+        dest="adaptive_concurrency",
+        action="store_false",
+        help="AIMD 적응형 동시성 비활성화 (--parallel-hosts/--parallel-services 고정)",
+    )
+    parser.add_argument(
+        "--coordinator",
+        metavar="HOST:PORT",
+        help="분산 스캔 코디네이터로 실행 (서브넷을 작업 단위로 나눠 워커에 분배, 직접 스캔하지 않음)",
+    )
+    parser.add_argument(
+        "--worker",
+        metavar="URL",
+        help="분산 스캔 워커로 실행 (예: http://10.0.0.1:8765, 타겟은 코디네이터에서 받음)",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=f"{socket.gethostname()}-{os.getpid()}",
+        help="워커 식별자 (기본값: 호스트명-PID)",
+    )
+    parser.add_argument(
+        "--unit-prefix",
+        type=int,
+        default=20,
+        help="코디네이터 작업 단위 크기 (이보다 큰 서브넷은 /N으로 분할, 기본값: 20)",
+    )
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="워커 heartbeat가 없을 때 작업을 회수하는 시간 (기본값: 300)",
+    )
+    parser.add_argument(
+        "--no-service-cache",
+        dest="service_cache",
+        action="store_false",
+        help="서비스 탐지 캐시 비활성화 (모든 포트를 nmap -sV -sC로 재탐지)",
+    )
+    parser.add_argument(
+        "--service-cache-ttl",
+        type=int,
+        default=72,
+        metavar="HOURS",
+        help="서비스 캐시 항목 유효 기간 (시간, 기본값: 72)",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=list(LOG_LEVELS),
+        default="debug",
+        help="최소 로그 레벨 (기본값: debug)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        help="JSON lines 로그 파일 (레코드당 time/level/message 한 줄, 이어쓰기)",
+    )
 
     return parser.parse_args()
 
 
-def get_scan_directory() -> Path:
-    """타임스탬프 기반 스캔 디렉토리 생성"""
+def get_scan_directory(resume_dir: Optional[Path] = None) -> Path:
+    """타임스탬프 기반 스캔 디렉토리 생성 (resume_dir 지정 시 기존 디렉토리 재사용)"""
+    if resume_dir is not None:
+        if not resume_dir.is_dir():
+            raise FileNotFoundError(f"재개할 스캔 디렉토리를 찾을 수 없음: {resume_dir}")
+        return resume_dir.resolve()
+
     scans_root = Path(__file__).parent / "scans"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     scan_dir = scans_root / f"rustscan_massive_{timestamp}"
@@ -65,32 +263,51 @@ def get_sudo_password() -> str:
         ColorLogger.info("sudo 비밀번호: 환경변수에서 로드")
         return sudo_password
 
-    # 대화형 프롬프트
+    # 대화형 프롬프트 (대기 중인 로그를 먼저 출력)
+    ColorLogger.flush()
     return getpass.getpass("sudo 비밀번호: ")
 
 
 async def main() -> int:
     """메인 진입점"""
     args = parse_args()
+    ColorLogger.configure(level=args.log_level, json_file=args.log_file)
 
-    # 타겟 로드
-    try:
-        targets = load_targets(args.json_file)
-        ColorLogger.success(f"타겟 로드: {len(targets.subnets)}개 서브넷")
-    except Exception as e:
-        ColorLogger.error(f"타겟 로드 실패: {e}")
+    if args.coordinator and args.worker:
+        ColorLogger.error("--coordinator와 --worker는 함께 사용할 수 없습니다")
         return 1
 
-    # sudo 비밀번호
-    try:
-        sudo_password = get_sudo_password()
-    except KeyboardInterrupt:
-        ColorLogger.warning("\n사용자 취소")
-        return 130
+    # 타겟 로드 (워커는 코디네이터에서 작업 단위를 받음)
+    if args.worker:
+        targets = TargetsData(subnets=[], exclude=[])
+    else:
+        try:
+            targets = load_targets(args.json_file, split_prefix=args.split_prefix or None)
+            ColorLogger.success(
+                f"타겟 로드: {targets.entries:,}개 항목 → {len(targets.subnets):,}개 서브넷 "
+                f"(고유 주소 {targets.addresses:,}개, 제외 {targets.excluded:,}개, "
+                f"실제 스캔 {targets.effective_addresses:,}개)"
+            )
+        except Exception as e:
+            ColorLogger.error(f"타겟 로드 실패: {e}")
+            return 1
+
+    # sudo 비밀번호 (코디네이터는 직접 스캔하지 않음)
+    sudo_password = ""
+    if not args.coordinator:
+        try:
+            sudo_password = get_sudo_password()
+        except KeyboardInterrupt:
+            ColorLogger.warning("\n사용자 취소")
+            return 130
 
     # 스캔 디렉토리
-    scan_dir = get_scan_directory()
-    ColorLogger.info(f"스캔 디렉토리: {scan_dir}")
+    try:
+        scan_dir = get_scan_directory(args.resume)
+    except FileNotFoundError as e:
+        ColorLogger.error(str(e))
+        return 1
+    ColorLogger.info(f"스캔 디렉토리: {scan_dir}{' (재개)' if args.resume else ''}")
 
     # Config 생성
     script_dir = Path(__file__).parent
@@ -100,9 +317,41 @@ async def main() -> int:
         json_file=args.json_file,
         subnets=targets.subnets,
         exclude_ips=targets.exclude,
+        scan_units=targets.units,
         sudo_password=sudo_password,
+        max_parallel_discovery=args.parallel_discovery,
+        max_parallel_hosts=args.parallel_hosts,
+        max_parallel_services=args.parallel_services,
+        hosts_per_scan=args.batch_hosts,
+        port_engine=args.port_engine,
+        connect_max_sockets=args.connect_sockets,
+        top_ports=args.top_ports,
+        discovery_shard_prefix=args.shard_prefix,
+        discovery_shard_workers=args.shard_workers,
+        stream_hosts=args.stream,
+        adaptive_rtt=args.adaptive_rtt,
+        adaptive_concurrency=args.adaptive_concurrency,
+        baseline_dir=args.baseline,
+        max_rate=args.max_rate,
+        metrics_port=args.metrics_port,
+        summary_workers=args.summary_workers,
+        service_cache_file=(
+            script_dir / "scans" / SERVICE_CACHE_FILENAME if args.service_cache else None
+        ),
+        service_cache_ttl_hours=args.service_cache_ttl,
     )
 
+    if args.worker:
+        # 워커: 작업 단위마다 서브넷을 채워 검증
+        worker = Worker(config, args.worker, args.worker_id, token=os.getenv("SCAN_TOKEN", ""))
+        try:
+            completed = await worker.run()
+        except KeyboardInterrupt:
+            ColorLogger.warning("\n사용자에 의해 중단됨 (Ctrl+C)")
+            return 130
+        ColorLogger.success(f"워커 종료: 작업 {completed}개 완료")
+        return 0
+
     # 검증
     try:
         config.validate()
@@ -111,6 +360,24 @@ async def main() -> int:
         ColorLogger.error(f"설정 검증 실패: {e}")
         return 1
 
+    if args.coordinator:
+        host, _, port = args.coordinator.rpartition(":")
+        coordinator = Coordinator(
+            config,
+            unit_prefix=args.unit_prefix,
+            lease_timeout=args.lease_timeout,
+            token=os.getenv("SCAN_TOKEN", ""),
+        )
+        try:
+            await coordinator.serve(host or "0.0.0.0", int(port))
+        except ValueError as e:
+            ColorLogger.error(f"코디네이터 시작 실패: {e}")
+            return 1
+        except KeyboardInterrupt:
+            ColorLogger.warning("\n사용자에 의해 중단됨 (Ctrl+C)")
+            return 130
+        return 1 if coordinator.failed else 0
+
     # Scanner 실행
     scanner = Scanner(config)
     try:
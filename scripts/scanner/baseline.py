@@ -0,0 +1,73 @@
+"""증분 재스캔용 이전 스캔 결과(베이스라인) 모듈
+
+--baseline으로 지정한 이전 스캔 디렉토리에서 활성 호스트와 호스트별 오픈 포트를 읽어온다.
+- 활성 호스트: alive_hosts_*.txt
+- 오픈 포트: journal.jsonl의 ports_done (rustscan 전체 스윕) + results.db의 open 포트
+"""
+from pathlib import Path
+from typing import Optional, Set
+
+from scanner.journal import JOURNAL_FILENAME, ScanJournal
+from utils.exclusion import ExclusionIndex
+from utils.results_store import RESULTS_DB_FILENAME, ResultsStore
+
+
+class Baseline:
+    """이전 스캔의 활성 호스트/오픈 포트 스냅샷"""
+
+    def __init__(self, scan_dir: Path):
+        """
+        Args:
+            scan_dir: 이전 스캔 디렉토리
+
+        Raises:
+            FileNotFoundError: 디렉토리가 없는 경우
+        """
+        self.scan_dir = Path(scan_dir)
+        if not self.scan_dir.is_dir():
+            raise FileNotFoundError(f"베이스라인 스캔 디렉토리를 찾을 수 없음: {self.scan_dir}")
+
+        self.alive_hosts: Set[str] = set()
+        self.host_ports: dict[str, list[int]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """alive_hosts_*.txt, journal.jsonl, results.db 로드"""
+        for alive_file in self.scan_dir.glob("alive_hosts_*.txt"):
+            self.alive_hosts.update(
+                line.strip() for line in alive_file.read_text().splitlines() if line.strip()
+            )
+
+        ports: dict[str, set[int]] = {}
+
+        # 이전 스캔 디렉토리는 읽기만 한다 (읽기 전용 마운트/보관본도 지원, -wal/-shm 미생성)
+        if (self.scan_dir / JOURNAL_FILENAME).exists():
+            journal = ScanJournal(self.scan_dir, read_only=True)
+            for host, host_ports in journal.host_ports.items():
+                ports.setdefault(host, set()).update(host_ports)
+
+        db_file = self.scan_dir / RESULTS_DB_FILENAME
+        if db_file.exists():
+            store = ResultsStore(db_file, read_only=True)
+            try:
+                for host, host_ports in store.open_ports_by_host().items():
+                    ports.setdefault(host, set()).update(host_ports)
+            finally:
+                store.close()
+
+        self.host_ports = {host: sorted(host_ports) for host, host_ports in ports.items()}
+
+    def known_ports(self, host: str) -> Optional[list[int]]:
+        """베이스라인에서 포트 스캔이 끝난 호스트의 오픈 포트 (처음 보는 호스트면 None)"""
+        return self.host_ports.get(host)
+
+    def diff_alive(self, cidrs: list[str], alive_hosts: Set[str]) -> tuple[Set[str], Set[str]]:
+        """
+        서브넷(묶음 스캔 단위면 CIDR 목록 전체)의 활성 호스트를 베이스라인과 비교
+
+        Returns:
+            (새로 발견된 호스트, 사라진 호스트)
+        """
+        members = ExclusionIndex(cidrs)  # 서브넷 CIDR 구간 인덱스
+        previous = {host for host in self.alive_hosts if host in members}
+        return alive_hosts - previous, previous - alive_hosts
@@ -0,0 +1,168 @@
+"""AIMD 적응형 동시성 제한 모듈 (asyncio.Semaphore 대체)
+
+Phase 2 rustscan/nmap 슬롯을 관측된 실패율에 따라 조절한다.
+- 성공: 현재 한도만큼 연속 성공할 때마다 한도 +1 (additive increase)
+- 실패 (rustscan 오류, nmap 실패/host-timeout, asyncio.TimeoutError): 한도 × 0.5 (multiplicative decrease)
+- 감소 직후에는 그 시점에 이미 실행 중이던 작업 수만큼의 실패를 무시 (같은 혼잡으로 연속 감소 방지,
+  성공은 창을 소모하지 않고, 창은 현재 실행 중인 작업 수를 넘지 않음)
+- 낮은 우선순위 획득(slot(low_priority=True))은 일반 대기자가 없을 때만 빈 슬롯을 받음
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from scanner.logger import ColorLogger
+from scanner.metrics import ScanMetrics
+
+GROWTH_FACTOR = 4        # 최대 한도 = 초기 한도 × GROWTH_FACTOR
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveLimiter:
+    """AIMD 동시성 제한기 (async with로 슬롯 획득, record()로 결과 보고)"""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        metrics: Optional[ScanMetrics] = None,
+    ):
+        """
+        Args:
+            name: 로그용 이름 (예: rustscan, nmap)
+            initial: 초기 한도
+            minimum: 최소 한도
+            maximum: 최대 한도 (None이면 initial, 축소 후 initial까지만 회복)
+            metrics: 계측 수집기 (한도 변경 시 <name>_slot_limit 게이지 갱신)
+        """
+        self.name = name
+        self.minimum = max(1, min(minimum, initial))
+        self.maximum = max(initial, maximum if maximum is not None else initial)
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self._streak = 0             # 마지막 증가 이후 연속 성공 수
+        self._ignore_failures = 0    # 무시할 남은 실패 수 (감소 시점에 실행 중이던 작업 수)
+        self._waiters: deque[asyncio.Future] = deque()
+        self._low_waiters: deque[asyncio.Future] = deque()  # 2단계 전체 스윕 등 유휴 용량 작업
+        self.metrics = metrics
+        self.logger = ColorLogger
+        self._publish()
+
+    @classmethod
+    def fixed(cls, name: str, limit: int, metrics: Optional[ScanMetrics] = None) -> "AdaptiveLimiter":
+        """한도 고정 제한기 (적응형 비활성화 시)"""
+        return cls(name, limit, minimum=limit, maximum=limit, metrics=metrics)
+
+    @property
+    def adaptive(self) -> bool:
+        """한도 조절 여부"""
+        return self.minimum < self.maximum
+
+    @property
+    def current_limit(self) -> int:
+        """현재 동시 실행 한도"""
+        return int(self.limit)
+
+    async def acquire(self, low_priority: bool = False) -> None:
+        """
+        슬롯 획득 (한도에 여유가 생길 때까지 대기)
+
+        Args:
+            low_priority: True면 일반 우선순위 대기자가 모두 슬롯을 받은 뒤에만 획득
+        """
+        loop = asyncio.get_running_loop()
+        waiters = self._low_waiters if low_priority else self._waiters
+        while self.in_flight >= self.current_limit or (low_priority and self._waiters):
+            waiter = loop.create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    self._wake()  # 받은 깨우기를 다음 대기자에게 넘김
+                raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        """슬롯 반환"""
+        self.in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, low_priority: bool = False) -> AsyncIterator["AdaptiveLimiter"]:
+        """우선순위 지정 슬롯 (async with limiter와 같고 low_priority만 추가)"""
+        await self.acquire(low_priority)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def _wake(self) -> None:
+        """빈 슬롯 수만큼 대기자 깨우기 (일반 우선순위 먼저)"""
+        free = self.current_limit - self.in_flight
+        for waiters in (self._waiters, self._low_waiters):
+            while free > 0 and waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    free -= 1
+
+    def _publish(self) -> None:
+        """현재 한도를 게이지로 기록"""
+        if self.metrics is not None:
+            self.metrics.gauge(f"{self.name}_slot_limit", self.current_limit)
+
+    def record(self, ok: bool) -> None:
+        """
+        작업 결과 보고 (슬롯 반환 전후 어느 쪽이든 가능)
+
+        Args:
+            ok: 정상 완료 여부 (False: 실패/타임아웃)
+        """
+        if ok:
+            self.successes += 1
+        else:
+            self.failures += 1
+
+        if not self.adaptive:
+            return
+
+        # 감소 시점 작업은 실행 중인 작업 중에만 남아 있으므로 창을 in_flight 이하로 유지
+        self._ignore_failures = min(self._ignore_failures, self.in_flight)
+        if not ok and self._ignore_failures > 0:
+            self._ignore_failures -= 1
+            return
+
+        if ok:
+            self._streak += 1
+            if self._streak >= self.current_limit and self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1)
+                self._streak = 0
+                self.logger.debug(f"동시성 증가: {self.name} → {self.current_limit}")
+                self._publish()
+                self._wake()
+            return
+
+        previous = self.current_limit
+        self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+        self._streak = 0
+        self._ignore_failures = self.in_flight
+        if self.current_limit < previous:
+            self._publish()
+            self.logger.warning(
+                f"동시성 감소: {self.name} {previous} → {self.current_limit} (실패/타임아웃 감지)"
+            )
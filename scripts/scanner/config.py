@@ -1,6 +1,12 @@
 """스캐너 설정 관리 모듈"""
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
+
+from utils.exclusion import ExclusionIndex
+
+PORT_ENGINES = ("rustscan", "connect")
 
 
 @dataclass
@@ -14,17 +20,77 @@ class Config:
 
     # 타겟
     subnets: list[str]
-    exclude_ips: list[str] = field(default_factory=list)
+    exclude_ips: list[str] = field(default_factory=list)  # IP, CIDR, 범위
+    scan_units: dict[str, list[str]] = field(default_factory=dict)  # 묶음 스캔 단위 이름 → CIDR 목록
 
     # sudo
     sudo_password: str = ""
 
+    # 동시성 (전체 서브넷 공통 예산)
+    max_parallel_discovery: int = 2  # 동시 실행 Phase 1 (nmap -sn) 수
+    max_parallel_hosts: int = 5      # 전체 서브넷 합산 동시 포트 발견(rustscan) 수
+    max_parallel_services: int = 5   # 전체 서브넷 합산 동시 서비스 탐지(nmap -sV -sC) 수
+
+    # AIMD 적응형 동시성: Phase 2 슬롯을 실패/타임아웃 시 축소, 정상 완료 시 최대 4배까지 확대
+    adaptive_concurrency: bool = True
+
+    # Phase 2 배치: rustscan 1회에 전달할 호스트 수 (-a host1,host2,...)
+    hosts_per_scan: int = 1
+
+    # Phase 2 포트 발견 엔진: rustscan (외부 바이너리) 또는 connect (내장 asyncio TCP connect)
+    port_engine: str = "rustscan"
+    connect_max_sockets: int = 4096  # connect 엔진 전역 동시 소켓 수 (모든 서브넷/배치 공유)
+
+    # 상위 포트 모드: 이전 스캔에서 자주 열린 N개 포트를 먼저 스캔/서비스 탐지, 전체 스윕은 낮은 우선순위 (0이면 비활성화)
+    top_ports: int = 0
+
+    # Phase 1 샤딩: 큰 서브넷을 /N 샤드로 나눠 nmap -sn 병렬 실행
+    discovery_shard_prefix: int = 20
+    discovery_shard_workers: int = 4
+    discovery_shard_retries: int = 1  # 실패 샤드만 재시도
+
+    # 스트리밍: Phase 1에서 발견한 호스트를 즉시 Phase 2로 전달
+    stream_hosts: bool = False
+
+    # 증분 재스캔: 이전 스캔 디렉토리 (알려진 호스트는 기존 오픈 포트만 재확인)
+    baseline_dir: Optional[Path] = None
+
+    # RTT 샘플 기반 서브넷별 rustscan 파라미터 튜닝 (False면 안전 모드 고정값)
+    adaptive_rtt: bool = True
+
+    # 전역 패킷 속도 예산 (pps): 모든 nmap/rustscan이 나눠 씀 (0이면 제한 없음)
+    max_rate: int = 30000
+
+    # 후처리 결과 집계 프로세스 수 (None이면 CPU 수, scan_*.nmap → summary.json/CSV)
+    summary_workers: Optional[int] = None
+
+    # Prometheus 텍스트 형식 메트릭 HTTP 포트 (None이면 metrics.json만 기록)
+    metrics_port: Optional[int] = None
+
+    # 서비스 탐지 캐시: (ip, port, 배너 지문)이 같으면 이전 nmap 결과 재사용 (None이면 비활성화)
+    service_cache_file: Optional[Path] = None
+    service_cache_ttl_hours: int = 72
+    service_cache_max_entries: int = 100_000
+
     def __post_init__(self):
         """초기화 후 기본값 설정"""
         # Path 타입 보장
         self.script_dir = Path(self.script_dir)
         self.scan_dir = Path(self.scan_dir)
         self.json_file = Path(self.json_file)
+        if self.baseline_dir is not None:
+            self.baseline_dir = Path(self.baseline_dir)
+        if self.service_cache_file is not None:
+            self.service_cache_file = Path(self.service_cache_file)
+
+    @cached_property
+    def exclusions(self) -> ExclusionIndex:
+        """exclude_ips 구간 인덱스 (Phase 1/2 필터링, nmap --excludefile)"""
+        return ExclusionIndex(self.exclude_ips)
+
+    def subnet_cidrs(self, subnet: str) -> list[str]:
+        """서브넷(단독 CIDR 또는 묶음 스캔 단위 이름)의 CIDR 목록"""
+        return self.scan_units.get(subnet) or [subnet]
 
     def validate(self) -> None:
         """설정 검증"""
@@ -33,3 +99,41 @@ class Config:
 
         if not self.subnets:
             raise ValueError("최소 하나 이상의 서브넷이 필요합니다")
+
+        try:
+            self.exclusions
+        except ValueError as e:
+            raise ValueError(f"잘못된 exclude 항목: {e}") from e
+
+        if min(self.max_parallel_discovery, self.max_parallel_hosts, self.max_parallel_services) < 1:
+            raise ValueError("동시 실행 수는 1 이상이어야 합니다")
+
+        if self.baseline_dir is not None and not self.baseline_dir.is_dir():
+            raise FileNotFoundError(f"베이스라인 스캔 디렉토리를 찾을 수 없음: {self.baseline_dir}")
+
+        if self.hosts_per_scan < 1:
+            raise ValueError("hosts_per_scan은 1 이상이어야 합니다")
+
+        if self.port_engine not in PORT_ENGINES:
+            raise ValueError(f"port_engine은 {', '.join(PORT_ENGINES)} 중 하나여야 합니다")
+
+        if self.connect_max_sockets < 1:
+            raise ValueError("connect_max_sockets는 1 이상이어야 합니다")
+
+        if not 0 <= self.top_ports <= 65535:
+            raise ValueError("top_ports는 0(비활성화)-65535 범위여야 합니다")
+
+        if not 8 <= self.discovery_shard_prefix <= 32 or self.discovery_shard_workers < 1:
+            raise ValueError("샤드 프리픽스는 8-32, 샤드 워커 수는 1 이상이어야 합니다")
+
+        if self.service_cache_ttl_hours < 1 or self.service_cache_max_entries < 1:
+            raise ValueError("서비스 캐시 TTL과 최대 항목 수는 1 이상이어야 합니다")
+
+        if self.summary_workers is not None and self.summary_workers < 1:
+            raise ValueError("summary_workers는 1 이상이어야 합니다")
+
+        if self.max_rate < 0:
+            raise ValueError("max_rate는 0(제한 없음) 이상이어야 합니다")
+
+        if self.metrics_port is not None and not 1 <= self.metrics_port <= 65535:
+            raise ValueError("metrics_port는 1-65535 범위여야 합니다")
@@ -0,0 +1,500 @@
+"""분산 스캔 모듈 (코디네이터/워커, HTTP + JSON)
+
+코디네이터는 targets.json 서브넷을 작업 단위(/unit_prefix)로 나누고, 워커가 작업을 임대(lease)해
+자신의 머신에서 Phase 1-2를 실행한 뒤 결과를 코디네이터로 보낸다.
+
+프로토콜 (POST, JSON 본문, X-Scan-Token 헤더로 공유 토큰 확인):
+    /lease      {"worker"}                         → {"unit": {"id", "subnet", "targets", "exclude"} | null, "done", "retry_after"}
+    /heartbeat  {"worker", "unit"}                 → {"ok"} (false면 임대 만료 → 워커가 작업 중단)
+    /complete   {"worker", "unit", "alive", "hosts", "scans"} → {"ok"}
+    /fail       {"worker", "unit", "error"}        → {"ok"} (스캔 실패: 임대 반납 후 재할당)
+    GET /status                                    → 대기/임대/완료/실패 작업 수
+
+- 임대 만료: lease_timeout 동안 heartbeat가 없으면 작업을 대기열 앞으로 되돌림 (max_attempts 초과 시 실패)
+- 워커는 로컬 저널에 서브넷 완료가 기록된 경우에만 /complete, 아니면 /fail로 반납 (실패 작업이 완료로 기록되지 않음)
+- 공유 토큰이 없으면 루프백 주소에만 바인드
+- 완료 작업은 코디네이터 스캔 디렉토리의 journal.jsonl에 기록되어 --resume으로 재개 가능
+- 묶음 스캔 단위(작은 CIDR 여러 개)는 /unit_prefix 크기로 다시 묶고, 임대에 CIDR 목록(targets)을 함께 보냄
+- 제외 대상: 임대마다 작업 단위와 겹치는 exclude 구간(CIDR)만 보내고, 워커는 이를 targets.json에 기록해
+  로컬 스캔과 똑같이 nmap --excludefile 및 Phase 2 필터링에 사용
+- 결과 병합: alive_hosts_<unit>.txt, scan_<host>.nmap, results.db
+"""
+import asyncio
+import ipaddress
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Optional
+
+from scanner.config import Config
+from scanner.journal import ScanJournal
+from scanner.logger import ColorLogger
+from scanner.scanner import Scanner
+from utils.exclusion import ExclusionIndex
+from utils.ip_ranges import pack_cidrs, unit_name
+from utils.results_store import RESULTS_DB_FILENAME, HostResult, PortResult, ResultsStore
+
+TOKEN_HEADER = "X-Scan-Token"
+MAX_BODY_BYTES = 256 * 1024 * 1024
+RETRY_AFTER_SECONDS = 5
+CONNECT_RETRIES = 6  # 워커: 코디네이터 연결 실패 허용 횟수 (RETRY_AFTER_SECONDS 간격)
+
+
+def split_work_units(
+    subnets: list[str], unit_prefix: int, scan_units: Optional[dict[str, list[str]]] = None
+) -> dict[str, list[str]]:
+    """
+    서브넷을 unit_prefix 크기 작업 단위로 분할 (작은 서브넷은 그대로, 묶음 단위는 unit_prefix 크기로 다시 묶음)
+
+    Returns:
+        작업 단위 이름 → CIDR 목록 (입력 순서 유지)
+
+    Examples:
+        >>> split_work_units(["10.0.0.0/23", "10.1.0.0/26"], 24)
+        {'10.0.0.0/24': ['10.0.0.0/24'], '10.0.1.0/24': ['10.0.1.0/24'], '10.1.0.0/26': ['10.1.0.0/26']}
+        >>> split_work_units(["10.2.0.1/32+2"], 31, {"10.2.0.1/32+2": ["10.2.0.1/32", "10.2.0.3/32", "10.2.0.5/32"]})
+        {'10.2.0.1/32+1': ['10.2.0.1/32', '10.2.0.3/32'], '10.2.0.5/32': ['10.2.0.5/32']}
+    """
+    scan_units = scan_units or {}
+    units: dict[str, list[str]] = {}
+    for subnet in subnets:
+        if subnet in scan_units:
+            for group in pack_cidrs(scan_units[subnet], 1 << (32 - unit_prefix)):
+                units[unit_name(group)] = group
+            continue
+        network = ipaddress.ip_network(subnet, strict=False)
+        if network.version == 4 and network.prefixlen < unit_prefix:
+            units.update((str(unit), [str(unit)]) for unit in network.subnets(new_prefix=unit_prefix))
+        else:
+            units[str(network)] = [str(network)]
+    return units
+
+
+def _is_loopback(host: str) -> bool:
+    """
+    루프백 바인드 주소 여부 (호스트 이름은 localhost만 인정)
+
+    Examples:
+        >>> [_is_loopback(host) for host in ("127.0.0.1", "::1", "localhost", "0.0.0.0", "10.0.0.1")]
+        [True, True, True, False, False]
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _unit_label(subnet: str) -> str:
+    """작업 단위 라벨 (파일명 안전, Scanner 서브넷 라벨과 동일 규칙)"""
+    return subnet.replace(".", "_").replace("/", "_")
+
+
+@dataclass
+class Lease:
+    """작업 임대 상태"""
+
+    worker: str
+    deadline: float
+
+
+class Coordinator:
+    """작업 단위 분배 및 결과 병합"""
+
+    def __init__(
+        self,
+        config: Config,
+        unit_prefix: int = 20,
+        lease_timeout: float = 300.0,
+        max_attempts: int = 3,
+        token: str = "",
+    ):
+        """
+        Args:
+            config: 스캐너 설정 (subnets, scan_dir 사용)
+            unit_prefix: 작업 단위 크기 (/N)
+            lease_timeout: heartbeat 없이 임대가 유지되는 시간 (초)
+            max_attempts: 작업당 최대 임대 횟수 (초과 시 실패 처리)
+            token: 공유 토큰 (빈 문자열이면 확인 안 함)
+        """
+        self.config = config
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.token = token
+        self.logger = ColorLogger
+
+        self.journal = ScanJournal(config.scan_dir)
+        self.results_store = ResultsStore(config.scan_dir / RESULTS_DB_FILENAME)
+
+        self.units = split_work_units(config.subnets, unit_prefix, config.scan_units)
+        units = list(self.units)
+        self.total = len(units)
+        self.done: set[str] = {unit for unit in units if unit in self.journal.subnets_done}
+        self.pending: deque[str] = deque(unit for unit in units if unit not in self.done)
+        self.leases: dict[str, Lease] = {}
+        self.attempts: dict[str, int] = {}
+        self.failed: set[str] = set()
+        self.finished = asyncio.Event()
+
+    async def serve(self, host: str, port: int) -> None:
+        """HTTP 서버 실행 (모든 작업 완료/실패 시 종료)
+
+        Raises:
+            ValueError: 공유 토큰 없이 루프백이 아닌 주소에 바인드하려는 경우
+        """
+        if not self.token and not _is_loopback(host):
+            raise ValueError(f"SCAN_TOKEN 없이 루프백이 아닌 주소({host})에 바인드할 수 없습니다")
+        self.logger.header("분산 스캔 코디네이터")
+        self.logger.info(
+            f"작업 단위 {self.total}개 (완료 {len(self.done)}개, 대기 {len(self.pending)}개), "
+            f"임대 타임아웃 {self.lease_timeout:.0f}s"
+        )
+        server = await asyncio.start_server(self._handle, host, port)
+        self.logger.info(f"워커 대기: http://{host}:{port}")
+        reaper = asyncio.create_task(self._reap_leases())
+        self._check_finished()
+        try:
+            await self.finished.wait()
+            # 폴링 중인 워커가 done 응답을 받을 수 있도록 잠시 유지
+            await asyncio.sleep(RETRY_AFTER_SECONDS * 2)
+        finally:
+            reaper.cancel()
+            server.close()
+            self.journal.close()
+            self.results_store.close()
+
+        self.logger.success(f"분산 스캔 완료: 작업 {len(self.done)}/{self.total}개")
+        if self.failed:
+            self.logger.warning(f"실패 작업 {len(self.failed)}개: {', '.join(sorted(self.failed))}")
+
+    def _check_finished(self) -> None:
+        """대기/임대 작업이 없으면 종료 이벤트 설정"""
+        if not self.pending and not self.leases:
+            self.finished.set()
+
+    async def _reap_leases(self) -> None:
+        """만료 임대 회수 (대기열 앞으로, 시도 초과 시 실패)"""
+        while True:
+            await asyncio.sleep(min(5.0, self.lease_timeout / 3))
+            now = time.monotonic()
+            for unit, lease in list(self.leases.items()):
+                if lease.deadline <= now:
+                    self._release(unit, f"임대 만료 (워커 {lease.worker})")
+            self._check_finished()
+
+    def _release(self, unit: str, reason: str) -> None:
+        """임대 회수 후 대기열 앞으로 되돌림 (시도 초과 시 실패)"""
+        del self.leases[unit]
+        if self.attempts[unit] >= self.max_attempts:
+            self.failed.add(unit)
+            self.logger.error(f"작업 실패 ({self.attempts[unit]}회 시도): {unit} - {reason}")
+        else:
+            self.pending.appendleft(unit)
+            self.logger.warning(f"{reason}, 재할당 대기: {unit}")
+
+    def lease(self, worker: str) -> dict:
+        """작업 임대"""
+        if not self.pending:
+            return {"unit": None, "done": self.finished.is_set(), "retry_after": RETRY_AFTER_SECONDS}
+
+        unit = self.pending.popleft()
+        self.attempts[unit] = self.attempts.get(unit, 0) + 1
+        self.leases[unit] = Lease(worker, time.monotonic() + self.lease_timeout)
+        self.logger.info(f"작업 임대: {unit} → {worker} ({len(self.pending)}개 대기)")
+        return {
+            "unit": {
+                "id": unit, "subnet": unit, "targets": self.units[unit], "exclude": self._unit_excludes(unit),
+            },
+            "lease_seconds": self.lease_timeout,
+        }
+
+    def _unit_excludes(self, unit: str) -> list[str]:
+        """작업 단위와 겹치는 제외 대상 (CIDR, 작업 범위 안으로 잘라서)"""
+        excludes = []
+        for cidr in self.units[unit]:
+            network = ipaddress.ip_network(cidr, strict=False)
+            excludes.extend(self.config.exclusions.overlapping_cidrs(
+                int(network.network_address), int(network.broadcast_address), network.version
+            ))
+        return excludes
+
+    def heartbeat(self, worker: str, unit: str) -> dict:
+        """임대 연장 (다른 워커에 재할당되었으면 ok=false)"""
+        lease = self.leases.get(unit)
+        if lease is None or lease.worker != worker:
+            return {"ok": False}
+        lease.deadline = time.monotonic() + self.lease_timeout
+        return {"ok": True}
+
+    def complete(self, worker: str, unit: str, payload: dict) -> dict:
+        """작업 결과 병합"""
+        lease = self.leases.get(unit)
+        if lease is None or lease.worker != worker:
+            # 만료 후 재할당된 작업의 늦은 결과는 버림
+            return {"ok": False}
+
+        members = ExclusionIndex(self.units[unit])  # 작업 단위 CIDR 구간 인덱스 (범위 밖 결과 무시)
+        alive = sorted(
+            {ip for ip in payload.get("alive", []) if ip in members},
+            key=lambda ip: ipaddress.ip_address(ip),
+        )
+        label = _unit_label(unit)
+        (self.config.scan_dir / f"alive_hosts_{label}.txt").write_text(
+            "\n".join(alive) + ("\n" if alive else "")
+        )
+
+        hosts = []
+        for host in payload.get("hosts", []):
+            if host["host"] not in members:
+                continue
+            ports = [PortResult(**port) for port in host.get("ports", [])]
+            hosts.append(HostResult(
+                host=host["host"], state=host.get("state", ""),
+                ports=ports, scripts=host.get("scripts", {}),
+            ))
+        self.results_store.ingest_hosts(hosts)
+
+        for host, text in payload.get("scans", {}).items():
+            if host in members:
+                (self.config.scan_dir / f"scan_{_unit_label(host)}.nmap").write_text(text)
+
+        del self.leases[unit]
+        self.done.add(unit)
+        self.journal.record_phase1(unit, len(alive))
+        self.journal.record_subnet(unit)
+        self.logger.success(
+            f"작업 완료: {unit} ← {worker} (활성 {len(alive)}개, 진행 {len(self.done)}/{self.total})"
+        )
+        self._check_finished()
+        return {"ok": True}
+
+    def fail(self, worker: str, unit: str, error: str) -> dict:
+        """워커 스캔 실패 보고 (임대 반납, 결과는 기록하지 않음)"""
+        lease = self.leases.get(unit)
+        if lease is None or lease.worker != worker:
+            return {"ok": False}
+        self._release(unit, f"워커 {worker} 스캔 실패: {error}")
+        self._check_finished()
+        return {"ok": True}
+
+    def status(self) -> dict:
+        """진행 상황"""
+        return {
+            "total": self.total,
+            "pending": len(self.pending),
+            "leased": {unit: lease.worker for unit, lease in self.leases.items()},
+            "done": len(self.done),
+            "failed": sorted(self.failed),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """HTTP/1.0 요청 1건 처리"""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0"))
+            if len(request_line) < 2 or length > MAX_BODY_BYTES:
+                status, body = 400, {"error": "bad request"}
+            elif self.token and headers.get(TOKEN_HEADER.lower()) != self.token:
+                status, body = 403, {"error": "invalid token"}
+            else:
+                data = json.loads(await reader.readexactly(length)) if length else {}
+                status, body = self._route(request_line[0], request_line[1], data)
+        except (ValueError, KeyError, TypeError) as e:
+            status, body = 400, {"error": str(e)}
+        except (OSError, asyncio.IncompleteReadError):
+            writer.close()
+            return
+
+        encoded = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.0 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(encoded)}\r\n\r\n".encode()
+            + encoded
+        )
+        try:
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method: str, path: str, data: dict) -> tuple[int, dict]:
+        """요청 경로별 처리"""
+        if method == "GET" and path == "/status":
+            return 200, self.status()
+        if method != "POST":
+            return 404, {"error": "not found"}
+        if path == "/lease":
+            return 200, self.lease(str(data["worker"]))
+        if path == "/heartbeat":
+            return 200, self.heartbeat(str(data["worker"]), str(data["unit"]))
+        if path == "/complete":
+            return 200, self.complete(str(data["worker"]), str(data["unit"]), data)
+        if path == "/fail":
+            return 200, self.fail(str(data["worker"]), str(data["unit"]), str(data.get("error", "")))
+        return 404, {"error": "not found"}
+
+
+class Worker:
+    """코디네이터에서 작업을 임대해 로컬에서 Phase 1-2 실행"""
+
+    def __init__(self, config: Config, coordinator_url: str, worker_id: str, token: str = ""):
+        """
+        Args:
+            config: 로컬 스캐너 설정 (동시성/속도 등은 워커 머신 기준, subnets는 작업마다 교체)
+            coordinator_url: 코디네이터 주소 (예: http://10.0.0.1:8765)
+            worker_id: 워커 식별자
+            token: 공유 토큰
+        """
+        self.config = config
+        self.url = coordinator_url.rstrip("/")
+        self.worker_id = worker_id
+        self.token = token
+        self.logger = ColorLogger
+
+    async def run(self) -> int:
+        """작업이 없을 때까지 임대 → 스캔 → 결과 전송 반복
+
+        Returns:
+            완료한 작업 수
+        """
+        completed = 0
+        failures = 0
+        while True:
+            try:
+                response = await self._post("/lease", {"worker": self.worker_id})
+                failures = 0
+            except (OSError, urllib.error.URLError) as e:
+                failures += 1
+                if failures > CONNECT_RETRIES:
+                    self.logger.warning(f"코디네이터 연결 불가, 워커 종료: {e}")
+                    return completed
+                await asyncio.sleep(RETRY_AFTER_SECONDS)
+                continue
+
+            unit = response.get("unit")
+            if unit is None:
+                if response.get("done"):
+                    self.logger.success(f"모든 작업 완료, 워커 종료 (처리 {completed}개)")
+                    return completed
+                await asyncio.sleep(response.get("retry_after", RETRY_AFTER_SECONDS))
+                continue
+
+            if await self._run_unit(unit, response.get("lease_seconds", 300)):
+                completed += 1
+
+    async def _run_unit(self, lease: dict, lease_seconds: float) -> bool:
+        """작업 단위 스캔 (heartbeat로 임대 유지, 임대를 잃으면 중단)
+
+        Args:
+            lease: 임대 응답의 작업 단위 (id, subnet, targets: CIDR 목록, exclude: 겹치는 제외 CIDR)
+            lease_seconds: 임대 시간 (초)
+        """
+        unit, subnet = lease["id"], lease["subnet"]
+        targets = lease.get("targets") or [subnet]
+        exclude = lease.get("exclude", [])
+        unit_dir = self.config.scan_dir / f"unit_{_unit_label(subnet)}"
+        unit_dir.mkdir(parents=True, exist_ok=True)
+        exclude_ips = self.config.exclude_ips + exclude
+        targets_file = unit_dir / "targets.json"
+        targets_file.write_text(json.dumps({"subnets": targets, "exclude": exclude_ips}))
+
+        config = replace(
+            self.config, scan_dir=unit_dir, json_file=targets_file, subnets=[subnet], exclude_ips=exclude_ips,
+            scan_units={subnet: targets} if len(targets) > 1 else {},
+        )
+        config.validate()
+        self.logger.info(f"작업 시작: {subnet}" + (f" (제외 {len(exclude)}개)" if exclude else ""))
+
+        scan = asyncio.create_task(Scanner(config).run())
+        heartbeat = asyncio.create_task(self._keep_lease(unit, lease_seconds, scan))
+        try:
+            await scan
+        except asyncio.CancelledError:
+            if heartbeat.done():
+                self.logger.warning(f"임대 상실, 작업 중단: {subnet}")
+                return False
+            raise
+        finally:
+            heartbeat.cancel()
+
+        # Scanner는 서브넷 오류를 로그만 남기고 삼키므로, 저널에 완료가 기록된 경우에만 결과 전송
+        if subnet not in ScanJournal(unit_dir, read_only=True).subnets_done:
+            self.logger.error(f"작업 실패, 임대 반납: {subnet}")
+            try:
+                await self._post("/fail", {"worker": self.worker_id, "unit": unit, "error": "subnet scan failed"})
+            except (OSError, urllib.error.URLError):
+                pass  # 반납하지 못하면 임대 만료 후 재할당된다
+            return False
+
+        payload = {"worker": self.worker_id, "unit": unit, **self._collect_results(unit_dir)}
+        try:
+            response = await self._post("/complete", payload)
+        except (OSError, urllib.error.URLError) as e:
+            # 임대가 만료되면 코디네이터가 다른 워커에 재할당한다
+            self.logger.error(f"결과 전송 실패: {subnet} ({e})")
+            return False
+        if not response.get("ok"):
+            self.logger.warning(f"코디네이터가 결과를 거부함 (임대 만료): {subnet}")
+            return False
+        return True
+
+    async def _keep_lease(self, unit: str, lease_seconds: float, scan: asyncio.Task) -> None:
+        """lease_seconds/3 간격 heartbeat (임대를 잃으면 스캔 취소)"""
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                response = await self._post("/heartbeat", {"worker": self.worker_id, "unit": unit})
+            except (OSError, urllib.error.URLError):
+                continue  # 일시적 장애: 다음 주기에 재시도 (만료되면 ok=false)
+            if not response.get("ok"):
+                scan.cancel()
+                return
+
+    @staticmethod
+    def _collect_results(unit_dir: Path) -> dict:
+        """작업 디렉토리의 활성 호스트, results.db, scan_*.nmap 수집"""
+        alive: list[str] = []
+        for alive_file in unit_dir.glob("alive_hosts_*.txt"):
+            alive.extend(line.strip() for line in alive_file.read_text().splitlines() if line.strip())
+
+        store = ResultsStore(unit_dir / RESULTS_DB_FILENAME)
+        try:
+            hosts = [asdict(host) for host in store.host_results()]
+        finally:
+            store.close()
+
+        scans = {}
+        for host in alive:
+            scan_file = unit_dir / f"scan_{_unit_label(host)}.nmap"
+            if scan_file.exists():
+                scans[host] = scan_file.read_text(errors="replace")
+        return {"alive": alive, "hosts": hosts, "scans": scans}
+
+    async def _post(self, path: str, data: dict) -> dict:
+        """JSON POST (블로킹 urllib를 스레드에서 실행)"""
+        request = urllib.request.Request(
+            self.url + path,
+            data=json.dumps(data).encode(),
+            headers={"Content-Type": "application/json", TOKEN_HEADER: self.token},
+            method="POST",
+        )
+
+        def send() -> dict:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return json.loads(response.read())
+
+        return await asyncio.to_thread(send)
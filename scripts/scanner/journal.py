@@ -0,0 +1,101 @@
+"""스캔 체크포인트 저널 모듈 (append-only JSONL)
+
+스캔 디렉토리의 journal.jsonl에 서브넷/호스트 단위 완료 이벤트를 기록한다.
+--resume으로 같은 디렉토리를 다시 지정하면 기록을 재생하여 완료된 작업을 건너뛴다.
+
+이벤트 형식 (한 줄에 하나):
+    {"event": "phase1_done", "subnet": "10.0.0.0/24", "alive": 12}
+    {"event": "ports_done", "host": "10.0.0.5", "ports": [22, 80]}
+    {"event": "host_done", "host": "10.0.0.5"}
+    {"event": "subnet_done", "subnet": "10.0.0.0/24"}
+"""
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+JOURNAL_FILENAME = "journal.jsonl"
+
+
+class ScanJournal:
+    """서브넷/호스트 완료 상태를 기록하는 append-only 저널"""
+
+    def __init__(self, scan_dir: Path, read_only: bool = False):
+        """
+        Args:
+            scan_dir: 스캔 디렉토리 (journal.jsonl 위치)
+            read_only: 기록을 재생만 하고 파일을 쓰기용으로 열지 않음 (이전 스캔 조회용, record_* 사용 불가)
+        """
+        self.path = Path(scan_dir) / JOURNAL_FILENAME
+        self.phase1_done: dict[str, int] = {}       # subnet → alive 수
+        self.subnets_done: set[str] = set()
+        self.host_ports: dict[str, list[int]] = {}  # 포트 발견 완료 호스트
+        self.hosts_done: set[str] = set()           # 서비스 탐지 완료 호스트
+
+        self._replay()
+        self._fh = None
+        if not read_only:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+
+    @property
+    def has_progress(self) -> bool:
+        """재개할 기록이 있는지 여부"""
+        return bool(self.phase1_done or self.host_ports or self.hosts_done)
+
+    def _replay(self) -> None:
+        """기존 저널 재생 (중단 시 잘린 마지막 줄은 무시)"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                event = record.get("event")
+                if event == "phase1_done":
+                    self.phase1_done[record["subnet"]] = record.get("alive", 0)
+                elif event == "subnet_done":
+                    self.subnets_done.add(record["subnet"])
+                elif event == "ports_done":
+                    self.host_ports[record["host"]] = record.get("ports", [])
+                elif event == "host_done":
+                    self.hosts_done.add(record["host"])
+
+    def _append(self, record: dict) -> None:
+        """레코드 1줄 기록 후 즉시 flush (Ctrl+C/크래시 대비)"""
+        record["ts"] = round(time.time(), 3)
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def record_phase1(self, subnet: str, alive: int) -> None:
+        """Phase 1 완료 기록"""
+        self.phase1_done[subnet] = alive
+        self._append({"event": "phase1_done", "subnet": subnet, "alive": alive})
+
+    def record_subnet(self, subnet: str) -> None:
+        """서브넷 Phase 1-2 전체 완료 기록"""
+        self.subnets_done.add(subnet)
+        self._append({"event": "subnet_done", "subnet": subnet})
+
+    def record_ports(self, host: str, ports: list[int]) -> None:
+        """호스트 포트 발견 완료 기록"""
+        self.host_ports[host] = ports
+        self._append({"event": "ports_done", "host": host, "ports": ports})
+
+    def record_host(self, host: str) -> None:
+        """호스트 서비스 탐지 완료 기록"""
+        self.hosts_done.add(host)
+        self._append({"event": "host_done", "host": host})
+
+    def known_ports(self, host: str) -> Optional[list[int]]:
+        """포트 발견이 끝난 호스트의 포트 목록 (미완료면 None)"""
+        return self.host_ports.get(host)
+
+    def close(self) -> None:
+        """저널 파일 닫기"""
+        if self._fh is not None and not self._fh.closed:
+            self._fh.close()
@@ -1,6 +1,30 @@
-"""색상 로깅 및 진행률 표시 모듈"""
+"""색상 로깅 및 진행률 표시 모듈
+
+진행률 막대는 ProgressRenderer 하나가 모아서 그린다.
+- ProgressTracker.update는 카운터만 갱신, 출력은 갱신 주기(TTY 0.5초)마다 1회
+- TTY: 서브넷/단계별 막대 여러 개를 화면 하단에 함께 표시 (로그 출력 시 지운 뒤 다시 그림)
+- 비 TTY (파일/파이프 리다이렉트): 막대 대신 30초마다 한 줄 진행률 로그
+
+모든 출력은 LogBackend가 백그라운드 스레드에서 기록한다.
+- 이벤트 루프는 레코드를 큐에 넣기만 함 (느린 파이프/원격 터미널에도 블로킹 없음)
+- 레벨 필터 (--log-level), JSON lines 파일 출력 (--log-file)
+"""
+import asyncio
+import atexit
+import json
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+PROGRESS_REFRESH_INTERVAL = 0.5  # TTY 막대 갱신 주기 (초)
+PROGRESS_LOG_INTERVAL = 30.0     # 비 TTY 진행률 로그 주기 (초)
+BAR_LENGTH = 40
+
+LOG_LEVELS = {"debug": 10, "info": 20, "success": 25, "warning": 30, "error": 40}
+LOG_BATCH_SIZE = 256  # 백그라운드 스레드가 flush 1회에 기록하는 최대 작업 수
 
 
 class ColorLogger:
@@ -24,39 +48,61 @@ class ColorLogger:
     ICON_WARNING = "[!]"
     ICON_DEBUG = "[*]"
 
+    @staticmethod
+    def configure(level: str = "debug", json_file: Optional[Path] = None, async_output: bool = True) -> None:
+        """로그 백엔드 설정 (LogBackend.configure 참고)"""
+        log_backend.configure(level, json_file, async_output)
+
+    @staticmethod
+    def flush() -> None:
+        """대기 중인 로그를 모두 출력 (print/프롬프트 직전 순서 보장용)"""
+        log_backend.flush()
+
+    @staticmethod
+    def _emit(
+        level: str, text: str, stream: Optional[TextIO] = None, message: Optional[str] = None
+    ) -> None:
+        """레코드를 로그 백엔드로 전달 (message가 있으면 JSON 파일에도 기록)"""
+        log_backend.emit(level, text, stream, message)
+
     @staticmethod
     def info(msg: str) -> None:
         """정보 메시지 출력 (파란색)"""
-        print(f"{ColorLogger.BLUE}{ColorLogger.ICON_INFO}{ColorLogger.RESET} {msg}")
+        ColorLogger._emit("info", f"{ColorLogger.BLUE}{ColorLogger.ICON_INFO}{ColorLogger.RESET} {msg}", message=msg)
 
     @staticmethod
     def success(msg: str) -> None:
         """성공 메시지 출력 (녹색)"""
-        print(f"{ColorLogger.GREEN}{ColorLogger.ICON_SUCCESS}{ColorLogger.RESET} {msg}")
+        ColorLogger._emit("success", f"{ColorLogger.GREEN}{ColorLogger.ICON_SUCCESS}{ColorLogger.RESET} {msg}", message=msg)
 
     @staticmethod
     def error(msg: str) -> None:
         """에러 메시지 출력 (빨간색)"""
-        print(f"{ColorLogger.RED}{ColorLogger.ICON_ERROR}{ColorLogger.RESET} {msg}", file=sys.stderr)
+        ColorLogger._emit(
+            "error", f"{ColorLogger.RED}{ColorLogger.ICON_ERROR}{ColorLogger.RESET} {msg}", sys.stderr, msg
+        )
 
     @staticmethod
     def warning(msg: str) -> None:
         """경고 메시지 출력 (노란색)"""
-        print(f"{ColorLogger.YELLOW}{ColorLogger.ICON_WARNING}{ColorLogger.RESET} {msg}")
+        ColorLogger._emit("warning", f"{ColorLogger.YELLOW}{ColorLogger.ICON_WARNING}{ColorLogger.RESET} {msg}", message=msg)
 
     @staticmethod
     def debug(msg: str) -> None:
         """디버그 메시지 출력 (회색)"""
-        print(f"{ColorLogger.WHITE}{ColorLogger.ICON_DEBUG}{ColorLogger.RESET} {msg}")
+        ColorLogger._emit("debug", f"{ColorLogger.WHITE}{ColorLogger.ICON_DEBUG}{ColorLogger.RESET} {msg}", message=msg)
 
     @staticmethod
     def phase(phase_name: str, msg: str) -> None:
         """단계별 메시지 출력 (마젠타 강조)"""
-        print(f"{ColorLogger.BOLD}{ColorLogger.MAGENTA}[{phase_name}]{ColorLogger.RESET} {msg}")
+        ColorLogger._emit(
+            "info", f"{ColorLogger.BOLD}{ColorLogger.MAGENTA}[{phase_name}]{ColorLogger.RESET} {msg}",
+            message=f"[{phase_name}] {msg}",
+        )
 
     @staticmethod
     def progress(current: int, total: int, prefix: str = "") -> None:
-        """진행률 표시 (한 줄로 업데이트)"""
+        """진행률 즉시 표시 (한 줄로 업데이트, 반복 갱신에는 ProgressTracker 사용)"""
         percent = (current / total) * 100 if total > 0 else 0
         bar_length = 40
         filled_length = int(bar_length * current // total) if total > 0 else 0
@@ -73,54 +119,361 @@ class ColorLogger:
     @staticmethod
     def separator(char: str = "=", length: int = 80) -> None:
         """구분선 출력"""
-        print(char * length)
+        ColorLogger._emit("info", char * length)
 
     @staticmethod
     def header(title: str) -> None:
         """헤더 출력 (굵은 파란색)"""
         ColorLogger.separator()
-        print(f"{ColorLogger.BOLD}{ColorLogger.CYAN}{title}{ColorLogger.RESET}")
+        ColorLogger._emit("info", f"{ColorLogger.BOLD}{ColorLogger.CYAN}{title}{ColorLogger.RESET}", message=title)
         ColorLogger.separator()
 
     @staticmethod
     def phase_header(phase_num: int, description: str, subnet: str = "") -> None:
         """Phase 헤더 출력 (단계 번호 + 설명 + 서브넷)"""
-        print()
-        print(f"{ColorLogger.BOLD}{ColorLogger.BLUE}{'=' * 80}{ColorLogger.RESET}")
         header_text = f"Phase {phase_num}: {description}"
         if subnet:
             header_text += f" ({subnet})"
-        print(f"{ColorLogger.BOLD}{ColorLogger.BLUE}{header_text}{ColorLogger.RESET}")
-        print(f"{ColorLogger.BOLD}{ColorLogger.BLUE}{'=' * 80}{ColorLogger.RESET}")
-        print()
+        rule = f"{ColorLogger.BOLD}{ColorLogger.BLUE}{'=' * 80}{ColorLogger.RESET}"
+        ColorLogger._emit(
+            "info",
+            f"\n{rule}\n{ColorLogger.BOLD}{ColorLogger.BLUE}{header_text}{ColorLogger.RESET}\n{rule}\n",
+            message=header_text,
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    """남은 시간 표시 (m:ss / h:mm:ss)"""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class ProgressRenderer:
+    """진행률 막대 렌더러 (모든 ProgressTracker와 ColorLogger 출력 공유)"""
+
+    def __init__(self, stream: Optional[TextIO] = None, interactive: Optional[bool] = None):
+        """
+        Args:
+            stream: 출력 스트림 (None이면 출력 시점의 sys.stdout)
+            interactive: TTY 모드 여부 (None이면 stream.isatty()로 판단)
+        """
+        self._stream = stream
+        self._interactive = interactive
+        self.trackers: list["ProgressTracker"] = []
+        self._drawn = 0           # 현재 화면에 그려진 막대 줄 수
+        self._last_render = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream or sys.stdout
+
+    @property
+    def interactive(self) -> bool:
+        """막대 표시 여부 (stdout이 TTY일 때)"""
+        if self._interactive is not None:
+            return self._interactive
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    @property
+    def interval(self) -> float:
+        """갱신 주기 (TTY: 막대 다시 그리기, 비 TTY: 진행률 로그)"""
+        return PROGRESS_REFRESH_INTERVAL if self.interactive else PROGRESS_LOG_INTERVAL
+
+    def register(self, tracker: "ProgressTracker") -> None:
+        """막대 추가"""
+        with self._lock:
+            self.trackers.append(tracker)
+
+    def unregister(self, tracker: "ProgressTracker") -> None:
+        """막대 제거 (최종 상태를 한 줄 로그로 남김)"""
+        with self._lock:
+            if tracker not in self.trackers:
+                return
+            self.trackers.remove(tracker)
+        if tracker.total > 0:
+            log_backend.submit(lambda line=tracker.render(self.interactive): self.write(line))
+        elif self.interactive:
+            log_backend.submit(self._redraw)
+
+    def refresh(self, force: bool = False) -> None:
+        """갱신 주기가 지났으면 막대 다시 그리기 (비 TTY는 진행률 로그)
+
+        Args:
+            force: 주기와 무관하게 즉시 출력
+        """
+        now = time.monotonic()
+        if not force and now - self._last_render < self.interval:
+            return
+        self._last_render = now
+        log_backend.submit(self._render)
+
+    def write(self, text: str, stream: Optional[TextIO] = None) -> None:
+        """로그 한 줄 출력 (그려진 막대를 지우고 출력한 뒤 다시 그림)
+
+        Args:
+            text: 출력할 문자열 (줄바꿈 제외)
+            stream: 출력 스트림 (None이면 stdout)
+        """
+        with self._lock:
+            clear = self._clear_sequence()
+            self._drawn = 0
+            if stream is None or stream is self.stream:
+                self.stream.write(f"{clear}{text}\n{self._bars()}")
+            else:
+                # 다른 스트림(stderr)과 순서를 맞추기 위해 stdout을 먼저 비움
+                self.stream.write(clear)
+                self.stream.flush()
+                stream.write(f"{text}\n")
+                stream.flush()
+                self.stream.write(self._bars())
+
+    async def run(self) -> None:
+        """갱신 주기마다 refresh (update가 없는 동안에도 경과 시간/ETA 갱신, 취소로 종료)"""
+        try:
+            while True:
+                await asyncio.sleep(PROGRESS_REFRESH_INTERVAL)
+                self.refresh()
+        finally:
+            log_backend.submit(self._clear)
+
+    def _render(self) -> None:
+        """막대 다시 그리기 (비 TTY는 진행률 로그 한 줄씩)"""
+        if self.interactive:
+            self._redraw()
+            return
+        with self._lock:
+            lines = [tracker.render(False) for tracker in self.trackers if tracker.total > 0]
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+
+    def _clear(self) -> None:
+        """그려진 막대 지우기"""
+        with self._lock:
+            self.stream.write(self._clear_sequence())
+            self._drawn = 0
+
+    def _clear_sequence(self) -> str:
+        """그려진 막대 줄을 지우는 ANSI 시퀀스 (커서를 막대 첫 줄로 이동 후 화면 끝까지 삭제)"""
+        return f"\033[{self._drawn}F\033[J" if self._drawn else ""
+
+    def _bars(self) -> str:
+        """TTY 막대 문자열 (그린 줄 수 기록)"""
+        if not self.interactive:
+            return ""
+        lines = [tracker.render(True) for tracker in self.trackers if tracker.total > 0]
+        self._drawn = len(lines)
+        return "".join(f"{line}\n" for line in lines)
+
+    def _redraw(self) -> None:
+        """막대 전체 다시 그리기"""
+        with self._lock:
+            clear = self._clear_sequence()
+            self._drawn = 0
+            self.stream.write(clear + self._bars())
+
+
+class LogBackend:
+    """로그 출력 백엔드 (콘솔/JSON 파일 기록을 백그라운드 스레드에서 수행)"""
+
+    def __init__(self):
+        self.level = LOG_LEVELS["debug"]
+        self.async_output = True
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._json_file: Optional[TextIO] = None
+
+    def configure(
+        self, level: str = "debug", json_file: Optional[Path] = None, async_output: bool = True
+    ) -> None:
+        """
+        Args:
+            level: 최소 출력 레벨 (debug, info, success, warning, error)
+            json_file: JSON lines 로그 파일 (None이면 기록 안 함, 이어쓰기)
+            async_output: 백그라운드 스레드 사용 여부 (False면 호출 스레드에서 즉시 출력)
+        """
+        if level not in LOG_LEVELS:
+            raise ValueError(f"알 수 없는 로그 레벨: {level} ({', '.join(LOG_LEVELS)})")
+        self.flush()
+        self.level = LOG_LEVELS[level]
+        self.async_output = async_output
+        if self._json_file is not None:
+            self._json_file.close()
+            self._json_file = None
+        if json_file is not None:
+            Path(json_file).parent.mkdir(parents=True, exist_ok=True)
+            self._json_file = open(json_file, "a", encoding="utf-8")
+
+    def emit(
+        self, level: str, text: str, stream: Optional[TextIO] = None, message: Optional[str] = None
+    ) -> None:
+        """
+        로그 레코드 기록 (레벨 미만은 버림)
+
+        Args:
+            level: 로그 레벨
+            text: 콘솔 출력 문자열 (ANSI 색상 포함)
+            stream: 콘솔 스트림 (None이면 stdout)
+            message: JSON 파일에 기록할 메시지 (None이면 콘솔 전용, 예: 구분선)
+        """
+        if LOG_LEVELS[level] < self.level:
+            return
+        record = {"time": time.time(), "level": level, "message": message}
+        self.submit(lambda: self._write(record, text, stream))
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """출력 작업 예약 (백그라운드 스레드 큐, 비동기 비활성화 시 즉시 실행)"""
+        if not self.async_output:
+            task()
+            self._flush_streams()
+            return
+        self._ensure_thread()
+        self._queue.put(task)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """큐에 쌓인 출력이 모두 기록될 때까지 대기"""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or thread is threading.current_thread():
+            return
+        done = threading.Event()
+
+        def mark_done() -> None:
+            self._flush_streams()
+            done.set()
+
+        self._queue.put(mark_done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """남은 출력 기록 후 스레드 종료 (프로세스 종료 시 atexit로 호출)"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout=5.0)
+        self._thread = None
+        if self._json_file is not None:
+            self._json_file.close()
+            self._json_file = None
+
+    def _ensure_thread(self) -> None:
+        """백그라운드 스레드 시작 (첫 출력 시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """큐의 작업을 묶음 단위로 실행하고 묶음마다 한 번 flush"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for task in batch:
+                if task is None:
+                    self._flush_streams()
+                    return
+                try:
+                    task()
+                except (OSError, ValueError):
+                    pass  # 닫힌 파이프/파일: 로그 때문에 스캔을 멈추지 않음
+            self._flush_streams()
+
+    def _write(self, record: dict, text: str, stream: Optional[TextIO]) -> None:
+        """레코드 1개 출력 (콘솔 + JSON 파일)"""
+        progress_renderer.write(text, stream)
+        if self._json_file is not None and record["message"] is not None:
+            self._json_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _flush_streams(self) -> None:
+        """stdout/stderr/JSON 파일 flush"""
+        for stream in (sys.stdout, sys.stderr, self._json_file):
+            if stream is None:
+                continue
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+progress_renderer = ProgressRenderer()
+log_backend = LogBackend()
+atexit.register(log_backend.close)
 
 
 class ProgressTracker:
-    """진행률 추적 클래스"""
+    """진행률 추적 클래스 (출력은 ProgressRenderer가 주기적으로 수행)"""
 
-    def __init__(self, total: int, prefix: str = "Progress"):
+    def __init__(self, total: int, prefix: str = "Progress", renderer: Optional[ProgressRenderer] = None):
+        """
+        Args:
+            total: 전체 작업 수 (스트리밍 모드에서는 진행 중 증가)
+            prefix: 막대 앞 레이블 (예: "rustscan+nmap 스캔 (10.0.0.0/24)")
+            renderer: 렌더러 (기본값: 공유 progress_renderer)
+        """
         self.total = total
         self.current = 0
         self.prefix = prefix
+        self.started_at = time.monotonic()
+        self.renderer = renderer or progress_renderer
+        self.renderer.register(self)
 
     def update(self, increment: int = 1) -> None:
-        """진행 상태 업데이트"""
+        """진행 상태 업데이트 (출력은 갱신 주기마다)"""
         self.current += increment
-        ColorLogger.progress(self.current, self.total, self.prefix)
+        self.renderer.refresh()
 
     def reset(self) -> None:
         """진행 상태 초기화"""
         self.current = 0
+        self.started_at = time.monotonic()
 
     def complete(self) -> None:
-        """진행 완료 처리"""
+        """진행 완료 처리 (최종 상태 출력 후 막대 제거)"""
         self.current = self.total
-        ColorLogger.progress(self.current, self.total, self.prefix)
+        self.close()
+
+    def close(self) -> None:
+        """막대 제거 (최종 상태를 한 줄 로그로 남김)"""
+        self.renderer.unregister(self)
 
     def increment(self, step: int = 1) -> None:
         """진행 상태 증가 (update의 별칭)"""
         self.update(step)
 
+    def rate(self) -> float:
+        """관측 처리량 (개/초)"""
+        elapsed = time.monotonic() - self.started_at
+        return self.current / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        """남은 예상 시간 (초, 처리량 관측 전이면 None)"""
+        rate = self.rate()
+        if rate <= 0:
+            return None
+        return max(0, self.total - self.current) / rate
+
+    def render(self, bar: bool = True) -> str:
+        """진행률 한 줄 (bar=False면 막대 없는 로그 형식)"""
+        percent = (self.current / self.total) * 100 if self.total > 0 else 0
+        eta = self.eta()
+        stats = (
+            f"{self.current}/{self.total} ({percent:.1f}%) {self.rate():.1f}/s "
+            f"ETA {_format_duration(eta) if eta is not None else '--:--'}"
+        )
+        if not bar:
+            return f"{self.prefix}: {stats}"
+        filled = int(BAR_LENGTH * min(self.current, self.total) // self.total) if self.total > 0 else 0
+        return f"{self.prefix} [{'█' * filled}{'░' * (BAR_LENGTH - filled)}] {stats}"
+
     def should_log(self) -> bool:
         """로깅 필요 여부 판단 (10% 단위)"""
         if self.total == 0:
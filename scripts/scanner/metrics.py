@@ -0,0 +1,251 @@
+"""스캔 계측 모듈
+
+서브넷/호스트별 단계 소요 시간(Phase 1, nmap -sn 샤드, rustscan, nmap -sV -sC 등),
+단계별 동시 실행 프로세스 수, 큐 깊이, 재시도 횟수를 수집한다.
+- 스캔 종료 시 스캔 디렉토리의 metrics.json으로 내보냄
+- --metrics-port 지정 시 Prometheus 텍스트 형식(GET /metrics)을 HTTP로 제공
+"""
+import asyncio
+import json
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+METRICS_FILENAME = "metrics.json"
+PROMETHEUS_PREFIX = "nmap_scan"
+
+
+@dataclass
+class StageTiming:
+    """단계 1회 실행 기록"""
+
+    stage: str
+    subnet: str
+    hosts: list[str] = field(default_factory=list)
+    started_at: float = 0.0
+    seconds: float = 0.0
+    ok: bool = True
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    rank = max(1, math.ceil(percentile / 100 * len(values)))
+    return values[rank - 1]
+
+
+def _label_value(value: str) -> str:
+    """Prometheus 레이블 값 이스케이프"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ScanMetrics:
+    """스캔 전체 계측 수집기 (asyncio 단일 스레드에서 사용)"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.timings: list[StageTiming] = []
+        self.counters: dict[str, int] = defaultdict(int)
+        self.gauges: dict[str, float] = {}
+        self.active: dict[str, int] = defaultdict(int)       # 단계별 실행 중 수
+        self.peak_active: dict[str, int] = defaultdict(int)
+        self.queue_depth: dict[str, int] = {}
+        self.peak_queue_depth: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def timer(self, stage: str, subnet: str = "", hosts: Iterable[str] = ()) -> Iterator[StageTiming]:
+        """
+        단계 실행 시간 측정 (예외 발생 시 ok=False)
+
+        Args:
+            stage: 단계 이름 (예: phase1, nmap_sn, rustscan, nmap_service)
+            subnet: 서브넷 (CIDR)
+            hosts: 대상 호스트 (배치면 소요 시간을 각 호스트에 귀속)
+
+        Yields:
+            StageTiming (호출 측에서 ok를 실패로 바꿀 수 있음)
+        """
+        timing = StageTiming(stage=stage, subnet=subnet, hosts=list(hosts), started_at=time.time())
+        self.active[stage] += 1
+        self.peak_active[stage] = max(self.peak_active[stage], self.active[stage])
+        start = time.monotonic()
+        try:
+            yield timing
+        except BaseException:
+            timing.ok = False
+            raise
+        finally:
+            timing.seconds = time.monotonic() - start
+            self.active[stage] -= 1
+            self.timings.append(timing)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """카운터 증가 (재시도, 발견 포트 수 등)"""
+        self.counters[name] += amount
+
+    def gauge(self, name: str, value: float) -> None:
+        """게이지 기록 (예: AIMD 슬롯 한도)"""
+        self.gauges[name] = value
+
+    def observe_queue(self, name: str, depth: int) -> None:
+        """큐 깊이 기록 (현재값 + 최대값)"""
+        self.queue_depth[name] = depth
+        self.peak_queue_depth[name] = max(self.peak_queue_depth[name], depth)
+
+    def stage_summary(self) -> dict[str, dict]:
+        """단계별 실행 수/실패 수/소요 시간 통계"""
+        by_stage: dict[str, list[StageTiming]] = defaultdict(list)
+        for timing in self.timings:
+            by_stage[timing.stage].append(timing)
+
+        summary = {}
+        for stage, timings in sorted(by_stage.items()):
+            seconds = sorted(timing.seconds for timing in timings)
+            summary[stage] = {
+                "runs": len(timings),
+                "failed": sum(1 for timing in timings if not timing.ok),
+                "total_seconds": round(sum(seconds), 3),
+                "avg_seconds": round(sum(seconds) / len(seconds), 3),
+                "p50_seconds": round(_percentile(seconds, 50), 3),
+                "p90_seconds": round(_percentile(seconds, 90), 3),
+                "max_seconds": round(seconds[-1], 3),
+                "peak_active": self.peak_active[stage],
+            }
+        return summary
+
+    def subnet_summary(self) -> dict[str, dict[str, float]]:
+        """서브넷별 단계 소요 시간 합계"""
+        summary: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for timing in self.timings:
+            if timing.subnet:
+                summary[timing.subnet][timing.stage] += timing.seconds
+        return {
+            subnet: {stage: round(seconds, 3) for stage, seconds in stages.items()}
+            for subnet, stages in summary.items()
+        }
+
+    def host_summary(self) -> dict[str, dict[str, float]]:
+        """호스트별 단계 소요 시간 (배치 실행 시간은 배치의 각 호스트에 귀속)"""
+        summary: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for timing in self.timings:
+            for host in timing.hosts:
+                summary[host][timing.stage] += timing.seconds
+        return {
+            host: {stage: round(seconds, 3) for stage, seconds in stages.items()}
+            for host, stages in summary.items()
+        }
+
+    def to_dict(self) -> dict:
+        """JSON 내보내기용 전체 계측"""
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "stages": self.stage_summary(),
+            "subnets": self.subnet_summary(),
+            "hosts": self.host_summary(),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "queues": {
+                name: {"depth": depth, "peak": self.peak_queue_depth[name]}
+                for name, depth in self.queue_depth.items()
+            },
+            "timings": [asdict(timing) for timing in self.timings],
+        }
+
+    def write_json(self, path: Path) -> None:
+        """metrics.json 기록"""
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2))
+
+    def prometheus_text(self) -> str:
+        """Prometheus 텍스트 형식 (호스트별 값은 카디널리티 문제로 제외)"""
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_elapsed_seconds Seconds since the scan started.",
+            f"# TYPE {p}_elapsed_seconds gauge",
+            f"{p}_elapsed_seconds {time.time() - self.started_at:.3f}",
+        ]
+
+        stages = self.stage_summary()
+        lines += [
+            f"# HELP {p}_stage_runs_total Completed stage runs by result.",
+            f"# TYPE {p}_stage_runs_total counter",
+        ]
+        for stage, summary in stages.items():
+            lines.append(f'{p}_stage_runs_total{{stage="{stage}",result="ok"}} {summary["runs"] - summary["failed"]}')
+            lines.append(f'{p}_stage_runs_total{{stage="{stage}",result="failed"}} {summary["failed"]}')
+        lines += [
+            f"# HELP {p}_stage_seconds_total Total seconds spent in each stage.",
+            f"# TYPE {p}_stage_seconds_total counter",
+        ]
+        lines += [
+            f'{p}_stage_seconds_total{{stage="{stage}"}} {summary["total_seconds"]}'
+            for stage, summary in stages.items()
+        ]
+        lines += [
+            f"# HELP {p}_stage_active Stage runs (processes) currently in flight.",
+            f"# TYPE {p}_stage_active gauge",
+        ]
+        lines += [f'{p}_stage_active{{stage="{stage}"}} {count}' for stage, count in sorted(self.active.items())]
+        lines += [
+            f"# HELP {p}_subnet_stage_seconds Seconds spent per subnet and stage.",
+            f"# TYPE {p}_subnet_stage_seconds gauge",
+        ]
+        for subnet, subnet_stages in self.subnet_summary().items():
+            lines += [
+                f'{p}_subnet_stage_seconds{{subnet="{_label_value(subnet)}",stage="{stage}"}} {seconds}'
+                for stage, seconds in subnet_stages.items()
+            ]
+        lines += [
+            f"# HELP {p}_queue_depth Current queue depth.",
+            f"# TYPE {p}_queue_depth gauge",
+        ]
+        lines += [f'{p}_queue_depth{{queue="{name}"}} {depth}' for name, depth in sorted(self.queue_depth.items())]
+        lines += [
+            f"# HELP {p}_events_total Scan event counters (retries, ports found, ...).",
+            f"# TYPE {p}_events_total counter",
+        ]
+        lines += [f'{p}_events_total{{event="{name}"}} {value}' for name, value in sorted(self.counters.items())]
+        lines += [
+            f"# HELP {p}_gauge Point-in-time scanner values (slot limits, ...).",
+            f"# TYPE {p}_gauge gauge",
+        ]
+        lines += [f'{p}_gauge{{name="{name}"}} {value}' for name, value in sorted(self.gauges.items())]
+        return "\n".join(lines) + "\n"
+
+
+async def serve_prometheus(metrics: ScanMetrics, port: int, host: str = "127.0.0.1") -> asyncio.AbstractServer:
+    """
+    Prometheus 스크레이프용 HTTP 서버 시작 (GET /metrics)
+
+    Args:
+        metrics: 계측 수집기
+        port: 수신 포트
+        host: 수신 주소 (기본값: localhost)
+
+    Returns:
+        asyncio 서버 (호출 측에서 close)
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", metrics.prometheus_text().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.0 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,75 @@
+"""전역 패킷 속도(pps) 예산 모듈
+
+모든 서브넷의 nmap/rustscan 프로세스가 하나의 pps 예산(--max-rate)을 나눠 쓴다.
+- 작업 시작 시 공정 몫(예산 / (실행 중 + 대기 중 작업 수))까지 예약하고, 종료 시 반환
+- 실행 중인 프로세스의 속도는 바꿀 수 없으므로 재분배는 다음에 시작하는 작업의 몫에 반영
+- 남은 예산이 몫보다 적으면 다른 작업이 끝날 때까지 대기
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+MIN_JOB_RATE = 100  # 작업당 최소 할당 (pps)
+
+
+class RateGovernor:
+    """전역 pps 예산 할당기 (max_rate=0이면 무제한)"""
+
+    def __init__(self, max_rate: int, min_rate: int = MIN_JOB_RATE):
+        """
+        Args:
+            max_rate: 전체 동시 작업 합산 pps 상한 (0이면 제한 없음)
+            min_rate: 작업당 최소 할당 pps
+        """
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate) if max_rate else min_rate
+        self.available = max_rate
+        self.active = 0
+        self._waiting = 0
+        self._released = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """예산 제한 사용 여부"""
+        return self.max_rate > 0
+
+    def _fair_share(self) -> int:
+        """현재 작업 수 기준 공정 몫"""
+        return max(self.min_rate, self.max_rate // max(1, self.active + self._waiting))
+
+    @asynccontextmanager
+    async def lease(self, requested: int) -> AsyncIterator[int]:
+        """
+        pps 예산 예약 (블록 종료 시 반환)
+
+        Args:
+            requested: 작업이 원하는 pps
+
+        Yields:
+            할당된 pps (requested 이하, 제한이 없으면 requested 그대로)
+        """
+        if not self.enabled:
+            yield requested
+            return
+
+        requested = max(1, min(requested, self.max_rate))
+        self._waiting += 1
+        try:
+            await asyncio.sleep(0)  # 동시에 시작한 작업이 모두 대기열에 등록된 뒤 몫 계산
+            while True:
+                grant = min(requested, self._fair_share())
+                if grant <= self.available:
+                    break
+                self._released.clear()
+                await self._released.wait()
+        finally:
+            self._waiting -= 1
+
+        self.available -= grant
+        self.active += 1
+        try:
+            yield grant
+        finally:
+            self.available += grant
+            self.active -= 1
+            self._released.set()
@@ -1,14 +1,28 @@
 """Scanner 메인 오케스트레이터"""
 import asyncio
+import ipaddress
 import time
 from pathlib import Path
-from typing import List, Set
+from typing import List, Optional, Set
 
+from scanner.baseline import Baseline
+from scanner.concurrency import GROWTH_FACTOR, AdaptiveLimiter
 from scanner.config import Config
-from scanner.logger import ColorLogger
+from scanner.journal import ScanJournal
+from scanner.logger import ColorLogger, progress_renderer
+from scanner.metrics import METRICS_FILENAME, ScanMetrics, serve_prometheus
+from scanner.rate_governor import RateGovernor
+from scanner.summary import SUMMARY_JSON, aggregate_scan, write_summary
+from scanner.top_ports import TopPorts, learn_top_ports
 from phases.phase1 import HostDiscovery
 from phases.phase2 import PortScanner
+from utils.connect_scan import ConnectScanner
+from utils.results_store import RESULTS_DB_FILENAME, ResultsStore
+from utils.service_cache import ServiceCache
+from utils.rtt_optimizer import RustscanParams, tune_rustscan_params
 
+STREAM_PROFILE_HOSTS = 10   # 스트리밍: RTT 튜닝에 쓸 첫 발견 호스트 수
+STREAM_PROFILE_WAIT = 2.0   # 스트리밍: 다음 발견 호스트를 기다리는 최대 시간 (초)
 
 class ScanStatistics:
     """스캔 통계 추적"""
@@ -56,62 +70,380 @@ class Scanner:
         self.logger = ColorLogger
         self.stats = ScanStatistics()
         self.stats.total_subnets = len(config.subnets)
+        self.journal = ScanJournal(config.scan_dir)
+        self.results_store = ResultsStore(config.scan_dir / RESULTS_DB_FILENAME)
+        self.baseline = Baseline(config.baseline_dir) if config.baseline_dir else None
+        self.rate_governor = RateGovernor(config.max_rate)
+        self.metrics = ScanMetrics()
+        self.top_ports: Optional[TopPorts] = None
+        self.service_cache = (
+            ServiceCache(
+                config.service_cache_file,
+                ttl_seconds=config.service_cache_ttl_hours * 3600,
+                max_entries=config.service_cache_max_entries,
+            )
+            if config.service_cache_file
+            else None
+        )
 
     async def run(self) -> None:
-        """스캔 실행 (서브넷별 순차, Phase별 순차)"""
+        """스캔 실행 (서브넷 파이프라인)
+
+        서브넷 N의 Phase 2가 진행되는 동안 서브넷 N+1의 Phase 1을 실행한다.
+        - Phase 1: max_parallel_discovery개까지 동시 실행 (FIFO 순서 유지)
+        - Phase 2: 모든 서브넷이 포트 발견(max_parallel_hosts)/서비스 탐지
+          (max_parallel_services) 슬롯을 공유
+        """
         self.logger.header("대규모 스캔 시작")
         self.logger.info(f"대상: {len(self.config.subnets)}개 서브넷")
+        if self.config.exclusions:
+            self.logger.info(
+                f"제외: {len(self.config.exclusions)}개 구간 ({self.config.exclusions.address_count:,}개 주소, "
+                f"nmap --excludefile로 전달)"
+            )
         self.logger.info(f"스캔 디렉토리: {self.config.scan_dir}")
+        if self.journal.has_progress:
+            self.logger.info(
+                f"저널에서 재개: 서브넷 {len(self.journal.subnets_done)}개, "
+                f"호스트 {len(self.journal.hosts_done)}개 완료됨"
+            )
+        if self.baseline is not None:
+            self.logger.info(
+                f"증분 재스캔 베이스라인: {self.baseline.scan_dir} "
+                f"(활성 {len(self.baseline.alive_hosts)}개, 포트 기록 {len(self.baseline.host_ports)}개 호스트)"
+            )
+        self.logger.info(
+            f"파이프라인: Phase 1 동시 {self.config.max_parallel_discovery}개, "
+            f"Phase 2 전역 슬롯 {self.config.port_engine} {self.config.max_parallel_hosts}개 / "
+            f"nmap {self.config.max_parallel_services}개"
+            + (f" (AIMD 적응형, 최대 {GROWTH_FACTOR}배)" if self.config.adaptive_concurrency else "")
+        )
+        if self.config.top_ports:
+            # 상위 포트 모드: 이전 스캔 results.db에서 자주 열린 포트 학습 (현재 스캔 제외)
+            self.top_ports = learn_top_ports(
+                self.config.script_dir / "scans", self.config.top_ports, exclude=self.config.scan_dir
+            )
+            self.logger.info(
+                f"상위 포트 모드: 1차 {len(self.top_ports.ports)}개 포트 "
+                f"(이전 스캔 {self.top_ports.scans}개에서 학습 {self.top_ports.learned}개, "
+                f"나머지 내장 목록) → 전체 스윕은 낮은 우선순위"
+            )
+        if self.rate_governor.enabled:
+            self.logger.info(f"전역 패킷 속도 예산: {self.config.max_rate} pps (모든 nmap/rustscan 공유)")
 
-        # 서브넷별 루프
-        for i, subnet in enumerate(self.config.subnets, start=1):
-            try:
-                await self._run_subnet(i, subnet)
-                self.stats.completed_subnets += 1
-            except KeyboardInterrupt:
-                self.logger.warning("사용자 중단...")
-                raise
-            except Exception as e:
-                self.logger.error(f"서브넷 {subnet} 처리 실패: {e}")
-                # 다음 서브넷 계속 진행
-                continue
-
-        # 요약 출력
+        # 전역 동시성 예산 (모든 서브넷 공유)
+        self._discovery_slots = asyncio.Semaphore(self.config.max_parallel_discovery)
+        self._host_slots = self._new_slots(self.config.port_engine, self.config.max_parallel_hosts)
+        self._connect_scanner = None
+        if self.config.port_engine == "connect":
+            self._connect_scanner = ConnectScanner(self.config.connect_max_sockets)
+            self.logger.info(f"포트 발견: 내장 connect 엔진 (전역 동시 소켓 {self.config.connect_max_sockets}개)")
+        self._service_slots = self._new_slots("nmap", self.config.max_parallel_services)
+
+        metrics_server = None
+        if self.config.metrics_port is not None:
+            metrics_server = await serve_prometheus(self.metrics, self.config.metrics_port)
+            self.logger.info(f"Prometheus 메트릭: http://127.0.0.1:{self.config.metrics_port}/metrics")
+
+        # 진행률 막대 주기 갱신 (update가 없는 동안에도 ETA 갱신)
+        renderer = asyncio.create_task(progress_renderer.run())
+        tasks = [
+            asyncio.create_task(self._run_subnet_guarded(i, subnet))
+            for i, subnet in enumerate(self.config.subnets, start=1)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.logger.warning("사용자 중단...")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.logger.info(f"진행 상황 저장됨: --resume {self.config.scan_dir}")
+            raise
+        finally:
+            renderer.cancel()
+            await asyncio.gather(renderer, return_exceptions=True)
+            self.journal.close()
+            self.results_store.close()
+            if metrics_server is not None:
+                metrics_server.close()
+            self._write_metrics()
+            for slots in (self._host_slots, self._service_slots):
+                if slots.adaptive:
+                    self.logger.info(
+                        f"적응형 동시성: {slots.name} 최종 한도 {slots.current_limit}개 "
+                        f"(성공 {slots.successes}, 실패 {slots.failures})"
+                    )
+            if self._connect_scanner is not None:
+                stats = self._connect_scanner.stats
+                self.logger.info(
+                    f"connect 엔진: 시도 {stats.attempts}개, 오픈 {stats.open}개, 닫힘 {stats.closed}개, "
+                    f"필터링 {stats.filtered}개, 로컬 오류 {stats.errors}개"
+                )
+            if self.service_cache is not None:
+                self.service_cache.close()
+                self.logger.info(
+                    f"서비스 캐시: 적중 {self.service_cache.hits}개, 미스 {self.service_cache.misses}개"
+                )
+
+        await self._summarize()
+
+        # 요약 출력 (대기 중인 로그 뒤에)
+        self.logger.flush()
         print(self.stats.summary())
 
+    async def _summarize(self) -> None:
+        """후처리: 호스트별 nmap 출력을 프로세스 풀에서 집계해 통계 갱신 + summary.json/CSV 기록"""
+        labels = {self._get_subnet_label(subnet): subnet for subnet in self.config.subnets}
+
+        def run():
+            summary = aggregate_scan(self.config.scan_dir, labels, self.config.summary_workers)
+            write_summary(summary, self.config.scan_dir)
+            return summary
+
+        try:
+            summary = await asyncio.to_thread(run)
+        except Exception as e:
+            self.logger.warning(f"결과 집계 실패: {e}")
+            return
+
+        self.stats.total_ports_discovered = summary.open_ports
+        self.stats.total_services_detected = summary.services
+        self.stats.total_vulnerabilities_found = summary.vulnerabilities
+        self.logger.info(
+            f"결과 집계: 호스트 출력 {summary.files}개 ({summary.workers} 프로세스, {summary.elapsed:.1f}s) "
+            f"→ {self.config.scan_dir / SUMMARY_JSON}, summary_*.csv"
+        )
+
+    async def _run_subnet_guarded(self, index: int, subnet: str) -> None:
+        """서브넷 실행 (실패 시 로그 후 다음 서브넷 계속 진행)"""
+        if subnet in self.journal.subnets_done:
+            self.logger.info(f"[{index}/{len(self.config.subnets)}] 서브넷 완료됨 (저널), 스킵: {subnet}")
+            self.stats.completed_subnets += 1
+            return
+
+        try:
+            await self._run_subnet(index, subnet)
+            self.journal.record_subnet(subnet)
+            self.stats.completed_subnets += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"서브넷 {subnet} 처리 실패: {e}")
+
     async def _run_subnet(self, index: int, subnet: str) -> None:
         """서브넷별 Phase 1-2 실행"""
+        phase1_done = subnet in self.journal.phase1_done
+        if self.config.stream_hosts and not phase1_done:
+            await self._run_subnet_streaming(index, subnet)
+            return
+
         subnet_label = self._get_subnet_label(subnet)
+        phase1 = HostDiscovery(
+            self.config, subnet, subnet_label, self.rate_governor, self.metrics
+        )
 
-        self.logger.separator()
-        self.logger.info(f"[{index}/{len(self.config.subnets)}] 서브넷 처리: {subnet}")
+        if phase1_done:
+            # 저널 재개: Phase 1 결과 파일 재사용
+            alive_hosts = self._load_alive_hosts(subnet_label)
+            self.logger.info(
+                f"[{index}/{len(self.config.subnets)}] Phase 1 완료됨 (저널), "
+                f"{len(alive_hosts)}개 호스트 재사용: {subnet}"
+            )
+        else:
+            # Phase 1: HostDiscovery (discovery 슬롯 획득 후 실행)
+            async with self._discovery_slots:
+                self.logger.separator()
+                self.logger.info(f"[{index}/{len(self.config.subnets)}] 서브넷 처리: {subnet}")
 
-        # Phase 1: HostDiscovery
-        phase1 = HostDiscovery(self.config, subnet, subnet_label)
+                try:
+                    with self.metrics.timer("phase1", subnet):
+                        alive_hosts = await phase1.health_check_hybrid()
+                except Exception as e:
+                    self.logger.error(f"Phase 1 실패: {e}")
+                    raise
 
-        try:
-            alive_hosts = await phase1.health_check_hybrid()
+            self._record_phase1(phase1, alive_hosts)
+
+        if not alive_hosts:
+            self.logger.warning(f"서브넷 {subnet} - 활성 호스트 없음, 스킵")
+            return
 
-            if not alive_hosts:
-                self.logger.warning(f"서브넷 {subnet} - 활성 호스트 없음, 스킵")
-                return
+        self.stats.total_hosts_discovered += len(alive_hosts)
+        self.logger.success(f"Phase 1 완료: {len(alive_hosts)}개 호스트 발견")
 
-            self.stats.total_hosts_discovered += len(alive_hosts)
-            self.logger.success(f"Phase 1 완료: {len(alive_hosts)}개 호스트 발견")
+        params = await self._tune_params(phase1, alive_hosts)
 
+        # Phase 2: PortScanner (rustscan → nmap), 전역 슬롯 공유
+        phase2 = self._new_port_scanner()
+
+        try:
+            await phase2.scan(subnet, subnet_label, params=params)
         except Exception as e:
-            self.logger.error(f"Phase 1 실패: {e}")
+            self.logger.error(f"Phase 2 실패: {e}")
             raise
 
-        # Phase 2: PortScanner (rustscan + nmap)
-        phase2 = PortScanner(self.config, self.config.scan_dir)
+    async def _tune_params(
+        self, phase1: HostDiscovery, alive_hosts: Set[str]
+    ) -> Optional[RustscanParams]:
+        """RTT 샘플로 서브넷별 rustscan 파라미터 계산 (비활성화 시 None → 안전 모드)"""
+        if not self.config.adaptive_rtt:
+            return None
+
+        with self.metrics.timer("rtt_profile", phase1.subnet):
+            await phase1.profile_rtt(alive_hosts)
+        if not phase1.rtt_samples:
+            return None
+        return tune_rustscan_params(phase1.rtt_samples)
+
+    async def _run_subnet_streaming(self, index: int, subnet: str) -> None:
+        """서브넷별 Phase 1-2 스트리밍 실행 (Phase 1 발견 즉시 Phase 2 스캔)"""
+        subnet_label = self._get_subnet_label(subnet)
+        host_queue: asyncio.Queue = asyncio.Queue()
+
+        phase1 = HostDiscovery(
+            self.config, subnet, subnet_label, self.rate_governor, self.metrics
+        )
+        consumer = asyncio.create_task(self._stream_phase2(phase1, host_queue))
+
+        try:
+            async with self._discovery_slots:
+                self.logger.separator()
+                self.logger.info(
+                    f"[{index}/{len(self.config.subnets)}] 서브넷 처리 (스트리밍): {subnet}"
+                )
+                with self.metrics.timer("phase1", subnet):
+                    alive_hosts = await phase1.health_check_hybrid(host_queue=host_queue)
+        except BaseException:
+            consumer.cancel()
+            raise
+        finally:
+            # Phase 1 종료 sentinel
+            host_queue.put_nowait(None)
+
+        self._record_phase1(phase1, alive_hosts)
+
+        self.stats.total_hosts_discovered += len(alive_hosts)
+        self.logger.success(f"Phase 1 완료: {len(alive_hosts)}개 호스트 발견")
 
         try:
-            await phase2.scan(subnet, subnet_label)
+            await consumer
         except Exception as e:
             self.logger.error(f"Phase 2 실패: {e}")
             raise
 
+    async def _stream_phase2(self, phase1: HostDiscovery, discovered: asyncio.Queue) -> int:
+        """스트리밍 Phase 2: 첫 발견 호스트들의 RTT로 파라미터를 튜닝한 뒤 scan_stream 시작
+
+        STREAM_PROFILE_HOSTS개가 모이거나, 다음 호스트가 STREAM_PROFILE_WAIT초 안에 오지 않거나,
+        Phase 1이 끝나면 튜닝하고 이후 발견 호스트는 그대로 전달한다.
+
+        Args:
+            phase1: 실행 중인 HostDiscovery (nmap srtt 재사용)
+            discovered: Phase 1 발견 호스트 큐 (None sentinel로 종료)
+
+        Returns:
+            스캔한 호스트 수
+        """
+        samples: list[str] = []
+        host = await discovered.get()
+        while host is not None:
+            samples.append(host)
+            if len(samples) >= STREAM_PROFILE_HOSTS:
+                break
+            try:
+                host = await asyncio.wait_for(discovered.get(), STREAM_PROFILE_WAIT)
+            except asyncio.TimeoutError:
+                break
+        finished = host is None
+
+        params = await self._tune_params(phase1, set(samples)) if samples else None
+
+        host_queue: asyncio.Queue = asyncio.Queue()
+        for sample in samples:
+            host_queue.put_nowait(sample)
+        if finished:
+            host_queue.put_nowait(None)
+
+        phase2 = self._new_port_scanner()
+        scan = asyncio.create_task(
+            phase2.scan_stream(phase1.subnet, phase1.label, host_queue, params=params)
+        )
+        try:
+            while not finished:
+                host = await discovered.get()
+                host_queue.put_nowait(host)
+                finished = host is None
+            return await scan
+        except BaseException:
+            scan.cancel()
+            raise
+
+    def _new_slots(self, name: str, limit: int) -> AdaptiveLimiter:
+        """전역 Phase 2 슬롯 (적응형이면 limit × GROWTH_FACTOR까지 확대)"""
+        if not self.config.adaptive_concurrency:
+            return AdaptiveLimiter.fixed(name, limit, metrics=self.metrics)
+        return AdaptiveLimiter(name, limit, maximum=limit * GROWTH_FACTOR, metrics=self.metrics)
+
+    def _new_port_scanner(self) -> PortScanner:
+        """전역 Phase 2 슬롯, pps 예산, 저널, 결과 저장소, 서비스 캐시를 공유하는 PortScanner 생성"""
+        return PortScanner(
+            self.config,
+            self.config.scan_dir,
+            host_slots=self._host_slots,
+            service_slots=self._service_slots,
+            journal=self.journal,
+            results_store=self.results_store,
+            baseline=self.baseline,
+            service_cache=self.service_cache,
+            rate_governor=self.rate_governor,
+            metrics=self.metrics,
+            connect_scanner=self._connect_scanner,
+            top_ports=self.top_ports.ports if self.top_ports else None,
+        )
+
+    def _write_metrics(self) -> None:
+        """metrics.json 기록 (중단 시에도 그때까지의 계측 보존)"""
+        metrics_file = self.config.scan_dir / METRICS_FILENAME
+        try:
+            self.metrics.write_json(metrics_file)
+            self.logger.info(f"계측 결과: {metrics_file}")
+        except OSError as e:
+            self.logger.warning(f"계측 결과 저장 실패: {e}")
+
+    def _record_phase1(self, phase1: HostDiscovery, alive_hosts: Set[str]) -> None:
+        """실패 샤드 없이 끝난 Phase 1만 저널에 기록 (실패 시 재개 때 재실행)"""
+        if not phase1.failed_shards:
+            self.journal.record_phase1(phase1.subnet, len(alive_hosts))
+        self._report_baseline_diff(phase1.subnet, phase1.label, alive_hosts)
+
+    def _report_baseline_diff(self, subnet: str, label: str, alive_hosts: Set[str]) -> None:
+        """베이스라인 대비 활성 호스트 변화 기록 (host_diff_{label}.txt: +신규, -사라짐)"""
+        if self.baseline is None:
+            return
+
+        new_hosts, gone_hosts = self.baseline.diff_alive(self.config.subnet_cidrs(subnet), alive_hosts)
+        self.logger.info(
+            f"[{label}] 베이스라인 대비: 신규 {len(new_hosts)}개, 사라짐 {len(gone_hosts)}개, "
+            f"유지 {len(alive_hosts) - len(new_hosts)}개"
+        )
+        if not new_hosts and not gone_hosts:
+            return
+
+        diff_file = self.config.scan_dir / f"host_diff_{label}.txt"
+        with open(diff_file, "w") as f:
+            for host in sorted(new_hosts, key=ipaddress.ip_address):
+                f.write(f"+{host}\n")
+            for host in sorted(gone_hosts, key=ipaddress.ip_address):
+                f.write(f"-{host}\n")
+
+    def _load_alive_hosts(self, subnet_label: str) -> Set[str]:
+        """이전 실행의 alive_hosts_{label}.txt 로드"""
+        alive_file = self.config.scan_dir / f"alive_hosts_{subnet_label}.txt"
+        if not alive_file.exists():
+            return set()
+        return {line.strip() for line in alive_file.read_text().splitlines() if line.strip()}
+
     def _get_subnet_label(self, subnet: str) -> str:
         """서브넷 라벨 생성 (파일명 안전)"""
         return subnet.replace(".", "_").replace("/", "_")
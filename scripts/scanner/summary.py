@@ -0,0 +1,322 @@
+"""스캔 결과 집계 모듈 (후처리)
+
+스캔 디렉토리의 호스트별 nmap 출력(scan_{host}.nmap)을 프로세스 풀에서 병렬 파싱해
+ScanStatistics 카운터를 채우고 통합 요약을 기록한다.
+- summary.json: 전체/서브넷별 합계 + 호스트별 오픈 포트/서비스
+- summary_subnets.csv / summary_hosts.csv / summary_ports.csv
+
+scan_{host}.nmap에는 배치 분리, 서비스 캐시 적중, 상위 포트 모드 이어쓰기 결과가 모두 모이므로
+XML(-oX)이나 results.db 대신 이 파일을 기준으로 센다. 서브넷 소속은 alive_hosts_{label}.txt로 판단한다.
+
+Usage:
+    python scripts/scanner/summary.py scans/<scan_dir>
+    python scripts/scanner/summary.py scans/<scan_dir> --workers 8
+"""
+import argparse
+import csv
+import ipaddress
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+SUMMARY_JSON = "summary.json"
+SUMMARY_CSV = ("summary_subnets.csv", "summary_hosts.csv", "summary_ports.csv")
+SERIAL_THRESHOLD = 64  # 파일이 이보다 적으면 프로세스 풀 없이 처리 (풀 시작 비용이 더 큼)
+
+_REPORT_PREFIX = "Nmap scan report for "
+# "22/tcp open  ssh     OpenSSH 8.9p1 Ubuntu" → 포트, 프로토콜, 상태, 서비스, 버전
+_PORT_LINE_RE = re.compile(r"^(\d+)/(tcp|udp|sctp)[ \t]+(\S+)[ \t]+(\S+)(?:[ \t]+(.*?))?[ \t]*$", re.MULTILINE)
+# NSE vulns 라이브러리 출력 ("|     State: VULNERABLE", "State: LIKELY VULNERABLE"): 정규식 대신 str.count
+_VULN_MARKERS = ("State: VULNERABLE", "State: LIKELY VULNERABLE")
+_UNIDENTIFIED_SERVICES = frozenset({"unknown", "tcpwrapped"})
+
+
+@dataclass
+class PortSummary:
+    """오픈 포트 1개"""
+
+    port: int
+    protocol: str
+    service: str
+    version: str = ""
+
+    @property
+    def identified(self) -> bool:
+        """서비스 식별 여부 (unknown/tcpwrapped/추정값 'ssh?' 제외)"""
+        return self.service not in _UNIDENTIFIED_SERVICES and not self.service.endswith("?")
+
+
+@dataclass
+class HostSummary:
+    """호스트별 집계"""
+
+    host: str
+    ports: list[PortSummary] = field(default_factory=list)
+    vulnerabilities: int = 0
+    subnet: str = ""
+
+    @property
+    def services(self) -> int:
+        """식별된 서비스 수"""
+        return sum(port.identified for port in self.ports)
+
+
+@dataclass
+class SubnetSummary:
+    """서브넷별 집계"""
+
+    subnet: str
+    alive_hosts: int = 0
+    hosts_with_ports: int = 0
+    open_ports: int = 0
+    services: int = 0
+    vulnerabilities: int = 0
+
+
+@dataclass
+class ScanSummary:
+    """스캔 전체 집계"""
+
+    hosts: list[HostSummary]
+    subnets: list[SubnetSummary]
+    files: int       # 파싱한 scan_*.nmap 수
+    workers: int     # 사용한 프로세스 수 (1이면 직렬)
+    elapsed: float   # 파싱/집계 소요 시간 (초)
+
+    @property
+    def open_ports(self) -> int:
+        return sum(subnet.open_ports for subnet in self.subnets)
+
+    @property
+    def services(self) -> int:
+        return sum(subnet.services for subnet in self.subnets)
+
+    @property
+    def vulnerabilities(self) -> int:
+        return sum(subnet.vulnerabilities for subnet in self.subnets)
+
+
+def _parse_host_row(path: Path) -> Optional[tuple[str, list[tuple[int, str, str, str]], int]]:
+    """
+    호스트별 nmap -oN 출력 파싱 (프로세스 풀 작업 단위)
+
+    결과를 부모 프로세스로 보내는 pickle 비용을 줄이려고 dataclass 대신 튜플을 반환한다.
+    같은 포트가 여러 번 나오면(이어쓰기) 마지막 결과를 쓴다.
+
+    Returns:
+        (호스트, [(포트, 프로토콜, 서비스, 버전)], 취약점 수) / 보고 줄이 없으면 None
+    """
+    try:
+        text = path.read_text(errors="replace")
+    except OSError:
+        return None
+
+    start = text.find(_REPORT_PREFIX)
+    if start < 0:
+        return None
+    host = text[start + len(_REPORT_PREFIX):text.find("\n", start)].split()[-1].strip("()")
+
+    ports: dict[tuple[int, str], tuple[int, str, str, str]] = {}
+    for port, protocol, state, service, version in _PORT_LINE_RE.findall(text):
+        if state == "open":
+            ports[int(port), protocol] = (int(port), protocol, service, version)
+    return host, [ports[key] for key in sorted(ports, key=lambda key: (key[1], key[0]))], sum(
+        text.count(marker) for marker in _VULN_MARKERS
+    )
+
+
+def parse_host_output(path: Path) -> Optional[HostSummary]:
+    """
+    호스트별 nmap -oN 출력(scan_{host}.nmap) 파싱
+
+    Returns:
+        HostSummary (보고 줄이 없으면 None)
+    """
+    row = _parse_host_row(path)
+    return _host_from_row(row) if row is not None else None
+
+
+def _host_from_row(row: tuple[str, list[tuple[int, str, str, str]], int]) -> HostSummary:
+    host, ports, vulnerabilities = row
+    return HostSummary(host=host, ports=[PortSummary(*port) for port in ports], vulnerabilities=vulnerabilities)
+
+
+def _ip_key(host: str) -> tuple[int, int]:
+    """IP 정렬 키 (버전, 정수)"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return (9, 0)
+    return (address.version, int(address))
+
+
+def _load_subnet_hosts(scan_dir: Path) -> dict[str, list[str]]:
+    """alive_hosts_{label}.txt → {label: 활성 호스트}"""
+    return {
+        alive_file.stem[len("alive_hosts_"):]: [
+            line.strip() for line in alive_file.read_text().splitlines() if line.strip()
+        ]
+        for alive_file in sorted(scan_dir.glob("alive_hosts_*.txt"))
+    }
+
+
+def _cpu_count() -> int:
+    """사용 가능한 CPU 수 (컨테이너/taskset 제한 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _pool_context():
+    """워커 시작 방식: 스캐너는 로그 스레드가 돌고 있으므로 fork 대신 forkserver (가능한 경우)"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def aggregate_scan(
+    scan_dir: Path,
+    subnet_names: Optional[dict[str, str]] = None,
+    workers: Optional[int] = None,
+) -> ScanSummary:
+    """
+    스캔 디렉토리의 scan_*.nmap 병렬 파싱 후 서브넷/호스트별 집계
+
+    Args:
+        scan_dir: 스캔 디렉토리
+        subnet_names: {라벨: 서브넷 CIDR} (없으면 파일명 라벨 그대로 표시)
+        workers: 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        ScanSummary
+    """
+    started = time.perf_counter()
+    scan_dir = Path(scan_dir)
+    subnet_names = subnet_names or {}
+    files = sorted(scan_dir.glob("scan_*.nmap"))
+    workers = max(1, min(workers or _cpu_count(), len(files) or 1))
+
+    if len(files) < SERIAL_THRESHOLD or workers == 1:
+        workers = 1
+        rows = list(map(_parse_host_row, files))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            rows = list(pool.map(_parse_host_row, files, chunksize=max(1, len(files) // (workers * 8))))
+
+    subnets: dict[str, SubnetSummary] = {}
+    host_subnet: dict[str, str] = {}
+    for label, alive in _load_subnet_hosts(scan_dir).items():
+        name = subnet_names.get(label, label)
+        subnets[name] = SubnetSummary(subnet=name, alive_hosts=len(alive))
+        host_subnet.update(dict.fromkeys(alive, name))
+
+    hosts: dict[str, HostSummary] = {}
+    for row in rows:
+        if row is None:
+            continue
+        result = _host_from_row(row)
+        result.subnet = host_subnet.get(result.host, "-")
+        hosts[result.host] = result
+
+    for result in hosts.values():
+        subnet = subnets.setdefault(result.subnet, SubnetSummary(subnet=result.subnet))
+        subnet.hosts_with_ports += bool(result.ports)
+        subnet.open_ports += len(result.ports)
+        subnet.services += result.services
+        subnet.vulnerabilities += result.vulnerabilities
+
+    return ScanSummary(
+        hosts=sorted(hosts.values(), key=lambda h: _ip_key(h.host)),
+        subnets=list(subnets.values()),
+        files=len(files),
+        workers=workers,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def write_summary(summary: ScanSummary, scan_dir: Path) -> list[Path]:
+    """
+    summary.json과 서브넷/호스트/포트 CSV 기록
+
+    Returns:
+        기록한 파일 경로 목록
+    """
+    scan_dir = Path(scan_dir)
+    json_file = scan_dir / SUMMARY_JSON
+    subnets_csv, hosts_csv, ports_csv = (scan_dir / name for name in SUMMARY_CSV)
+
+    data = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "totals": {
+            "subnets": len(summary.subnets),
+            "alive_hosts": sum(subnet.alive_hosts for subnet in summary.subnets),
+            "hosts_with_ports": sum(subnet.hosts_with_ports for subnet in summary.subnets),
+            "open_ports": summary.open_ports,
+            "services": summary.services,
+            "vulnerabilities": summary.vulnerabilities,
+        },
+        "subnets": [asdict(subnet) for subnet in summary.subnets],
+        "hosts": [asdict(host) for host in summary.hosts],
+    }
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    with open(subnets_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["subnet", "alive_hosts", "hosts_with_ports", "open_ports", "services", "vulnerabilities"])
+        for subnet in summary.subnets:
+            writer.writerow([
+                subnet.subnet, subnet.alive_hosts, subnet.hosts_with_ports,
+                subnet.open_ports, subnet.services, subnet.vulnerabilities,
+            ])
+
+    with open(hosts_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["subnet", "host", "open_ports", "services", "vulnerabilities", "ports"])
+        for host in summary.hosts:
+            writer.writerow([
+                host.subnet, host.host, len(host.ports), host.services, host.vulnerabilities,
+                " ".join(f"{port.port}/{port.protocol}" for port in host.ports),
+            ])
+
+    with open(ports_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["subnet", "host", "port", "protocol", "service", "version"])
+        for host in summary.hosts:
+            for port in host.ports:
+                writer.writerow([host.subnet, host.host, port.port, port.protocol, port.service, port.version])
+
+    return [json_file, subnets_csv, hosts_csv, ports_csv]
+
+
+def main() -> int:
+    """기존 스캔 디렉토리 재집계 CLI"""
+    parser = argparse.ArgumentParser(description="스캔 결과 집계 (summary.json, summary_*.csv)")
+    parser.add_argument("scan_dir", type=Path, help="스캔 디렉토리 (scans/rustscan_massive_*)")
+    parser.add_argument("--workers", type=int, help="프로세스 수 (기본값: CPU 수)")
+    args = parser.parse_args()
+
+    if not args.scan_dir.is_dir():
+        print(f"스캔 디렉토리를 찾을 수 없음: {args.scan_dir}", file=sys.stderr)
+        return 1
+
+    summary = aggregate_scan(args.scan_dir, workers=args.workers)
+    paths = write_summary(summary, args.scan_dir)
+    print(
+        f"호스트 출력 {summary.files}개 ({summary.workers} 프로세스, {summary.elapsed:.2f}s): "
+        f"오픈 포트 {summary.open_ports}개, 서비스 {summary.services}개, 취약점 {summary.vulnerabilities}개"
+    )
+    for path in paths:
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""2단계 포트 스캔용 상위 포트 목록 모듈
+
+이전 스캔 디렉토리들의 results.db에서 포트별 열린 호스트 수를 합산해 자주 열리는 포트를 고른다.
+학습한 포트가 목표 개수보다 적으면 내장 목록(nmap-services 빈도 순 상위 100개)으로 채운다.
+"""
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from utils.results_store import RESULTS_DB_FILENAME, ResultsStore
+
+DEFAULT_TOP_PORTS = 100
+MAX_LEARN_SCANS = 20  # 최근 스캔 디렉토리만 참고 (시작 지연 제한)
+
+# nmap-services 빈도 순 TCP 상위 100개
+BUILTIN_TOP_PORTS = (
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139, 143, 53, 135, 3306, 8080, 1723, 111, 995, 993, 5900,
+    1025, 587, 8888, 199, 1720, 465, 548, 113, 81, 6001, 10000, 514, 5060, 179, 1026, 2000, 8443, 8000,
+    32768, 554, 26, 1433, 49152, 2001, 515, 8008, 49154, 1027, 5666, 646, 5000, 5631, 631, 49153, 8081,
+    2049, 88, 79, 5800, 106, 2121, 1110, 49155, 6000, 513, 990, 5357, 427, 49156, 543, 544, 5101, 144,
+    7, 389, 8009, 3128, 444, 9999, 5009, 7070, 5190, 3000, 5432, 1900, 3986, 13, 1029, 9, 5051, 6646,
+    49157, 1028, 873, 1755, 2717, 4899, 9100, 119, 37,
+)
+
+
+@dataclass
+class TopPorts:
+    """1단계 스캔 포트 목록"""
+
+    ports: list[int]
+    learned: int  # 이전 스캔 결과에서 고른 포트 수 (나머지는 내장 목록)
+    scans: int    # 참고한 results.db 수
+
+
+def learn_top_ports(
+    scans_root: Path,
+    count: int = DEFAULT_TOP_PORTS,
+    exclude: Optional[Path] = None,
+    max_scans: int = MAX_LEARN_SCANS,
+) -> TopPorts:
+    """
+    이전 스캔 결과로 상위 포트 목록 생성
+
+    Args:
+        scans_root: 스캔 디렉토리들의 상위 디렉토리 (scripts/scans)
+        count: 목표 포트 수
+        exclude: 제외할 스캔 디렉토리 (현재 스캔)
+        max_scans: 참고할 최근 results.db 최대 수
+
+    Returns:
+        TopPorts (빈도 순 학습 포트 + 내장 목록 보충)
+    """
+    exclude = Path(exclude).resolve() if exclude is not None else None
+    db_files = sorted(
+        (
+            db_file for db_file in Path(scans_root).glob(f"*/{RESULTS_DB_FILENAME}")
+            if db_file.parent.resolve() != exclude
+        ),
+        key=lambda db_file: db_file.stat().st_mtime,
+        reverse=True,
+    )[:max_scans]
+
+    frequency: Counter = Counter()
+    for db_file in db_files:
+        try:
+            store = ResultsStore(db_file, read_only=True)
+        except sqlite3.Error:
+            continue
+        try:
+            frequency.update(store.port_frequency())
+        except sqlite3.Error:
+            pass
+        finally:
+            store.close()
+
+    learned = [port for port, _ in frequency.most_common(count)]
+    seen = set(learned)
+    fallback = [port for port in BUILTIN_TOP_PORTS if port not in seen]
+    return TopPorts(
+        ports=learned + fallback[:max(0, count - len(learned))],
+        learned=len(learned),
+        scans=len(db_files),
+    )
@@ -0,0 +1,233 @@
+"""asyncio TCP connect 포트 발견 엔진 (rustscan 대체)
+
+rustscan 프로세스를 띄우지 않고 이벤트 루프 하나에서 여러 호스트의 포트에 논블로킹 connect를 건다.
+- 전역 소켓 예산(max_sockets)을 모든 호출이 공유 (FD 사용량 상한 = ulimit 계산 기준)
+- 포트별 타임아웃(ms): 응답 없음 = filtered, RST(ECONNREFUSED) = closed
+  (타임아웃 시 커널 소켓 상태를 확인해 루프 지연으로 늦게 처리된 응답은 그대로 반영)
+- pps 상한 지정 시 connect 시작 간격을 고르게 배분 (전역 RateGovernor 할당분)
+- 오픈 포트는 발견 즉시 iter_open()으로 yield
+- SO_LINGER 0으로 닫아 수만 개 연결의 TIME_WAIT 누적 방지
+
+벤치마크: python benchmarks/bench_connect_scan.py --hosts 8
+"""
+import asyncio
+import errno
+import ipaddress
+import socket
+import struct
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator, Optional, Sequence
+
+ALL_PORTS = range(1, 65536)
+DEFAULT_MAX_SOCKETS = 4096
+
+# 대상 응답으로 보는 오류 (포트/호스트 상태), 그 외 OSError는 로컬 자원 부족(EMFILE, ENOBUFS 등)
+_UNREACHABLE_ERRNOS = frozenset({
+    errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EHOSTDOWN, errno.ECONNRESET, errno.ETIMEDOUT,
+})
+_LINGER_RST = struct.pack("ii", 1, 0)
+
+
+@dataclass
+class ConnectScanStats:
+    """connect 결과 집계"""
+
+    attempts: int = 0
+    open: int = 0
+    closed: int = 0
+    filtered: int = 0   # 타임아웃/도달 불가
+    errors: int = 0     # 로컬 자원 오류 (결과 불확실)
+
+    def add(self, other: "ConnectScanStats") -> None:
+        """다른 집계 합산"""
+        self.attempts += other.attempts
+        self.open += other.open
+        self.closed += other.closed
+        self.filtered += other.filtered
+        self.errors += other.errors
+
+
+def _iter_targets(hosts: Sequence[str], ports: Iterable[int]) -> Iterator[tuple[str, int, int]]:
+    """
+    (호스트, 포트, 주소 체계) 순회: 포트 우선으로 호스트를 번갈아 방문 (한 호스트 집중 방지)
+
+    >>> [(h, p) for h, p, _ in _iter_targets(["10.0.0.1", "10.0.0.2"], [22, 80])]
+    [('10.0.0.1', 22), ('10.0.0.2', 22), ('10.0.0.1', 80), ('10.0.0.2', 80)]
+    """
+    families = [
+        socket.AF_INET6 if ipaddress.ip_address(host).version == 6 else socket.AF_INET
+        for host in hosts
+    ]
+    for port in ports:
+        for host, family in zip(hosts, families):
+            yield host, port, family
+
+
+class ConnectScanner:
+    """논블로킹 TCP connect 스캐너 (전역 1개를 모든 서브넷/배치가 공유)"""
+
+    def __init__(self, max_sockets: int = DEFAULT_MAX_SOCKETS):
+        """
+        Args:
+            max_sockets: 전체 호출 합산 동시 connect 수 (열린 FD 상한)
+        """
+        self.max_sockets = max_sockets
+        self.stats = ConnectScanStats()
+        self._sockets = asyncio.Semaphore(max_sockets)
+
+    @property
+    def required_ulimit(self) -> int:
+        """필요한 ulimit 값 (소켓 예산 + 로그/결과 파일/서브프로세스 여유)"""
+        return self.max_sockets + 1024
+
+    async def scan(
+        self,
+        hosts: Sequence[str],
+        ports: Iterable[int] = ALL_PORTS,
+        timeout_ms: int = 1000,
+        concurrency: Optional[int] = None,
+        rate: Optional[int] = None,
+    ) -> tuple[dict[str, list[int]], ConnectScanStats]:
+        """
+        호스트 목록 포트 스캔 (전체 완료까지 대기)
+
+        Args:
+            hosts: 대상 IP (IPv4/IPv6)
+            ports: 대상 포트 (기본값: 1-65535)
+            timeout_ms: 포트별 connect 타임아웃
+            concurrency: 이 호출의 동시 connect 수 (None이면 max_sockets, 전역 예산 안에서)
+            rate: connect 시작 속도 상한 (초당, None이면 제한 없음)
+
+        Returns:
+            ({호스트: 정렬된 오픈 포트}, 이 호출의 집계)
+        """
+        stats = ConnectScanStats()
+        found: dict[str, list[int]] = {host: [] for host in hosts}
+        async for host, port in self.iter_open(hosts, ports, timeout_ms, concurrency, rate, stats):
+            found[host].append(port)
+        return {host: sorted(ports) for host, ports in found.items() if ports}, stats
+
+    async def iter_open(
+        self,
+        hosts: Sequence[str],
+        ports: Iterable[int] = ALL_PORTS,
+        timeout_ms: int = 1000,
+        concurrency: Optional[int] = None,
+        rate: Optional[int] = None,
+        stats: Optional[ConnectScanStats] = None,
+    ) -> AsyncIterator[tuple[str, int]]:
+        """
+        오픈 포트를 발견 즉시 (호스트, 포트)로 yield
+
+        Args:
+            stats: 집계 대상 (None이면 전역 집계만)
+            나머지는 scan()과 동일
+        """
+        stats = stats if stats is not None else ConnectScanStats()
+        targets = _iter_targets(list(hosts), ports)
+        results: asyncio.Queue = asyncio.Queue()
+        timeout = timeout_ms / 1000
+        interval = 1 / rate if rate else 0.0
+        loop = asyncio.get_running_loop()
+        next_start = loop.time()
+
+        async def pace() -> None:
+            """connect 시작 간격 배분 (rate pps)"""
+            nonlocal next_start
+            now = loop.time()
+            start, next_start = max(next_start, now), max(next_start, now) + interval
+            if start > now:
+                await asyncio.sleep(start - now)
+
+        async def worker() -> None:
+            for host, port, family in targets:
+                if interval:
+                    await pace()
+                async with self._sockets:
+                    state = await self._probe(host, port, family, timeout)
+                stats.attempts += 1
+                setattr(stats, state, getattr(stats, state) + 1)
+                if state == "open":
+                    results.put_nowait((host, port))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(concurrency or self.max_sockets, self.max_sockets))
+        ]
+        done = asyncio.gather(*workers)
+        done.add_done_callback(lambda _: results.put_nowait(None))  # 종료 sentinel
+        try:
+            while (item := await results.get()) is not None:
+                yield item
+            await done  # 워커 예외 전파
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.stats.add(stats)
+
+    @staticmethod
+    async def _probe(host: str, port: int, family: int, timeout: float) -> str:
+        """
+        단일 connect 시도 (connect_ex + add_writer: 시도마다 Task/wait_for를 만들지 않음)
+
+        Returns:
+            "open" / "closed" / "filtered" / "errors"
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            return "errors"
+        try:
+            sock.setblocking(False)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+            error = sock.connect_ex((host, port))
+            if error == 0:
+                return "open"
+            if error != errno.EINPROGRESS:
+                return _error_state(error)
+
+            # 쓰기 가능 = 연결 완료(성공/거부), 타이머 = 응답 없음
+            ready = loop.create_future()
+            fd = sock.fileno()
+            loop.add_writer(fd, _set_ready, ready)
+            timer = loop.call_later(timeout, _set_ready, ready)
+            try:
+                await ready
+            finally:
+                loop.remove_writer(fd)
+                timer.cancel()
+            return _settled_state(sock)
+        except OSError as e:
+            return _error_state(e.errno)
+        finally:
+            sock.close()
+
+
+def _set_ready(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _error_state(error: int) -> str:
+    """connect 오류 번호 → 상태 (EAGAIN/EMFILE 등 로컬 자원 부족은 errors)"""
+    if error == errno.ECONNREFUSED:
+        return "closed"
+    return "filtered" if error in _UNREACHABLE_ERRNOS else "errors"
+
+
+def _settled_state(sock: socket.socket) -> str:
+    """
+    쓰기 가능/타임아웃 시점의 커널 소켓 상태 확인
+
+    타임아웃이어도 루프가 바빠 응답(SYN-ACK/RST) 처리가 늦었을 뿐이면 이미 끝난 연결로 판별한다.
+    """
+    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+    if error:
+        return _error_state(error)
+    try:
+        sock.getpeername()
+    except OSError:
+        return "filtered"  # 아직 SYN_SENT
+    return "open"
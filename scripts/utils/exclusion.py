@@ -0,0 +1,139 @@
+"""CIDR/범위 제외 대상 구간 인덱스 모듈
+
+exclude 항목(IP, CIDR, 범위)을 병합된 정수 구간으로 보관하고 이진 탐색으로 포함 여부를 판단한다.
+- 경계 목록 [s0, e0+1, s1, e1+1, ...]에서 bisect 위치가 홀수면 제외 대상
+- 대량 필터링: inet_pton/bisect를 map으로 돌려 호스트당 파이썬 바이트코드 최소화
+- nmap --excludefile: 샤드와 겹치는 구간만 CIDR로 기록해 제외 대상에는 패킷을 보내지 않음
+"""
+import ipaddress
+import socket
+import sys
+from array import array
+from bisect import bisect_right
+from functools import partial
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable
+
+from utils.ip_ranges import IPNetwork, merge_ranges, ranges_to_cidrs
+from utils.json_loader import parse_target
+
+
+class ExclusionIndex:
+    """병합된 제외 구간 인덱스 (IP 버전별 정렬 경계 목록)"""
+
+    def __init__(self, entries: Iterable[str] = ()):
+        """
+        Args:
+            entries: 제외 항목 (IP, CIDR, 'a.b.c.d-e.f.g.h', 'a.b.c.d-N')
+
+        Raises:
+            ValueError: 항목 형식이 올바르지 않은 경우
+        """
+        ranges: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for entry in entries:
+            version, first, last = parse_target(entry.strip())
+            ranges[version].append((first, last))
+
+        self._ranges = {version: merge_ranges(items) for version, items in ranges.items()}
+        self._bounds: dict[int, list[int]] = {
+            version: [bound for start, end in merged for bound in (start, end + 1)]
+            for version, merged in self._ranges.items()
+        }
+
+    def __len__(self) -> int:
+        """병합된 구간 수"""
+        return len(self._ranges[4]) + len(self._ranges[6])
+
+    def __contains__(self, ip: str) -> bool:
+        """
+        IP 포함 여부
+
+        >>> index = ExclusionIndex(["10.0.0.0/24", "192.168.1.10-20", "2001:db8::1"])
+        >>> "10.0.0.77" in index, "10.0.1.1" in index, "192.168.1.15" in index, "2001:db8::1" in index
+        (True, False, True, True)
+        """
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+            version = 4
+        except OSError:
+            try:
+                value, version = int(ipaddress.IPv6Address(ip)), 6
+            except ValueError:
+                return False
+        return bisect_right(self._bounds[version], value) & 1 == 1
+
+    @property
+    def address_count(self) -> int:
+        """제외 주소 수"""
+        return sum(end - start + 1 for ranges in self._ranges.values() for start, end in ranges)
+
+    def filter(self, hosts: Iterable[str]) -> list[str]:
+        """
+        제외 대상이 아닌 호스트만 (입력 순서 유지)
+
+        >>> ExclusionIndex(["10.0.0.0/30", "::1"]).filter(["10.0.0.2", "10.0.0.4", "::1", "::2"])
+        ['10.0.0.4', '::2']
+        """
+        hosts = list(hosts)
+        if not self:
+            return hosts
+        try:
+            # IPv4만 있으면 한 번에 패킹해 정수 배열로 변환 후 bisect
+            values = array("I", b"".join(map(partial(socket.inet_pton, socket.AF_INET), hosts)))
+        except OSError:
+            return [host for host in hosts if host not in self]  # IPv6/비정상 주소 혼재
+        if sys.byteorder == "little":
+            values.byteswap()
+        positions = map(bisect_right, repeat(self._bounds[4]), values)
+        return [host for host, position in zip(hosts, positions) if not position & 1]
+
+    def overlapping(self, first: int, last: int, version: int = 4) -> list[tuple[int, int]]:
+        """
+        [first, last]와 겹치는 제외 구간 (범위 안으로 잘라서 반환)
+
+        >>> ExclusionIndex(["10.0.0.0/30", "10.0.0.200-10.0.1.5"]).overlapping(167772161, 167772415)
+        [(167772161, 167772163), (167772360, 167772415)]
+        """
+        ranges = self._ranges[version]
+        position = max(bisect_right(self._bounds[version], first) // 2 - 1, 0)
+        overlaps = []
+        while position < len(ranges) and ranges[position][0] <= last:
+            start, end = ranges[position]
+            if end >= first:
+                overlaps.append((max(start, first), min(end, last)))
+            position += 1
+        return overlaps
+
+    def covers(self, first: int, last: int, version: int = 4) -> bool:
+        """[first, last] 전체가 제외 대상인지"""
+        overlaps = self.overlapping(first, last, version)
+        return len(overlaps) == 1 and overlaps[0] == (first, last)
+
+    def overlapping_cidrs(self, first: int, last: int, version: int = 4) -> list[str]:
+        """
+        [first, last]와 겹치는 제외 구간을 CIDR 목록으로
+
+        >>> ExclusionIndex(["10.0.0.0/30", "10.0.1.7"]).overlapping_cidrs(167772162, 167772415)
+        ['10.0.0.2/31']
+        """
+        return list(ranges_to_cidrs(self.overlapping(first, last, version), version))
+
+    def write_excludefile(self, path: Path, networks: Iterable[IPNetwork]) -> int:
+        """
+        네트워크들과 겹치는 제외 구간을 nmap --excludefile 형식(한 줄에 CIDR 하나)으로 기록
+
+        Returns:
+            기록한 CIDR 수 (0이면 겹치는 구간 없음, 파일은 만들지 않음)
+        """
+        cidrs = [
+            cidr
+            for network in networks
+            for cidr in self.overlapping_cidrs(
+                int(network.network_address), int(network.broadcast_address), network.version
+            )
+        ]
+        if cidrs:
+            with open(path, "w") as f:
+                f.writelines(f"{cidr}\n" for cidr in cidrs)
+        return len(cidrs)
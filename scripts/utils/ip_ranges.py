@@ -0,0 +1,259 @@
+"""정수 구간 기반 IP 범위 연산 모듈
+
+대규모 네트워크(/8, /12)에서도 IP를 문자열 집합으로 확장하지 않고
+정수 배열과 구간(start, end)으로 계산한다.
+"""
+import heapq
+import ipaddress
+import socket
+from array import array
+from typing import IO, Iterable, Iterator, Optional, Sequence, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# IPv4 마지막 옥텟 문자열 캐시 (문자열 생성 최소화)
+_OCTETS = [str(i) for i in range(256)]
+
+MAX_PACKED_CIDRS = 1024  # 묶음 스캔 단위 1개의 CIDR 수 상한 (nmap -iL 목록, 로그/레이블 크기 제한)
+
+
+def host_bounds(network: IPNetwork) -> tuple[int, int]:
+    """
+    network.hosts()와 동일한 범위의 (첫 호스트, 마지막 호스트) 정수 반환
+
+    - IPv4: 네트워크/브로드캐스트 주소 제외 (/31, /32는 전체)
+    - IPv6: Subnet-Router anycast(첫 주소) 제외 (/127, /128은 전체)
+    """
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+
+    if network.version == 4 and network.prefixlen < 31:
+        return first + 1, last - 1
+    if network.version == 6 and network.prefixlen < 127:
+        return first + 1, last
+    return first, last
+
+
+def sorted_ip_ints(ips: Iterable[str]) -> Sequence[int]:
+    """
+    IP 문자열을 중복 제거된 정렬 정수 배열로 변환
+
+    IPv4만 있으면 array('I') (IP당 4바이트), IPv6가 섞이면 list를 반환한다.
+    """
+    values = sorted({int(ipaddress.ip_address(ip)) for ip in ips})
+    if not values or values[-1] <= 0xFFFFFFFF:
+        return array("I", values)
+    return values
+
+
+def iter_uncovered_ranges(
+    first: int, last: int, *sorted_points: Sequence[int]
+) -> Iterator[tuple[int, int]]:
+    """
+    [first, last] 구간에서 sorted_points에 없는 연속 구간을 스트리밍 생성
+
+    Args:
+        first: 시작 정수 (포함)
+        last: 끝 정수 (포함)
+        sorted_points: 정렬된 정수 배열들 (제외할 주소)
+
+    Yields:
+        (start, end) 포함 구간
+    """
+    cursor = first
+    for point in heapq.merge(*sorted_points):
+        if point < cursor:
+            continue  # 범위 밖 또는 중복
+        if point > last:
+            break
+        if point > cursor:
+            yield cursor, point - 1
+        cursor = point + 1
+
+    if cursor <= last:
+        yield cursor, last
+
+
+def count_ranges(ranges: Iterable[tuple[int, int]]) -> int:
+    """구간들의 총 주소 수"""
+    return sum(end - start + 1 for start, end in ranges)
+
+
+def write_ip_ranges(fh: IO[str], ranges: Iterable[tuple[int, int]], version: int = 4) -> int:
+    """
+    구간을 한 줄에 하나의 IP로 파일에 기록 (메모리 사용량 = /24 블록 하나)
+
+    Args:
+        fh: 텍스트 파일 핸들
+        ranges: (start, end) 포함 구간
+        version: IP 버전 (4 또는 6)
+
+    Returns:
+        기록한 IP 수
+    """
+    written = 0
+    for start, end in ranges:
+        if version == 6:
+            for value in range(start, end + 1):
+                fh.write(f"{ipaddress.IPv6Address(value)}\n")
+            written += end - start + 1
+            continue
+
+        # IPv4: /24 블록 단위로 "a.b.c." 접두사를 재사용
+        block = start
+        while block <= end:
+            block_end = min(end, block | 0xFF)
+            prefix = f"{block >> 24}.{(block >> 16) & 0xFF}.{(block >> 8) & 0xFF}."
+            octets = _OCTETS[block & 0xFF:(block_end & 0xFF) + 1]
+            fh.write(prefix + ("\n" + prefix).join(octets) + "\n")
+            written += block_end - block + 1
+            block = block_end + 1
+    return written
+
+
+def merge_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    겹치거나 인접한 구간 병합
+
+    >>> merge_ranges([(10, 20), (0, 5), (6, 8), (15, 30), (40, 40)])
+    [(0, 8), (10, 30), (40, 40)]
+    """
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def count_overlap(ranges: Sequence[tuple[int, int]], others: Sequence[tuple[int, int]]) -> int:
+    """
+    병합된 두 구간 목록이 겹치는 주소 수
+
+    >>> count_overlap([(0, 9), (20, 29)], [(5, 24)])
+    10
+    """
+    total = i = j = 0
+    while i < len(ranges) and j < len(others):
+        start = max(ranges[i][0], others[j][0])
+        end = min(ranges[i][1], others[j][1])
+        if start <= end:
+            total += end - start + 1
+        if ranges[i][1] < others[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def ranges_to_cidrs(
+    ranges: Iterable[tuple[int, int]], version: int = 4, split_prefix: Optional[int] = None
+) -> Iterator[str]:
+    """
+    구간을 최소 CIDR 문자열 목록으로 변환 (split_prefix보다 큰 네트워크는 /split_prefix로 분할)
+
+    ipaddress.summarize_address_range와 같은 결과를 정수 연산과 inet_ntop으로 만든다
+    (수십만 개 구간에서 네트워크 객체 생성 비용 제거).
+
+    >>> list(ranges_to_cidrs([(167772160, 167772671)]))
+    ['10.0.0.0/23']
+    >>> list(ranges_to_cidrs([(167772160, 167772671)], split_prefix=24))
+    ['10.0.0.0/24', '10.0.1.0/24']
+    >>> list(ranges_to_cidrs([(167772165, 167772169)]))
+    ['10.0.0.5/32', '10.0.0.6/31', '10.0.0.8/31']
+    """
+    bits, family = (32, socket.AF_INET) if version == 4 else (128, socket.AF_INET6)
+    length = bits // 8
+    limit = 1 << (bits - split_prefix) if split_prefix is not None else 1 << bits
+    for start, end in ranges:
+        while start <= end:
+            size = start & -start if start else 1 << bits  # 정렬 가능한 최대 블록
+            while size > end - start + 1:
+                size >>= 1
+            size = min(size, limit)
+            prefix = bits - size.bit_length() + 1
+            yield f"{socket.inet_ntop(family, start.to_bytes(length, 'big'))}/{prefix}"
+            start += size
+
+
+def subtract_ranges(
+    ranges: Iterable[tuple[int, int]], removed: Sequence[tuple[int, int]]
+) -> Iterator[tuple[int, int]]:
+    """
+    정렬된 구간들에서 정렬/병합된 removed 구간을 뺀 나머지를 스트리밍 생성
+
+    >>> list(subtract_ranges([(0, 9), (20, 29)], [(3, 4), (8, 21), (25, 25)]))
+    [(0, 2), (5, 7), (22, 24), (26, 29)]
+    """
+    index = 0
+    for start, end in ranges:
+        while index < len(removed) and removed[index][1] < start:
+            index += 1
+        cursor = start
+        scan = index
+        while scan < len(removed) and removed[scan][0] <= end:
+            if removed[scan][0] > cursor:
+                yield cursor, removed[scan][0] - 1
+            cursor = max(cursor, removed[scan][1] + 1)
+            scan += 1
+        if cursor <= end:
+            yield cursor, end
+
+
+def cidr_size(cidr: str) -> int:
+    """CIDR 문자열의 주소 수"""
+    address, _, prefix = cidr.partition("/")
+    bits = 128 if ":" in address else 32
+    return 1 << (bits - int(prefix)) if prefix else 1
+
+
+def pack_cidrs(
+    cidrs: Iterable[str],
+    max_addresses: int,
+    max_cidrs: int = MAX_PACKED_CIDRS,
+    max_cidr_size: Optional[int] = None,
+) -> Iterator[list[str]]:
+    """
+    정렬된 CIDR 중 작은 것들을 순서대로 묶어 주소 수 max_addresses 이하의 스캔 단위 생성
+
+    흩어진 IP 목록이 /32마다 별도 서브넷(nmap 실행, 진행률, 결과 파일)이 되지 않도록 한다.
+    max_cidr_size보다 큰 CIDR(예: 일반 /24), 묶음 한도를 넘는 CIDR, IP 버전이 바뀌는 지점은 단독 단위가 된다.
+
+    >>> list(pack_cidrs(["10.0.0.1/32", "10.0.0.8/29", "10.0.1.0/24", "10.0.2.9/32", "::1/128"], 256))
+    [['10.0.0.1/32', '10.0.0.8/29'], ['10.0.1.0/24'], ['10.0.2.9/32'], ['::1/128']]
+    >>> list(pack_cidrs(["10.0.0.1/32", "10.0.0.64/26", "10.0.0.130/32", "10.0.0.132/30"], 256, max_cidr_size=16))
+    [['10.0.0.1/32'], ['10.0.0.64/26'], ['10.0.0.130/32', '10.0.0.132/30']]
+    """
+    group: list[str] = []
+    size = 0
+    for cidr in cidrs:
+        addresses = cidr_size(cidr)
+        if max_cidr_size is not None and addresses > max_cidr_size:
+            if group:
+                yield group
+                group, size = [], 0
+            yield [cidr]
+            continue
+        if group and (
+            size + addresses > max_addresses
+            or len(group) >= max_cidrs
+            or (":" in cidr) != (":" in group[0])
+        ):
+            yield group
+            group, size = [], 0
+        group.append(cidr)
+        size += addresses
+    if group:
+        yield group
+
+
+def unit_name(cidrs: Sequence[str]) -> str:
+    """
+    묶음 스캔 단위 이름 (첫 CIDR + 나머지 개수, 단독 CIDR은 그대로)
+
+    >>> unit_name(["10.0.0.1/32", "10.0.0.8/29", "10.0.0.20/32"]), unit_name(["10.0.1.0/24"])
+    ('10.0.0.1/32+2', '10.0.1.0/24')
+    """
+    return cidrs[0] if len(cidrs) == 1 else f"{cidrs[0]}+{len(cidrs) - 1}"
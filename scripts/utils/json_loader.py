@@ -1,45 +1,142 @@
-"""타겟 JSON 파일 로드 및 검증 모듈"""
+"""타겟 파일 로드 및 검증 모듈
+
+지원 형식:
+- JSON: {"subnets": [...], "exclude": [...]}
+- 텍스트: 한 줄에 하나 이상(공백/쉼표 구분)의 IP, CIDR, 범위. '#' 이후는 주석, '!' 접두사는 제외 대상
+  예) 10.0.0.0/24, 192.168.1.10, 172.16.0.1-172.16.3.254, 10.1.1.5-20, !10.0.0.1
+
+항목은 정수 구간으로 모아 겹치거나 인접한 네트워크를 병합한 뒤 최소 CIDR 목록으로 되돌리고,
+split_prefix보다 큰 IPv4 네트워크는 스캔 단위로 분할한다. 반대로 /28 이하의 아주 작은 CIDR(흩어진 IP 등)은
+/24 크기까지 묶어 '첫CIDR+N' 이름의 스캔 단위 하나로 만든다 (일반 /24 등은 각각 별도 서브넷 유지).
+텍스트 파일은 줄 단위로 읽는다.
+"""
+import ipaddress
 import json
+import socket
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional, Union
+
+from utils.ip_ranges import count_overlap, merge_ranges, pack_cidrs, ranges_to_cidrs, unit_name
+
+DEFAULT_SPLIT_PREFIX = 16  # 이보다 큰 IPv4 네트워크는 /16 단위로 분할
+PACK_MAX_CIDR_SIZE = 16    # 이 주소 수 이하(/28~/32)의 CIDR만 묶음 대상
+PACK_UNIT_SIZE = 256       # 묶음 스캔 단위 1개의 최대 주소 수 (/24)
+
+_IPV4_MAX = 0xFFFFFFFF
+_JSON_SUFFIXES = {".json"}
 
 
 class TargetsData:
     """타겟 데이터 클래스"""
 
-    def __init__(self, subnets: list[str], exclude: list[str]):
+    def __init__(
+        self,
+        subnets: list[str],
+        exclude: list[str],
+        entries: int = 0,
+        addresses: int = 0,
+        excluded: int = 0,
+        units: Optional[dict[str, list[str]]] = None,
+    ):
+        """
+        Args:
+            subnets: 병합/분할된 CIDR 또는 묶음 스캔 단위 이름 목록
+            exclude: 제외 대상 (단일 IP 또는 CIDR)
+            entries: 입력 타겟 항목 수 (병합 전)
+            addresses: 중복 제거 후 타겟 주소 수 (네트워크/브로드캐스트 포함)
+            excluded: 타겟 주소 중 제외 대상과 겹치는 수
+            units: 묶음 스캔 단위 이름 → CIDR 목록 (단독 CIDR 서브넷은 포함하지 않음)
+        """
         self.subnets = subnets
         self.exclude = exclude
+        self.entries = entries
+        self.addresses = addresses
+        self.excluded = excluded
+        self.units = units or {}
+
+    def iter_cidrs(self) -> Iterator[str]:
+        """묶음 단위를 풀어낸 전체 타겟 CIDR"""
+        for subnet in self.subnets:
+            yield from self.units.get(subnet, (subnet,))
+
+    @property
+    def effective_addresses(self) -> int:
+        """제외 대상을 뺀 실제 스캔 주소 수"""
+        return self.addresses - self.excluded
 
     def __repr__(self) -> str:
-        return f"TargetsData(subnets={len(self.subnets)}, exclude={len(self.exclude)})"
+        return (
+            f"TargetsData(subnets={len(self.subnets)}, exclude={len(self.exclude)}, "
+            f"addresses={self.effective_addresses})"
+        )
 
 
-def load_targets(json_file: Path) -> TargetsData:
-    """
-    targets.json 로드 및 검증
+def _ipv4_int(text: str) -> int:
+    """점 4개 표기 IPv4 → 정수 (inet_pton: ipaddress보다 빠르고 '10.1' 같은 축약 거부)"""
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        raise ValueError(f"잘못된 IPv4 주소: {text}") from None
 
-    Args:
-        json_file: JSON 파일 경로
 
-    Returns:
-        TargetsData 객체
+def parse_target(entry: str) -> tuple[int, int, int]:
+    """
+    타겟 항목 1개를 (IP 버전, 첫 주소, 마지막 주소) 정수 구간으로 변환
+
+    >>> parse_target("10.0.0.0/30")
+    (4, 167772160, 167772163)
+    >>> parse_target("10.0.0.5-9")
+    (4, 167772165, 167772169)
+    >>> parse_target("10.0.0.255-10.0.1.0")
+    (4, 167772415, 167772416)
+    >>> parse_target("2001:db8::/127")[0]
+    6
 
     Raises:
-        FileNotFoundError: 파일이 존재하지 않는 경우
-        ValueError: JSON 스키마가 올바르지 않은 경우
-        json.JSONDecodeError: JSON 파싱 실패 시
+        ValueError: 형식 오류 또는 역순 범위
     """
-    if not json_file.exists():
-        raise FileNotFoundError(f"타겟 파일을 찾을 수 없음: {json_file}")
+    if ":" in entry:
+        return _parse_ipv6(entry)
+    if "/" not in entry and "-" not in entry:
+        first = _ipv4_int(entry)
+        return 4, first, first
+
+    address, slash, prefix = entry.partition("/")
+    if slash:
+        if not prefix.isdigit() or int(prefix) > 32:
+            raise ValueError(f"잘못된 프리픽스: /{prefix}")
+        host_bits = 32 - int(prefix)
+        first = _ipv4_int(address) >> host_bits << host_bits
+        return 4, first, first | (_IPV4_MAX >> (32 - host_bits) if host_bits else 0)
+
+    start, _, end = entry.partition("-")
+    first = _ipv4_int(start)
+    if "." in end:
+        last = _ipv4_int(end)
+    elif end.isdigit() and int(end) <= 255:
+        last = first >> 8 << 8 | int(end)  # 마지막 옥텟 범위 (10.0.0.5-20)
+    else:
+        raise ValueError(f"잘못된 범위 끝: {end}")
+    if last < first:
+        raise ValueError("범위 끝이 시작보다 작습니다")
+    return 4, first, last
 
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"JSON 파싱 실패: {e}") from e
 
-    # 스키마 검증
+def _parse_ipv6(entry: str) -> tuple[int, int, int]:
+    """IPv6 주소/CIDR/전체 범위 (a::1-a::ff)"""
+    if "/" in entry:
+        network = ipaddress.IPv6Network(entry, strict=False)
+        return 6, int(network.network_address), int(network.broadcast_address)
+    start, dash, end = entry.partition("-")
+    first = int(ipaddress.IPv6Address(start))
+    last = int(ipaddress.IPv6Address(end)) if dash else first
+    if last < first:
+        raise ValueError("범위 끝이 시작보다 작습니다")
+    return 6, first, last
+
+
+def _iter_json_entries(data: Any) -> Iterator[tuple[str, bool, str]]:
+    """JSON 스키마 검증 후 (항목, 제외 여부, 위치) 순회"""
     if not isinstance(data, dict):
         raise ValueError("JSON 루트는 객체여야 합니다")
 
@@ -49,15 +146,114 @@ def load_targets(json_file: Path) -> TargetsData:
     if not isinstance(data["subnets"], list):
         raise ValueError("'subnets'는 배열이어야 합니다")
 
-    if not data["subnets"]:
-        raise ValueError("최소 하나 이상의 서브넷이 필요합니다")
-
     # exclude는 선택적
     exclude = data.get("exclude", [])
     if not isinstance(exclude, list):
         raise ValueError("'exclude'는 배열이어야 합니다")
 
-    return TargetsData(subnets=data["subnets"], exclude=exclude)
+    for key, items, is_exclude in (("subnets", data["subnets"], False), ("exclude", exclude, True)):
+        for index, item in enumerate(items):
+            if not isinstance(item, str):
+                raise ValueError(f"'{key}[{index}]'는 문자열이어야 합니다")
+            yield item.strip(), is_exclude, f"{key}[{index}]"
+
+
+def _iter_text_entries(fh) -> Iterator[tuple[str, bool, int]]:
+    """텍스트 파일 줄 단위 순회 (주석/빈 줄 무시, 공백/쉼표 구분, 위치는 행 번호)"""
+    for line_no, line in enumerate(fh, 1):
+        if "#" in line:
+            line = line[:line.index("#")]
+        if "," in line:
+            line = line.replace(",", " ")
+        for item in line.split():
+            if item[0] == "!":
+                yield item[1:], True, line_no
+            else:
+                yield item, False, line_no
+
+
+def iter_target_entries(target_file: Path) -> Iterator[tuple[str, bool, Union[int, str]]]:
+    """
+    타겟 파일의 (항목, 제외 여부, 위치) 순회 (위치: 텍스트는 행 번호, JSON은 'subnets[0]' 형태)
+
+    확장자가 .json이거나 첫 문자가 '{'이면 JSON, 그 외는 텍스트로 스트리밍한다.
+    """
+    with open(target_file, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+
+        if target_file.suffix.lower() in _JSON_SUFFIXES or head == "{":
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON 파싱 실패: {e}") from e
+            yield from _iter_json_entries(data)
+        else:
+            yield from _iter_text_entries(f)
+
+
+def load_targets(json_file: Path, split_prefix: Optional[int] = DEFAULT_SPLIT_PREFIX) -> TargetsData:
+    """
+    타겟 파일 로드, 검증, 병합
+
+    Args:
+        json_file: 타겟 파일 경로 (JSON 또는 텍스트)
+        split_prefix: 이보다 큰 IPv4 네트워크를 나눌 프리픽스 (None이면 분할 안 함)
+
+    Returns:
+        TargetsData 객체 (병합된 CIDR/묶음 단위 목록과 주소 수 집계)
+
+    Raises:
+        FileNotFoundError: 파일이 존재하지 않는 경우
+        ValueError: 스키마 또는 항목 형식이 올바르지 않은 경우
+    """
+    if not json_file.exists():
+        raise FileNotFoundError(f"타겟 파일을 찾을 수 없음: {json_file}")
+    if split_prefix is not None and not 1 <= split_prefix <= 32:
+        raise ValueError(f"split_prefix는 1~32 범위여야 합니다: {split_prefix}")
+
+    ranges: dict[tuple[int, bool], list[tuple[int, int]]] = {
+        (version, is_exclude): [] for version in (4, 6) for is_exclude in (False, True)
+    }
+    entries = 0
+    for entry, is_exclude, where in iter_target_entries(json_file):
+        try:
+            version, first, last = parse_target(entry)
+        except ValueError as e:
+            raise ValueError(f"{json_file.name}:{where}: 잘못된 타겟 '{entry}' ({e})") from None
+        ranges[version, is_exclude].append((first, last))
+        entries += not is_exclude
+
+    if not entries:
+        raise ValueError("최소 하나 이상의 서브넷이 필요합니다")
+
+    subnets: list[str] = []
+    units: dict[str, list[str]] = {}
+    exclude: list[str] = []
+    addresses = excluded = 0
+    for version, address in ((4, ipaddress.IPv4Address), (6, ipaddress.IPv6Address)):
+        targets = merge_ranges(ranges.pop((version, False)))
+        excludes = merge_ranges(ranges.pop((version, True)))
+        addresses += sum(end - start + 1 for start, end in targets)
+        excluded += count_overlap(targets, excludes)
+        cidrs = ranges_to_cidrs(targets, version, split_prefix if version == 4 else None)
+        for group in pack_cidrs(cidrs, PACK_UNIT_SIZE, max_cidr_size=PACK_MAX_CIDR_SIZE):
+            name = unit_name(group)
+            subnets.append(name)
+            if len(group) > 1:
+                units[name] = group
+        for start, end in excludes:
+            if start == end:
+                exclude.append(str(address(start)))
+            else:
+                exclude.extend(ranges_to_cidrs([(start, end)], version))
+
+    return TargetsData(
+        subnets=subnets, exclude=exclude, entries=entries, addresses=addresses, excluded=excluded,
+        units=units,
+    )
 
 
 def save_targets(json_file: Path, targets: TargetsData) -> None:
@@ -68,7 +264,7 @@ def save_targets(json_file: Path, targets: TargetsData) -> None:
         json_file: 저장할 파일 경로
         targets: TargetsData 객체
     """
-    data = {"subnets": targets.subnets, "exclude": targets.exclude}
+    data = {"subnets": list(targets.iter_cidrs()), "exclude": targets.exclude}
 
     with open(json_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,203 @@
+"""nmap 호스트 발견 출력 파서 (-oG grepable / -oX XML)
+
+Phase 1 nmap -sn 출력을 스트리밍 청크 단위로 파싱한다.
+- grepable: 줄마다 정규식을 돌리지 않고 청크 전체에 컴파일된 정규식 1회 (Up 줄만 매칭)
+- XML: expat 콜백으로 필요한 요소 속성만 읽음 (트리를 만들지 않아 메모리 일정)
+- IPv4/IPv6 주소, 호스트명, MAC/벤더, 응답 사유(reason), 지연(srtt) 수집
+
+벤치마크: python benchmarks/bench_nmap_parser.py --lines 2000000
+"""
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+from xml.parsers import expat
+
+_HOST_PREFIX = "Host: "
+_STATUS_PREFIX = "Status: "
+
+# "Host: <addr> (<hostname>)\tStatus: Up" (청크 단위 MULTILINE 검색)
+_GREPABLE_UP_RE = re.compile(r"^Host: (\S+) \(([^)\n]*)\)\tStatus: Up", re.MULTILINE)
+
+
+@dataclass(slots=True)
+class DiscoveredHost:
+    """호스트 발견 결과 1건 (호스트마다 생성되므로 __slots__로 생성 비용/메모리 절감)"""
+
+    address: str
+    status: str = "up"
+    hostname: str = ""
+    mac: str = ""
+    vendor: str = ""
+    reason: str = ""
+    latency_ms: Optional[float] = None  # nmap srtt (XML 전용)
+
+    @property
+    def is_up(self) -> bool:
+        return self.status == "up"
+
+
+def parse_grepable_line(line: str) -> Optional[DiscoveredHost]:
+    """
+    nmap -oG 한 줄 파싱 ("Host: <addr> (<hostname>)\\tStatus: Up")
+
+    Status 필드가 없는 줄(Ports:, 주석 등)은 None.
+
+    >>> parse_grepable_line("Host: 10.0.0.5 (gw.local)\\tStatus: Up")
+    DiscoveredHost(address='10.0.0.5', status='up', hostname='gw.local', mac='', vendor='', reason='', latency_ms=None)
+    >>> parse_grepable_line("Host: fe80::1 ()\\tStatus: Down").status
+    'down'
+    >>> parse_grepable_line("# Nmap done -- 256 IP addresses") is None
+    True
+    """
+    if not line.startswith(_HOST_PREFIX):
+        return None
+    head, sep, rest = line.partition("\t")
+    if not sep or not rest.startswith(_STATUS_PREFIX):
+        return None
+    address, _, hostname = head[len(_HOST_PREFIX):].partition(" ")
+    status = rest[len(_STATUS_PREFIX):].split("\t", 1)[0].strip().lower()
+    return DiscoveredHost(address=address, status=status, hostname=hostname.strip().strip("()"))
+
+
+class GrepableStreamParser:
+    """nmap -oG 스트림 파서 (Up 호스트만, 청크 경계에서 잘린 줄은 다음 청크와 이어 붙임)"""
+
+    def __init__(self):
+        self._partial = ""
+
+    def feed(self, chunk: Union[str, bytes]) -> list[DiscoveredHost]:
+        """
+        청크 파싱
+
+        Args:
+            chunk: 출력 일부 (줄 단위일 필요 없음)
+
+        Returns:
+            이번 청크에서 완성된 줄의 Up 호스트 목록
+        """
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+        text = self._partial + chunk
+        end = text.rfind("\n") + 1
+        self._partial = text[end:]
+        return self._parse(text[:end]) if end else []
+
+    def close(self) -> list[DiscoveredHost]:
+        """남은 마지막 줄 파싱"""
+        hosts = self._parse(self._partial)
+        self._partial = ""
+        return hosts
+
+    @staticmethod
+    def _parse(text: str) -> list[DiscoveredHost]:
+        return [
+            DiscoveredHost(address=address, hostname=hostname)
+            for address, hostname in _GREPABLE_UP_RE.findall(text)
+        ]
+
+
+class XmlStreamParser:
+    """nmap -oX 스트림 파서 (</host>마다 결과 반환)"""
+
+    def __init__(self):
+        self._parser = expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._host: Optional[DiscoveredHost] = None
+        self._done: list[DiscoveredHost] = []
+
+    def feed(self, chunk: Union[str, bytes]) -> list[DiscoveredHost]:
+        """
+        청크 파싱
+
+        Args:
+            chunk: XML 출력 일부
+
+        Returns:
+            이번 청크에서 닫힌 <host> 목록 (IP 주소가 없는 host 제외)
+
+        Raises:
+            xml.parsers.expat.ExpatError: XML 형식 오류
+        """
+        self._parser.Parse(chunk, False)
+        done, self._done = self._done, []
+        return done
+
+    def close(self) -> list[DiscoveredHost]:
+        """스트림 종료 (중단된 nmap의 닫히지 않은 XML은 무시)"""
+        try:
+            self._parser.Parse(b"", True)
+        except expat.ExpatError:
+            pass
+        done, self._done = self._done, []
+        return done
+
+    def _start(self, tag: str, attrs: dict[str, str]) -> None:
+        if tag == "host":
+            self._host = DiscoveredHost(address="", status="")
+            return
+        host = self._host
+        if host is None:
+            return
+        if tag == "address":
+            addrtype = attrs.get("addrtype")
+            if addrtype == "mac":
+                host.mac = attrs.get("addr", "")
+                host.vendor = attrs.get("vendor", "")
+            elif addrtype in ("ipv4", "ipv6") and not host.address:
+                host.address = attrs.get("addr", "")
+        elif tag == "status":
+            host.status = attrs.get("state", "")
+            host.reason = attrs.get("reason", "")
+        elif tag == "hostname" and not host.hostname:
+            host.hostname = attrs.get("name", "")
+        elif tag == "times":
+            srtt = attrs.get("srtt", "")
+            if srtt.isdigit():
+                host.latency_ms = int(srtt) / 1000  # μs → ms
+
+    def _end(self, tag: str) -> None:
+        if tag == "host" and self._host is not None:
+            if self._host.address:
+                self._done.append(self._host)
+            self._host = None
+
+
+def iter_grepable_hosts(lines: Iterable[str]) -> Iterator[DiscoveredHost]:
+    """줄 단위 -oG 출력에서 Up 호스트만 yield"""
+    match_up = _GREPABLE_UP_RE.match
+    for line in lines:
+        match = match_up(line)
+        if match:
+            yield DiscoveredHost(address=match.group(1), hostname=match.group(2))
+
+
+def parse_xml_hosts(text: Union[str, bytes]) -> list[DiscoveredHost]:
+    """-oX 출력 전체에서 Up 호스트 목록"""
+    parser = XmlStreamParser()
+    hosts = parser.feed(text) + parser.close()
+    return [host for host in hosts if host.is_up]
+
+
+def parse_xml_file(path: Union[str, Path], chunk_size: int = 64 * 1024) -> list[DiscoveredHost]:
+    """
+    -oX 파일을 청크 단위로 읽어 Up 호스트 목록 반환 (메모리 일정, 중단된 XML도 닫힌 <host>까지)
+
+    Args:
+        path: nmap -oX 출력 파일
+        chunk_size: 읽기 청크 크기
+
+    Returns:
+        Up 호스트 목록
+    """
+    parser = XmlStreamParser()
+    hosts: list[DiscoveredHost] = []
+    with open(path, "rb") as f:
+        try:
+            while chunk := f.read(chunk_size):
+                hosts += parser.feed(chunk)
+        except expat.ExpatError:
+            pass  # 잘린/손상된 XML: 그때까지 닫힌 <host>만 사용
+    hosts += parser.close()
+    return [host for host in hosts if host.is_up]
@@ -0,0 +1,324 @@
+"""nmap XML 결과 저장소 모듈 (SQLite)
+
+Phase 2 서비스 탐지의 nmap -oX 출력을 스캔 디렉토리의 results.db 하나로 모은다.
+host/port/protocol/service 인덱스로 "445 포트가 열린 모든 호스트" 같은 질의를
+수천 개 scan_*.nmap 파일 grep 대신 인덱스 조회로 처리한다.
+
+Usage:
+    python scripts/utils/results_store.py scans/<scan_dir>/results.db --port 445
+    python scripts/utils/results_store.py scans/<scan_dir>/results.db --service http
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+RESULTS_DB_FILENAME = "results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host        TEXT PRIMARY KEY,
+    state       TEXT,
+    scripts     TEXT,
+    scanned_at  REAL
+);
+CREATE TABLE IF NOT EXISTS ports (
+    host        TEXT NOT NULL,
+    port        INTEGER NOT NULL,
+    protocol    TEXT NOT NULL,
+    state       TEXT,
+    service     TEXT,
+    product     TEXT,
+    version     TEXT,
+    extrainfo   TEXT,
+    scripts     TEXT,
+    PRIMARY KEY (host, port, protocol)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ports_port ON ports (port, protocol, state);
+CREATE INDEX IF NOT EXISTS idx_ports_service ON ports (service);
+"""
+
+
+@dataclass
+class PortResult:
+    """포트별 nmap 결과"""
+
+    port: int
+    protocol: str
+    state: str
+    service: str = ""
+    product: str = ""
+    version: str = ""
+    extrainfo: str = ""
+    scripts: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class HostResult:
+    """호스트별 nmap 결과"""
+
+    host: str
+    state: str
+    ports: list[PortResult] = field(default_factory=list)
+    scripts: dict[str, str] = field(default_factory=dict)
+
+
+def _parse_scripts(element: Optional[ET.Element]) -> dict[str, str]:
+    """<script id=... output=...> 목록을 {id: output}으로 변환"""
+    if element is None:
+        return {}
+    return {
+        script.get("id", ""): script.get("output", "")
+        for script in element.findall("script")
+    }
+
+
+def parse_nmap_xml(xml_file: Path) -> list[HostResult]:
+    """
+    nmap -oX 파일 파싱
+
+    중단된 nmap이 남긴 불완전한 XML은 빈 목록으로 처리한다.
+
+    Args:
+        xml_file: nmap XML 출력 파일
+
+    Returns:
+        HostResult 목록
+    """
+    try:
+        root = ET.parse(xml_file).getroot()
+    except (ET.ParseError, OSError):
+        return []
+
+    results = []
+    for host_el in root.findall("host"):
+        address = next(
+            (
+                addr.get("addr")
+                for addr in host_el.findall("address")
+                if addr.get("addrtype") in ("ipv4", "ipv6")
+            ),
+            None,
+        )
+        if not address:
+            continue
+
+        status = host_el.find("status")
+        host = HostResult(
+            host=address,
+            state=status.get("state", "") if status is not None else "",
+            scripts=_parse_scripts(host_el.find("hostscript")),
+        )
+
+        for port_el in host_el.findall("ports/port"):
+            state_el = port_el.find("state")
+            service_el = port_el.find("service")
+            service = service_el.attrib if service_el is not None else {}
+            host.ports.append(
+                PortResult(
+                    port=int(port_el.get("portid", 0)),
+                    protocol=port_el.get("protocol", "tcp"),
+                    state=state_el.get("state", "") if state_el is not None else "",
+                    service=service.get("name", ""),
+                    product=service.get("product", ""),
+                    version=service.get("version", ""),
+                    extrainfo=service.get("extrainfo", ""),
+                    scripts=_parse_scripts(port_el),
+                )
+            )
+        results.append(host)
+    return results
+
+
+class ResultsStore:
+    """nmap 결과 SQLite 저장소"""
+
+    def __init__(self, db_file: Path, read_only: bool = False):
+        """
+        Args:
+            db_file: SQLite 파일 경로 (없으면 생성)
+            read_only: 기존 파일을 읽기 전용으로 열기 (스키마/PRAGMA 미실행, 이전 스캔 조회용)
+
+        Raises:
+            sqlite3.Error: read_only인데 파일이 없거나 열 수 없는 경우
+        """
+        self.db_file = Path(db_file)
+        if read_only:
+            self._conn = self._connect_read_only(self.db_file)
+            return
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_file)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _connect_read_only(db_file: Path) -> sqlite3.Connection:
+        """mode=ro 연결 (WAL 파일이 없는 읽기 전용 디렉토리면 immutable로 재시도)"""
+        uri = db_file.resolve().as_uri()
+        conn = sqlite3.connect(f"{uri}?mode=ro", uri=True)
+        try:
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            return conn
+        except sqlite3.OperationalError:
+            # WAL 모드 DB는 -shm을 만들 수 없으면 mode=ro로 읽지 못함 → 쓰는 프로세스가 없다고 보고 immutable
+            conn.close()
+            return sqlite3.connect(f"{uri}?mode=ro&immutable=1", uri=True)
+
+    def ingest_hosts(self, hosts: list[HostResult], merge: bool = False) -> int:
+        """
+        호스트 결과 저장 (같은 호스트는 이전 포트 결과를 교체)
+
+        Args:
+            hosts: 호스트 결과
+            merge: 이전 포트/호스트 스크립트를 유지하고 같은 포트만 갱신 (상위 포트 모드 전체 스윕 결과)
+
+        Returns:
+            저장한 포트 수
+        """
+        now = time.time()
+        port_count = 0
+        with self._conn:
+            for host in hosts:
+                scripts = host.scripts
+                if merge:
+                    row = self._conn.execute(
+                        "SELECT scripts FROM hosts WHERE host = ?", (host.host,)
+                    ).fetchone()
+                    if row and row[0]:
+                        scripts = {**json.loads(row[0]), **host.scripts}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO hosts (host, state, scripts, scanned_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (host.host, host.state, json.dumps(scripts, ensure_ascii=False), now),
+                )
+                if not merge:
+                    self._conn.execute("DELETE FROM ports WHERE host = ?", (host.host,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ports (host, port, protocol, state, service, "
+                    "product, version, extrainfo, scripts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            host.host, p.port, p.protocol, p.state, p.service,
+                            p.product, p.version, p.extrainfo,
+                            json.dumps(p.scripts, ensure_ascii=False),
+                        )
+                        for p in host.ports
+                    ],
+                )
+                port_count += len(host.ports)
+        return port_count
+
+    def ingest_xml(self, xml_file: Path, merge: bool = False) -> int:
+        """nmap XML 파일 파싱 후 저장 (저장한 포트 수 반환, merge는 ingest_hosts와 동일)"""
+        return self.ingest_hosts(parse_nmap_xml(xml_file), merge=merge)
+
+    def hosts_with_port(
+        self, port: int, protocol: str = "tcp", state: str = "open"
+    ) -> list[str]:
+        """특정 포트가 열린 호스트 목록 (idx_ports_port 인덱스 조회)"""
+        rows = self._conn.execute(
+            "SELECT host FROM ports WHERE port = ? AND protocol = ? AND state = ? ORDER BY host",
+            (port, protocol, state),
+        )
+        return [row[0] for row in rows]
+
+    def hosts_with_service(self, service: str) -> list[tuple[str, int, str]]:
+        """특정 서비스가 탐지된 (host, port, protocol) 목록 (idx_ports_service 인덱스 조회)"""
+        rows = self._conn.execute(
+            "SELECT host, port, protocol FROM ports WHERE service = ? AND state = 'open' "
+            "ORDER BY host, port",
+            (service,),
+        )
+        return list(rows)
+
+    def open_ports_by_host(self, protocol: str = "tcp") -> dict[str, list[int]]:
+        """호스트별 열린 포트 목록 (증분 재스캔 베이스라인용)"""
+        rows = self._conn.execute(
+            "SELECT host, port FROM ports WHERE protocol = ? AND state = 'open' ORDER BY host, port",
+            (protocol,),
+        )
+        result: dict[str, list[int]] = {}
+        for host, port in rows:
+            result.setdefault(host, []).append(port)
+        return result
+
+    def port_frequency(self, protocol: str = "tcp") -> dict[int, int]:
+        """포트별 열린 호스트 수 (2단계 스캔 상위 포트 학습용, idx_ports_port 인덱스 조회)"""
+        rows = self._conn.execute(
+            "SELECT port, COUNT(*) FROM ports WHERE protocol = ? AND state = 'open' GROUP BY port",
+            (protocol,),
+        )
+        return dict(rows.fetchall())
+
+    def ports_for_host(self, host: str) -> list[PortResult]:
+        """호스트의 포트 결과 목록"""
+        rows = self._conn.execute(
+            "SELECT port, protocol, state, service, product, version, extrainfo, scripts "
+            "FROM ports WHERE host = ? ORDER BY protocol, port",
+            (host,),
+        )
+        return [
+            PortResult(
+                port=row[0], protocol=row[1], state=row[2], service=row[3] or "",
+                product=row[4] or "", version=row[5] or "", extrainfo=row[6] or "",
+                scripts=json.loads(row[7]) if row[7] else {},
+            )
+            for row in rows
+        ]
+
+    def host_results(self) -> list[HostResult]:
+        """저장된 전체 호스트 결과 (분산 워커 → 코디네이터 전송용)"""
+        rows = self._conn.execute("SELECT host, state, scripts FROM hosts ORDER BY host").fetchall()
+        return [
+            HostResult(
+                host=host, state=state or "",
+                ports=self.ports_for_host(host),
+                scripts=json.loads(scripts) if scripts else {},
+            )
+            for host, state, scripts in rows
+        ]
+
+    def close(self) -> None:
+        """연결 닫기"""
+        self._conn.close()
+
+
+def main() -> int:
+    """results.db 질의 CLI"""
+    parser = argparse.ArgumentParser(description="스캔 결과 저장소(results.db) 질의")
+    parser.add_argument("db_file", type=Path, help="results.db 경로")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--port", type=int, help="열린 포트로 호스트 조회")
+    group.add_argument("--service", help="서비스 이름으로 조회 (예: http, ssh)")
+    group.add_argument("--host", help="호스트의 포트/서비스 조회")
+    parser.add_argument("--protocol", default="tcp", help="프로토콜 (기본값: tcp)")
+    args = parser.parse_args()
+
+    if not args.db_file.exists():
+        print(f"결과 저장소를 찾을 수 없음: {args.db_file}", file=sys.stderr)
+        return 1
+
+    store = ResultsStore(args.db_file)
+    try:
+        if args.port is not None:
+            for host in store.hosts_with_port(args.port, args.protocol):
+                print(host)
+        elif args.service:
+            for host, port, protocol in store.hosts_with_service(args.service):
+                print(f"{host}\t{port}/{protocol}")
+        else:
+            for p in store.ports_for_host(args.host):
+                print(f"{p.port}/{p.protocol}\t{p.state}\t{p.service}\t{p.product} {p.version}".rstrip())
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
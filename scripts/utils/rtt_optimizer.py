@@ -1,5 +1,27 @@
 """RTT 기반 rustscan 파라미터 최적화 모듈"""
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field, replace
+from typing import Sequence
+
+
+# 튜닝 상수
+MIN_TIMEOUT_MS = 300         # LAN 하한 (rustscan 포트별 타임아웃)
+MAX_TIMEOUT_MS = 5000        # 고지연 WAN 상한
+TIMEOUT_RTT_FACTOR = 4       # timeout = p90 RTT × 4 + 여유
+TIMEOUT_MARGIN_MS = 100
+FD_BUDGET = 50000            # 서브넷 동시 소켓 예산 (parallel × batch)
+MAX_PARALLEL_LIMIT = 10
+MIN_BATCH_SIZE = 500         # 전역 pps 예산 축소 시 batch 하한 (더 줄이면 필터링 호스트 스캔이 끝나지 않음)
+MIN_RTT_MS = 1.0             # pps 추정 RTT 하한
+SAFE_RTT_MS = 50.0           # RTT 미측정(안전 모드) 시 가정하는 p90 RTT (사내망/근거리 WAN)
+
+# (RTT 상한 ms, batch_size): 지연이 클수록 패킷 손실 방지를 위해 batch 축소
+BATCH_BY_RTT = (
+    (5.0, 10000),            # LAN
+    (50.0, 8000),            # 사내망/근거리 WAN
+    (200.0, 5000),           # WAN
+    (math.inf, 2500),        # 고지연 WAN/위성
+)
 
 
 @dataclass
@@ -9,17 +31,60 @@ class RustscanParams:
     batch_size: int
     timeout: int  # milliseconds
     parallel_limit: int
+    rtt: float = field(default=MIN_RTT_MS, repr=False)  # pps 추정용 p90 RTT (ms)
 
     @property
     def required_ulimit(self) -> int:
         """필요한 ulimit 값 계산"""
         return self.parallel_limit * self.batch_size + 5000
 
+    @property
+    def packet_rate(self) -> int:
+        """
+        예상 최대 SYN 속도 (pps): RTT마다 batch_size개 소켓
+
+        rustscan은 batch_size개 connect를 동시에 유지하고 응답하는 포트는 RTT 안에 슬롯을 비우므로
+        최대 속도는 batch_size / RTT이다 (batch_size / timeout은 모든 포트가 필터링된 경우의 하한).
+
+        Examples:
+            >>> RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5, rtt=20.0).packet_rate
+            500000
+        """
+        return int(self.batch_size * 1000 / max(self.rtt, MIN_RTT_MS))
+
+    def limited_to(self, rate: int) -> "RustscanParams":
+        """
+        최대 속도가 pps 한도 이하가 되도록 batch_size를 줄인 파라미터 (늘리지는 않음)
+
+        batch_size는 MIN_BATCH_SIZE 아래로 줄이지 않으므로 rate < MIN_BATCH_SIZE × 1000 / RTT이면 한도를 넘을 수 있다.
+
+        Examples:
+            >>> RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5, rtt=20.0).limited_to(60000)
+            RustscanParams(batch_size=1200, timeout=2000, parallel_limit=5)
+            >>> RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5, rtt=1.0).limited_to(6000)
+            RustscanParams(batch_size=500, timeout=2000, parallel_limit=5)
+        """
+        batch_size = int(rate * max(self.rtt, MIN_RTT_MS) / 1000)
+        return replace(self, batch_size=min(self.batch_size, max(MIN_BATCH_SIZE, batch_size)))
+
+    def worst_case_seconds(self, probes: int) -> float:
+        """
+        probes개 포트가 모두 필터링된 경우의 예상 소요 시간 (초): timeout마다 batch_size개씩 처리
+
+        Examples:
+            >>> RustscanParams(batch_size=500, timeout=2000, parallel_limit=5).worst_case_seconds(65535)
+            262.14
+        """
+        return probes / self.batch_size * self.timeout / 1000
+
 
 def get_safe_rustscan_params() -> RustscanParams:
     """
     안전한 rustscan 파라미터 반환 (고정값)
 
+    RTT를 측정하지 않았으므로 pps 추정에는 SAFE_RTT_MS를 쓴다 (LAN 1ms로 가정하면 전역 pps 예산 임대 시
+    batch_size가 과도하게 줄어든다).
+
     Returns:
         RustscanParams: 밸런스 고정 파라미터 (batch_size=10000, timeout=2000, parallel_limit=5, required_ulimit=55000)
 
@@ -27,4 +92,57 @@ def get_safe_rustscan_params() -> RustscanParams:
         >>> get_safe_rustscan_params()
         RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5)
     """
-    return RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5)
+    return RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5, rtt=SAFE_RTT_MS)
+
+
+def rtt_percentile(samples: Sequence[float], percentile: float) -> float:
+    """
+    RTT 샘플 백분위수 (nearest-rank)
+
+    Args:
+        samples: RTT 샘플 (ms, 비어 있으면 안 됨)
+        percentile: 0-100
+
+    Returns:
+        백분위수 RTT (ms)
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def tune_rustscan_params(rtt_samples: Sequence[float]) -> RustscanParams:
+    """
+    서브넷 RTT 샘플로 rustscan 파라미터 계산
+
+    - timeout: p90 RTT × 4 + 100ms (300ms ~ 5000ms로 제한)
+    - batch_size: RTT 구간별 (LAN 10000 → 고지연 2500)
+    - parallel_limit: FD_BUDGET / batch_size (1 ~ 10), ulimit 55000 이내 유지
+    - rtt: p90 RTT (전역 pps 예산 임대 시 batch_size / RTT로 최대 속도 추정)
+
+    Args:
+        rtt_samples: 호스트별 RTT 샘플 (ms). 비어 있으면 안전 모드 고정값
+
+    Returns:
+        RustscanParams
+
+    Examples:
+        >>> tune_rustscan_params([0.4, 0.6, 1.2])
+        RustscanParams(batch_size=10000, timeout=300, parallel_limit=5)
+        >>> tune_rustscan_params([180.0, 220.0, 250.0])
+        RustscanParams(batch_size=2500, timeout=1100, parallel_limit=10)
+    """
+    if not rtt_samples:
+        return get_safe_rustscan_params()
+
+    p90 = rtt_percentile(rtt_samples, 90)
+
+    timeout = int(p90 * TIMEOUT_RTT_FACTOR + TIMEOUT_MARGIN_MS)
+    timeout = max(MIN_TIMEOUT_MS, min(MAX_TIMEOUT_MS, timeout))
+
+    batch_size = next(batch for limit, batch in BATCH_BY_RTT if p90 <= limit)
+    parallel_limit = max(1, min(MAX_PARALLEL_LIMIT, FD_BUDGET // batch_size))
+
+    return RustscanParams(
+        batch_size=batch_size, timeout=timeout, parallel_limit=parallel_limit, rtt=p90
+    )
@@ -0,0 +1,188 @@
+"""서비스 탐지 결과 캐시 모듈 (SQLite, TTL + LRU)
+
+(ip, port, 배너 지문) → 이전 nmap -sV -sC 결과를 저장한다.
+서비스 탐지 전에 배너를 빠르게 읽어 지문이 같으면 nmap 없이 이전 결과를 재사용한다.
+
+- 배너 지문: 접속 직후 서버가 보내는 배너(SSH/FTP/SMTP 등), 배너가 없으면
+  HTTP HEAD 응답의 상태 줄과 Server 헤더 (Date 등 가변 헤더 제외)
+- 둘 다 비어 있는 포트(TLS, SMB, RDP 등)는 지문이 모두 같아 서비스 변경을 감지할 수 없으므로 캐시하지 않음
+- TTL: created_at 기준 만료 (만료 항목은 조회 시 무시, 저장 시 정리)
+- LRU: max_entries 초과 시 last_used가 오래된 항목부터 삭제
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from utils.results_store import PortResult
+
+SERVICE_CACHE_FILENAME = "service_cache.db"
+HOST_SCRIPTS_PORT = 0  # 호스트 스크립트 결과 항목 (port 0, protocol "host")
+
+BANNER_READ_BYTES = 512
+_HTTP_PROBE = b"HEAD / HTTP/1.0\r\n\r\n"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS services (
+    ip           TEXT NOT NULL,
+    port         INTEGER NOT NULL,
+    protocol     TEXT NOT NULL,
+    fingerprint  TEXT NOT NULL,
+    result       TEXT NOT NULL,
+    text         TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    last_used    REAL NOT NULL,
+    PRIMARY KEY (ip, port, protocol)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_services_last_used ON services (last_used);
+"""
+
+
+def _normalize_banner(data: bytes) -> bytes:
+    """배너에서 가변 요소를 제거 (HTTP 응답은 상태 줄 + Server 헤더만 사용)"""
+    if data.startswith(b"HTTP/"):
+        lines = data.split(b"\r\n")
+        kept = [lines[0]] + [line for line in lines[1:] if line.lower().startswith(b"server:")]
+        return b"\n".join(kept)
+    return data.strip()
+
+
+async def grab_banner(ip: str, port: int, timeout: float = 2.0) -> Optional[bytes]:
+    """
+    TCP 접속 후 배너 수집 (배너가 없으면 HTTP HEAD 프로브)
+
+    Returns:
+        정규화된 배너 (접속 실패 또는 빈 배너면 None → 캐시 미사용, 항상 nmap 탐지)
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port), timeout=timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+
+    try:
+        try:
+            data = await asyncio.wait_for(reader.read(BANNER_READ_BYTES), timeout=timeout / 2)
+        except asyncio.TimeoutError:
+            data = b""
+
+        if not data:
+            writer.write(_HTTP_PROBE)
+            try:
+                await writer.drain()
+                data = await asyncio.wait_for(reader.read(BANNER_READ_BYTES), timeout=timeout / 2)
+            except (OSError, asyncio.TimeoutError):
+                data = b""
+        return _normalize_banner(data) or None
+    except OSError:
+        return None
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+def banner_fingerprint(banner: bytes) -> str:
+    """배너 지문 (sha256 앞 16바이트)"""
+    return hashlib.sha256(banner).hexdigest()[:32]
+
+
+def host_fingerprint(port_fingerprints: dict[int, str]) -> str:
+    """호스트 스크립트 항목 지문 (포트 집합 + 포트별 지문)"""
+    joined = ",".join(f"{port}:{fp}" for port, fp in sorted(port_fingerprints.items()))
+    return banner_fingerprint(joined.encode())
+
+
+class ServiceCache:
+    """서비스 탐지 결과 영속 캐시"""
+
+    def __init__(self, db_file: Path, ttl_seconds: int, max_entries: int):
+        """
+        Args:
+            db_file: SQLite 파일 경로 (스캔 간 공유)
+            ttl_seconds: 항목 유효 기간 (초)
+            max_entries: 최대 항목 수 (초과 시 LRU 삭제)
+        """
+        self.db_file = Path(db_file)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_file)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(
+        self, ip: str, port: int, fingerprint: str, protocol: str = "tcp"
+    ) -> Optional[tuple[PortResult, str]]:
+        """
+        캐시 조회 (지문 불일치/만료 시 None)
+
+        Returns:
+            (PortResult, nmap -oN 포트 블록 텍스트)
+        """
+        row = self._conn.execute(
+            "SELECT fingerprint, result, text, created_at FROM services "
+            "WHERE ip = ? AND port = ? AND protocol = ?",
+            (ip, port, protocol),
+        ).fetchone()
+
+        now = time.time()
+        if row is None or row[0] != fingerprint or now - row[3] > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE services SET last_used = ? WHERE ip = ? AND port = ? AND protocol = ?",
+                (now, ip, port, protocol),
+            )
+        self.hits += 1
+        return PortResult(**json.loads(row[1])), row[2]
+
+    def put_many(self, entries: list[tuple[str, str, PortResult, str]]) -> None:
+        """
+        캐시 저장 후 만료/LRU 정리
+
+        Args:
+            entries: (ip, fingerprint, PortResult, nmap -oN 포트 블록 텍스트) 목록
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO services "
+                "(ip, port, protocol, fingerprint, result, text, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        ip, result.port, result.protocol, fingerprint,
+                        json.dumps(asdict(result), ensure_ascii=False), text, now, now,
+                    )
+                    for ip, fingerprint, result, text in entries
+                ],
+            )
+            self._conn.execute(
+                "DELETE FROM services WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM services WHERE (ip, port, protocol) IN ("
+                "SELECT ip, port, protocol FROM services ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        """연결 닫기"""
+        self._conn.close()
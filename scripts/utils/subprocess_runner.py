@@ -1,7 +1,8 @@
 """비동기 subprocess 실행 래퍼 모듈"""
 import asyncio
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 
 class CommandResult:
@@ -21,6 +22,30 @@ class CommandResult:
         return f"CommandResult(returncode={self.returncode}, success={self.success})"
 
 
+async def _spawn(
+    cmd: list[str], stdin_pipe: bool, cwd: Optional[Path], **kwargs
+) -> asyncio.subprocess.Process:
+    """
+    자식 프로세스 시작 (stdout/stderr 파이프)
+
+    실행 파일을 절대 경로로 지정하고 close_fds=False로 두면 CPython이 fork 대신 posix_spawn(vfork)을 쓴다.
+    스캐너는 로그 스레드가 도는 멀티스레드 프로세스이므로 fork는 Python 3.12+에서 실행마다
+    DeprecationWarning을 내고 잠금 상태를 자식에 복제할 수 있다. Python이 여는 fd는 기본적으로
+    상속되지 않으므로(O_CLOEXEC) close_fds=False여도 파이프 외의 fd는 자식에 넘어가지 않는다.
+    cwd를 지정하면 posix_spawn을 쓸 수 없어 기존 fork_exec 경로로 실행된다.
+    """
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        executable=shutil.which(cmd[0]) or cmd[0],
+        close_fds=False,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        stdin=asyncio.subprocess.PIPE if stdin_pipe else None,
+        cwd=str(cwd) if cwd else None,
+        **kwargs,
+    )
+
+
 async def run_command(
     cmd: list[str],
     timeout: Optional[int] = None,
@@ -51,13 +76,7 @@ async def run_command(
         if "-S" not in cmd:
             cmd = [cmd[0], "-S"] + cmd[1:]
 
-    proc = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        stdin=asyncio.subprocess.PIPE if sudo_password else None,
-        cwd=str(cwd) if cwd else None,
-    )
+    proc = await _spawn(cmd, bool(sudo_password), cwd)
 
     try:
         stdout_data, stderr_data = await asyncio.wait_for(
@@ -85,6 +104,254 @@ async def run_command(
         raise
 
 
+class CommandStream:
+    """
+    줄 단위 비동기 명령어 실행 스트림
+
+    run_command와 동일한 타임아웃/kill/sudo/check 동작을 제공하되,
+    stdout을 메모리에 모으지 않고 한 줄씩 전달한다.
+
+    - 백프레셔: 소비자가 다음 줄을 요청할 때만 파이프를 읽으므로, 소비가 느리면
+      OS 파이프 버퍼가 차서 자식 프로세스의 출력이 자연스럽게 멈춘다
+    - tee_file: 원본 stdout 바이트를 그대로 파일에 기록 (메모리에 보관하지 않음)
+    - stderr: 백그라운드에서 비우며 마지막 STDERR_TAIL_BYTES만 보관
+
+    Usage:
+        async with CommandStream(["nmap", "-sn", "10.0.0.0/24", "-oG", "-"]) as stream:
+            async for line in stream:
+                handle(line)
+        stream.returncode  # 0
+    """
+
+    STDERR_TAIL_BYTES = 64 * 1024
+    LINE_LIMIT = 1024 * 1024  # 한 줄 최대 길이 (asyncio 기본 64KB보다 크게)
+    CHUNK_SIZE = 64 * 1024    # chunks() 1회 읽기 크기
+
+    def __init__(
+        self,
+        cmd: list[str],
+        timeout: Optional[int] = None,
+        sudo_password: Optional[str] = None,
+        check: bool = False,
+        cwd: Optional[Path] = None,
+        tee_file: Optional[Path] = None,
+    ):
+        """
+        Args:
+            cmd: 실행할 명령어 리스트
+            timeout: 전체 실행 타임아웃 (초 단위, None이면 무제한)
+            sudo_password: sudo 비밀번호 (필요한 경우)
+            check: True인 경우 returncode가 0이 아니면 반복 종료 시 예외 발생
+            cwd: 작업 디렉토리 (지정하지 않으면 현재 디렉토리)
+            tee_file: stdout 원본을 기록할 파일 경로 (None이면 기록 안 함)
+        """
+        # sudo 명령에 -S 플래그 추가 (stdin에서 비밀번호 읽기)
+        if sudo_password and cmd and cmd[0] == "sudo" and "-S" not in cmd:
+            cmd = [cmd[0], "-S"] + cmd[1:]
+
+        self.cmd = cmd
+        self.timeout = timeout
+        self.sudo_password = sudo_password
+        self.check = check
+        self.cwd = cwd
+        self.tee_file = Path(tee_file) if tee_file else None
+
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._deadline: Optional[float] = None
+        self._tee = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_tail = bytearray()
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """종료 코드 (실행 중이면 None)"""
+        if self._proc is None or self._proc.returncode is None:
+            return None
+        return self._proc.returncode
+
+    @property
+    def stderr(self) -> str:
+        """보관된 stderr 마지막 부분"""
+        return self._stderr_tail.decode(errors="replace")
+
+    async def __aenter__(self) -> "CommandStream":
+        self._proc = await _spawn(self.cmd, bool(self.sudo_password), self.cwd, limit=self.LINE_LIMIT)
+
+        loop = asyncio.get_running_loop()
+        if self.timeout is not None:
+            self._deadline = loop.time() + self.timeout
+
+        if self.sudo_password:
+            self._proc.stdin.write(self.sudo_password.encode())
+            self._proc.stdin.close()
+
+        if self.tee_file:
+            self.tee_file.parent.mkdir(parents=True, exist_ok=True)
+            self._tee = open(self.tee_file, "wb")
+
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # 반복 중단/예외/타임아웃 시 프로세스 kill (run_command와 동일)
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.kill()
+            await self._proc.wait()
+
+        if self._stderr_task is not None:
+            await asyncio.gather(self._stderr_task, return_exceptions=True)
+
+        if self._tee is not None:
+            self._tee.close()
+            self._tee = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iter_lines()
+
+    def _remaining(self) -> Optional[float]:
+        """남은 타임아웃 (초)"""
+        if self._deadline is None:
+            return None
+        remaining = self._deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return remaining
+
+    async def _iter_lines(self) -> AsyncIterator[str]:
+        """stdout을 한 줄씩 decode하여 yield"""
+        if self._proc is None:
+            raise RuntimeError("CommandStream은 async with 블록 안에서 사용해야 합니다")
+
+        while True:
+            line = await asyncio.wait_for(
+                self._proc.stdout.readline(), timeout=self._remaining()
+            )
+            if not line:
+                break
+            if self._tee is not None:
+                self._tee.write(line)
+            yield line.decode(errors="replace").rstrip("\r\n")
+
+        await self._finish()
+
+    async def chunks(self, size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        stdout을 청크 단위(bytes)로 yield
+
+        줄마다 await하는 __aiter__와 달리 파이프에 쌓인 출력을 한 번에 읽으므로,
+        출력이 많은 명령(nmap -oX 등)에서 이벤트 루프 왕복 횟수가 줄 수가 아닌 청크 수에 비례한다.
+        줄 경계는 보장하지 않으므로 스트림 파서(utils.nmap_parser)와 함께 사용한다.
+
+        Args:
+            size: 최대 청크 크기 (기본값: CHUNK_SIZE)
+        """
+        if self._proc is None:
+            raise RuntimeError("CommandStream은 async with 블록 안에서 사용해야 합니다")
+
+        while True:
+            chunk = await asyncio.wait_for(
+                self._proc.stdout.read(size or self.CHUNK_SIZE), timeout=self._remaining()
+            )
+            if not chunk:
+                break
+            if self._tee is not None:
+                self._tee.write(chunk)
+            yield chunk
+
+        await self._finish()
+
+    async def _finish(self) -> None:
+        """프로세스 종료 대기 + check 처리"""
+        await asyncio.wait_for(self._proc.wait(), timeout=self._remaining())
+        if self._stderr_task is not None:
+            await self._stderr_task
+
+        if self.check and self._proc.returncode != 0:
+            raise RuntimeError(
+                f"명령어 실행 실패 (exit code {self._proc.returncode}): {' '.join(self.cmd)}\n"
+                f"stderr: {self.stderr}"
+            )
+
+    async def _drain_stderr(self) -> None:
+        """stderr 파이프를 비워 자식 프로세스 블로킹 방지 (마지막 부분만 보관)"""
+        while True:
+            chunk = await self._proc.stderr.read(8192)
+            if not chunk:
+                break
+            self._stderr_tail += chunk
+            if len(self._stderr_tail) > self.STDERR_TAIL_BYTES:
+                del self._stderr_tail[:-self.STDERR_TAIL_BYTES]
+
+
+async def stream_command(
+    cmd: list[str],
+    timeout: Optional[int] = None,
+    sudo_password: Optional[str] = None,
+    check: bool = False,
+    cwd: Optional[Path] = None,
+    tee_file: Optional[Path] = None,
+) -> AsyncIterator[str]:
+    """
+    비동기로 명령어를 실행하고 stdout을 한 줄씩 yield (CommandStream 간편 래퍼)
+
+    run_command와 달리 출력 전체를 버퍼링하지 않으므로 결과를 발견 즉시 처리할 수 있다.
+    반복을 중단하면 (break, 예외) 프로세스를 kill한다. contextlib.aclosing과 함께 사용 권장.
+
+    Args:
+        cmd: 실행할 명령어 리스트
+        timeout: 전체 실행 타임아웃 (초 단위, None이면 무제한)
+        sudo_password: sudo 비밀번호 (필요한 경우)
+        check: True인 경우 returncode가 0이 아니면 예외 발생
+        cwd: 작업 디렉토리 (지정하지 않으면 현재 디렉토리)
+        tee_file: stdout 원본을 기록할 파일 경로
+
+    Yields:
+        개행 문자가 제거된 stdout 한 줄
+
+    Raises:
+        asyncio.TimeoutError: 타임아웃 발생 시 (프로세스는 kill됨)
+        RuntimeError: check=True이고 명령어 실행 실패 시
+    """
+    async with CommandStream(
+        cmd,
+        timeout=timeout,
+        sudo_password=sudo_password,
+        check=check,
+        cwd=cwd,
+        tee_file=tee_file,
+    ) as stream:
+        async for line in stream:
+            yield line
+
+
+async def stream_command_chunks(
+    cmd: list[str],
+    timeout: Optional[int] = None,
+    sudo_password: Optional[str] = None,
+    check: bool = False,
+    cwd: Optional[Path] = None,
+    tee_file: Optional[Path] = None,
+) -> AsyncIterator[bytes]:
+    """
+    비동기로 명령어를 실행하고 stdout을 청크(bytes) 단위로 yield (CommandStream.chunks 간편 래퍼)
+
+    인자/예외는 stream_command와 동일. contextlib.aclosing과 함께 사용 권장.
+
+    Yields:
+        stdout 청크 (줄 경계와 무관)
+    """
+    async with CommandStream(
+        cmd,
+        timeout=timeout,
+        sudo_password=sudo_password,
+        check=check,
+        cwd=cwd,
+        tee_file=tee_file,
+    ) as stream:
+        async for chunk in stream.chunks():
+            yield chunk
+
+
 async def run_command_with_retry(
     cmd: list[str],
     max_retries: int = 3,
@@ -0,0 +1 @@
+"""단위 테스트 (python -m unittest, 각 모듈이 scripts/를 sys.path에 추가)"""
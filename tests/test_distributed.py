@@ -0,0 +1,160 @@
+"""분산 스캔 코디네이터 임대/완료 프로토콜 테스트"""
+import asyncio
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from scanner.config import Config  # noqa: E402
+from scanner.distributed import Coordinator, split_work_units  # noqa: E402
+from scanner.journal import ScanJournal  # noqa: E402
+from scanner.logger import ColorLogger  # noqa: E402
+from utils.results_store import RESULTS_DB_FILENAME, ResultsStore  # noqa: E402
+
+
+class CoordinatorProtocolTest(unittest.TestCase):
+    """lease → heartbeat → complete/fail (HTTP 없이 메서드 직접 호출)"""
+
+    @classmethod
+    def setUpClass(cls):
+        ColorLogger.configure(level="error", async_output=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        ColorLogger.configure(level="debug")
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.scan_dir = Path(self._tmp.name)
+        self.coordinators: list[Coordinator] = []
+
+    def tearDown(self):
+        for coordinator in self.coordinators:
+            coordinator.journal.close()
+            coordinator.results_store.close()
+        self._tmp.cleanup()
+
+    def _coordinator(self, subnets: list[str], **kwargs) -> Coordinator:
+        json_file = self.scan_dir / "targets.json"
+        json_file.write_text(json.dumps({"subnets": subnets}))
+        config = Config(
+            script_dir=self.scan_dir, scan_dir=self.scan_dir, json_file=json_file,
+            subnets=subnets, exclude_ips=kwargs.pop("exclude_ips", []),
+        )
+        coordinator = Coordinator(config, **kwargs)
+        self.coordinators.append(coordinator)
+        return coordinator
+
+    def test_lease_hands_out_units_in_order(self):
+        coordinator = self._coordinator(["10.0.0.0/23"], unit_prefix=24)
+
+        first = coordinator.lease("w1")
+        second = coordinator.lease("w2")
+        empty = coordinator.lease("w3")
+
+        self.assertEqual(first["unit"]["id"], "10.0.0.0/24")
+        self.assertEqual(first["unit"]["targets"], ["10.0.0.0/24"])
+        self.assertEqual(second["unit"]["id"], "10.0.1.0/24")
+        self.assertIsNone(empty["unit"])
+        self.assertFalse(empty["done"])
+        self.assertEqual(coordinator.status()["leased"], {"10.0.0.0/24": "w1", "10.0.1.0/24": "w2"})
+
+    def test_lease_sends_clipped_excludes(self):
+        coordinator = self._coordinator(
+            ["10.0.0.0/24"], unit_prefix=24, exclude_ips=["10.0.0.250-10.0.1.10", "172.16.0.1"]
+        )
+        unit = coordinator.lease("w1")["unit"]
+        self.assertEqual(unit["exclude"], ["10.0.0.250/31", "10.0.0.252/30"])
+
+    def test_heartbeat_only_for_lease_holder(self):
+        coordinator = self._coordinator(["10.0.0.0/24"], unit_prefix=24)
+        unit = coordinator.lease("w1")["unit"]["id"]
+
+        self.assertTrue(coordinator.heartbeat("w1", unit)["ok"])
+        self.assertFalse(coordinator.heartbeat("w2", unit)["ok"])
+        self.assertFalse(coordinator.heartbeat("w1", "10.9.9.0/24")["ok"])
+
+    def test_complete_merges_results_inside_unit(self):
+        coordinator = self._coordinator(["10.0.0.0/24"], unit_prefix=24)
+        unit = coordinator.lease("w1")["unit"]["id"]
+
+        response = coordinator.complete("w1", unit, {
+            "alive": ["10.0.0.9", "10.0.0.10", "10.0.5.1"],
+            "hosts": [
+                {"host": "10.0.0.10", "state": "up", "ports": [{"port": 22, "protocol": "tcp", "state": "open"}]},
+                {"host": "10.0.5.1", "state": "up", "ports": []},
+            ],
+            "scans": {"10.0.0.10": "22/tcp open ssh\n", "10.0.5.1": "outside\n"},
+        })
+
+        self.assertTrue(response["ok"])
+        self.assertTrue(coordinator.finished.is_set())
+        self.assertEqual((self.scan_dir / "alive_hosts_10_0_0_0_24.txt").read_text(), "10.0.0.9\n10.0.0.10\n")
+        self.assertTrue((self.scan_dir / "scan_10_0_0_10.nmap").exists())
+        self.assertFalse((self.scan_dir / "scan_10_0_5_1.nmap").exists())
+        coordinator.results_store.close()
+        store = ResultsStore(self.scan_dir / RESULTS_DB_FILENAME, read_only=True)
+        try:
+            self.assertEqual([host.host for host in store.host_results()], ["10.0.0.10"])
+        finally:
+            store.close()
+        coordinator.journal.close()
+        self.assertEqual(ScanJournal(self.scan_dir, read_only=True).subnets_done, {unit})
+
+    def test_complete_rejects_stale_lease(self):
+        coordinator = self._coordinator(["10.0.0.0/24"], unit_prefix=24)
+        unit = coordinator.lease("w1")["unit"]["id"]
+
+        self.assertFalse(coordinator.complete("w2", unit, {"alive": []})["ok"])
+        self.assertFalse(coordinator.complete("w1", "10.9.9.0/24", {"alive": []})["ok"])
+        self.assertEqual(coordinator.status()["done"], 0)
+
+    def test_fail_requeues_until_max_attempts(self):
+        coordinator = self._coordinator(["10.0.0.0/24"], unit_prefix=24, max_attempts=2)
+
+        unit = coordinator.lease("w1")["unit"]["id"]
+        self.assertTrue(coordinator.fail("w1", unit, "boom")["ok"])
+        self.assertEqual(coordinator.status()["pending"], 1)
+
+        self.assertEqual(coordinator.lease("w2")["unit"]["id"], unit)
+        self.assertFalse(coordinator.fail("w1", unit, "stale")["ok"])
+        self.assertTrue(coordinator.fail("w2", unit, "boom")["ok"])
+
+        status = coordinator.status()
+        self.assertEqual((status["pending"], status["done"], status["failed"]), (0, 0, [unit]))
+        self.assertTrue(coordinator.finished.is_set())
+        self.assertNotIn(unit, ScanJournal(self.scan_dir, read_only=True).subnets_done)
+
+    def test_resume_skips_completed_units(self):
+        coordinator = self._coordinator(["10.0.0.0/23"], unit_prefix=24)
+        unit = coordinator.lease("w1")["unit"]["id"]
+        coordinator.complete("w1", unit, {"alive": []})
+        coordinator.journal.close()
+        coordinator.results_store.close()
+
+        resumed = self._coordinator(["10.0.0.0/23"], unit_prefix=24)
+        self.assertEqual(resumed.done, {"10.0.0.0/24"})
+        self.assertEqual(resumed.lease("w1")["unit"]["id"], "10.0.1.0/24")
+
+    def test_serve_refuses_public_bind_without_token(self):
+        coordinator = self._coordinator(["10.0.0.0/24"], unit_prefix=24)
+        with self.assertRaises(ValueError):
+            asyncio.run(coordinator.serve("0.0.0.0", 0))
+
+    def test_split_work_units_repacks_scan_units(self):
+        units = split_work_units(
+            ["10.2.0.1/32+2", "10.3.0.0/31"], 31,
+            {"10.2.0.1/32+2": ["10.2.0.1/32", "10.2.0.3/32", "10.2.0.5/32"]},
+        )
+        self.assertEqual(units, {
+            "10.2.0.1/32+1": ["10.2.0.1/32", "10.2.0.3/32"],
+            "10.2.0.5/32": ["10.2.0.5/32"],
+            "10.3.0.0/31": ["10.3.0.0/31"],
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""ExclusionIndex 구간 경계 테스트"""
+import ipaddress
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from utils.exclusion import ExclusionIndex  # noqa: E402
+
+
+def ip_int(ip: str) -> int:
+    return int(ipaddress.ip_address(ip))
+
+
+class ExclusionIndexBoundaryTest(unittest.TestCase):
+    """구간 시작/끝 주소와 바로 옆 주소"""
+
+    def setUp(self):
+        self.index = ExclusionIndex(["10.0.0.0/30", "10.0.0.10-10.0.0.12", "192.168.1.0/24", "2001:db8::/127"])
+
+    def test_range_edges(self):
+        cases = {
+            "9.255.255.255": False,
+            "10.0.0.0": True,
+            "10.0.0.3": True,
+            "10.0.0.4": False,
+            "10.0.0.9": False,
+            "10.0.0.10": True,
+            "10.0.0.12": True,
+            "10.0.0.13": False,
+            "192.168.0.255": False,
+            "192.168.1.0": True,
+            "192.168.1.255": True,
+            "192.168.2.0": False,
+        }
+        for ip, excluded in cases.items():
+            with self.subTest(ip=ip):
+                self.assertEqual(ip in self.index, excluded)
+
+    def test_ipv6_edges(self):
+        self.assertIn("2001:db8::", self.index)
+        self.assertIn("2001:db8::1", self.index)
+        self.assertNotIn("2001:db8::2", self.index)
+
+    def test_address_space_limits(self):
+        index = ExclusionIndex(["0.0.0.0", "255.255.255.255"])
+        self.assertIn("0.0.0.0", index)
+        self.assertIn("255.255.255.255", index)
+        self.assertNotIn("0.0.0.1", index)
+        self.assertNotIn("255.255.255.254", index)
+
+    def test_invalid_host_is_not_excluded(self):
+        self.assertNotIn("not-an-ip", self.index)
+
+    def test_adjacent_entries_merge(self):
+        index = ExclusionIndex(["10.1.0.0/25", "10.1.0.128/25", "10.1.1.0"])
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.address_count, 257)
+
+    def test_filter_matches_contains(self):
+        hosts = [f"10.0.0.{i}" for i in range(16)] + ["192.168.1.1", "192.168.2.1"]
+        self.assertEqual(self.index.filter(hosts), [host for host in hosts if host not in self.index])
+
+    def test_filter_mixed_versions(self):
+        self.assertEqual(self.index.filter(["10.0.0.4", "2001:db8::1", "2001:db8::2"]), ["10.0.0.4", "2001:db8::2"])
+
+    def test_overlapping_is_clipped(self):
+        self.assertEqual(
+            self.index.overlapping(ip_int("10.0.0.2"), ip_int("10.0.0.10")),
+            [(ip_int("10.0.0.2"), ip_int("10.0.0.3")), (ip_int("10.0.0.10"), ip_int("10.0.0.10"))],
+        )
+        self.assertEqual(self.index.overlapping(ip_int("10.0.0.4"), ip_int("10.0.0.9")), [])
+
+    def test_covers(self):
+        self.assertTrue(self.index.covers(ip_int("192.168.1.0"), ip_int("192.168.1.255")))
+        self.assertTrue(self.index.covers(ip_int("10.0.0.1"), ip_int("10.0.0.2")))
+        self.assertFalse(self.index.covers(ip_int("10.0.0.0"), ip_int("10.0.0.4")))
+
+    def test_write_excludefile_only_overlaps(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "exclude.txt"
+            count = self.index.write_excludefile(path, [ipaddress.ip_network("10.0.0.0/29")])
+            self.assertEqual(count, 1)
+            self.assertEqual(path.read_text().split(), ["10.0.0.0/30"])
+
+            missing = Path(tmp) / "none.txt"
+            self.assertEqual(self.index.write_excludefile(missing, [ipaddress.ip_network("172.16.0.0/24")]), 0)
+            self.assertFalse(missing.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
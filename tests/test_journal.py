@@ -0,0 +1,80 @@
+"""ScanJournal 재개(replay) 테스트"""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from scanner.journal import JOURNAL_FILENAME, ScanJournal  # noqa: E402
+
+
+class ScanJournalResumeTest(unittest.TestCase):
+    """기록 → 재시작 후 재생"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.scan_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_progress(self) -> None:
+        journal = ScanJournal(self.scan_dir)
+        journal.record_phase1("10.0.0.0/24", 3)
+        journal.record_ports("10.0.0.1", [22, 80])
+        journal.record_ports("10.0.0.2", [])
+        journal.record_host("10.0.0.1")
+        journal.record_subnet("10.0.0.0/24")
+        journal.record_phase1("10.0.1.0/24", 1)
+        journal.close()
+
+    def test_replay_restores_progress(self):
+        self._write_progress()
+
+        journal = ScanJournal(self.scan_dir)
+        try:
+            self.assertTrue(journal.has_progress)
+            self.assertEqual(journal.phase1_done, {"10.0.0.0/24": 3, "10.0.1.0/24": 1})
+            self.assertEqual(journal.subnets_done, {"10.0.0.0/24"})
+            self.assertEqual(journal.known_ports("10.0.0.1"), [22, 80])
+            self.assertEqual(journal.known_ports("10.0.0.2"), [])
+            self.assertIsNone(journal.known_ports("10.0.0.3"))
+            self.assertEqual(journal.hosts_done, {"10.0.0.1"})
+        finally:
+            journal.close()
+
+    def test_resume_appends_to_existing_journal(self):
+        self._write_progress()
+
+        journal = ScanJournal(self.scan_dir)
+        journal.record_subnet("10.0.1.0/24")
+        journal.close()
+
+        self.assertEqual(ScanJournal(self.scan_dir, read_only=True).subnets_done, {"10.0.0.0/24", "10.0.1.0/24"})
+
+    def test_truncated_last_line_is_ignored(self):
+        self._write_progress()
+        with open(self.scan_dir / JOURNAL_FILENAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "subnet_done", "subnet": "10.0.1.0/24"})[:20])
+
+        journal = ScanJournal(self.scan_dir, read_only=True)
+        self.assertEqual(journal.subnets_done, {"10.0.0.0/24"})
+
+    def test_read_only_does_not_create_journal(self):
+        scan_dir = self.scan_dir / "missing"
+        journal = ScanJournal(scan_dir, read_only=True)
+        journal.close()
+
+        self.assertFalse(journal.has_progress)
+        self.assertFalse(scan_dir.exists())
+
+    def test_empty_journal_has_no_progress(self):
+        journal = ScanJournal(self.scan_dir)
+        journal.close()
+        self.assertFalse(ScanJournal(self.scan_dir, read_only=True).has_progress)
+
+
+if __name__ == "__main__":
+    unittest.main()
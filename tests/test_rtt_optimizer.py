@@ -0,0 +1,69 @@
+"""RustscanParams pps 추정 / 예산 축소 테스트"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from utils.rtt_optimizer import (  # noqa: E402
+    MIN_BATCH_SIZE,
+    SAFE_RTT_MS,
+    RustscanParams,
+    get_safe_rustscan_params,
+    tune_rustscan_params,
+)
+
+
+class LimitedToTest(unittest.TestCase):
+    """RustscanParams.limited_to"""
+
+    def test_scales_batch_by_rtt(self):
+        params = RustscanParams(batch_size=10000, timeout=2000, parallel_limit=5, rtt=20.0)
+        limited = params.limited_to(60000)
+        self.assertEqual(limited.batch_size, 1200)
+        self.assertLessEqual(limited.packet_rate, 60000)
+        self.assertEqual((limited.timeout, limited.parallel_limit, limited.rtt), (2000, 5, 20.0))
+
+    def test_never_grows(self):
+        params = RustscanParams(batch_size=2500, timeout=1100, parallel_limit=10, rtt=200.0)
+        self.assertEqual(params.limited_to(10**9).batch_size, 2500)
+
+    def test_floor(self):
+        params = RustscanParams(batch_size=10000, timeout=300, parallel_limit=5, rtt=0.5)
+        self.assertEqual(params.limited_to(1).batch_size, MIN_BATCH_SIZE)
+        self.assertEqual(params.limited_to(0).batch_size, MIN_BATCH_SIZE)
+
+    def test_floor_does_not_exceed_original_batch(self):
+        params = RustscanParams(batch_size=100, timeout=300, parallel_limit=1, rtt=1.0)
+        self.assertEqual(params.limited_to(1).batch_size, 100)
+
+    def test_safe_params_keep_useful_batch(self):
+        params = get_safe_rustscan_params()
+        self.assertEqual(params.rtt, SAFE_RTT_MS)
+        self.assertEqual(params.limited_to(20000).batch_size, 1000)
+        # 기본 --max-rate 30000을 5개 작업이 나눠 쓰는 경우 (6000 × 50ms = 300 → 하한)
+        self.assertEqual(params.limited_to(6000).batch_size, MIN_BATCH_SIZE)
+
+    def test_worst_case_seconds(self):
+        params = RustscanParams(batch_size=500, timeout=2000, parallel_limit=5)
+        self.assertAlmostEqual(params.worst_case_seconds(65535), 262.14)
+        self.assertAlmostEqual(params.worst_case_seconds(0), 0.0)
+
+
+class PacketRateTest(unittest.TestCase):
+    """packet_rate / tune_rustscan_params"""
+
+    def test_packet_rate_uses_rtt_floor(self):
+        self.assertEqual(RustscanParams(batch_size=1000, timeout=300, parallel_limit=1, rtt=0.1).packet_rate, 1_000_000)
+
+    def test_tuned_params_carry_p90(self):
+        params = tune_rustscan_params([10.0, 20.0, 30.0, 40.0])
+        self.assertEqual(params.rtt, 40.0)
+        self.assertEqual(params.packet_rate, int(params.batch_size * 1000 / 40.0))
+
+    def test_empty_samples_fall_back_to_safe(self):
+        self.assertEqual(tune_rustscan_params([]), get_safe_rustscan_params())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""타겟 로드 / 작은 CIDR 묶음 테스트"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from utils.ip_ranges import MAX_PACKED_CIDRS, cidr_size, pack_cidrs, unit_name  # noqa: E402
+from utils.json_loader import PACK_UNIT_SIZE, load_targets  # noqa: E402
+
+
+class PackCidrsTest(unittest.TestCase):
+    """pack_cidrs 묶음 경계"""
+
+    def test_groups_up_to_max_addresses(self):
+        cidrs = [f"10.0.{i}.1/32" for i in range(5)]
+        self.assertEqual(
+            list(pack_cidrs(cidrs, 2)),
+            [cidrs[0:2], cidrs[2:4], cidrs[4:5]],
+        )
+
+    def test_large_cidr_is_alone_and_flushes_group(self):
+        groups = list(pack_cidrs(
+            ["10.0.0.1/32", "10.0.1.0/24", "10.0.2.1/32", "10.0.2.8/30"], 256, max_cidr_size=16
+        ))
+        self.assertEqual(groups, [["10.0.0.1/32"], ["10.0.1.0/24"], ["10.0.2.1/32", "10.0.2.8/30"]])
+
+    def test_ip_version_change_starts_new_group(self):
+        groups = list(pack_cidrs(["10.0.0.1/32", "::1/128", "::2/128"], 256))
+        self.assertEqual(groups, [["10.0.0.1/32"], ["::1/128", "::2/128"]])
+
+    def test_max_cidrs(self):
+        cidrs = [f"10.{i // 256}.{i % 256}.1/32" for i in range(MAX_PACKED_CIDRS + 1)]
+        groups = list(pack_cidrs(cidrs, 1 << 20))
+        self.assertEqual([len(group) for group in groups], [MAX_PACKED_CIDRS, 1])
+
+    def test_unit_name(self):
+        self.assertEqual(unit_name(["10.0.0.1/32"]), "10.0.0.1/32")
+        self.assertEqual(unit_name(["10.0.0.1/32", "10.0.0.3/32", "10.0.0.5/32"]), "10.0.0.1/32+2")
+
+
+class LoadTargetsPackingTest(unittest.TestCase):
+    """load_targets: 아주 작은 CIDR만 묶고 일반 서브넷은 유지"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _load(self, lines: list[str], **kwargs):
+        path = self.dir / "targets.txt"
+        path.write_text("\n".join(lines) + "\n")
+        return load_targets(path, **kwargs)
+
+    def test_separate_24s_stay_separate(self):
+        subnets = ["10.10.0.0/24", "10.10.2.0/24", "10.10.4.0/24", "10.10.6.0/24"]
+        targets = self._load(subnets)
+        self.assertEqual(targets.subnets, subnets)
+        self.assertEqual(targets.units, {})
+
+    def test_scattered_ips_are_packed(self):
+        ips = [f"10.{20 + i // 256}.{i % 256}.1" for i in range(PACK_UNIT_SIZE + 10)]
+        targets = self._load(ips)
+
+        self.assertEqual(len(targets.subnets), 2)
+        packed = [targets.units[name] for name in targets.subnets]
+        self.assertEqual([len(group) for group in packed], [PACK_UNIT_SIZE, 10])
+        self.assertEqual(targets.subnets[0], f"10.20.0.1/32+{PACK_UNIT_SIZE - 1}")
+        self.assertEqual(sorted(cidr for group in packed for cidr in group), sorted(f"{ip}/32" for ip in ips))
+
+    def test_tiny_cidrs_around_a_24(self):
+        targets = self._load(["10.30.0.1", "10.30.0.8/29", "10.30.1.0/24", "10.30.2.5", "10.30.2.9"])
+
+        self.assertEqual(targets.subnets, ["10.30.0.1/32+1", "10.30.1.0/24", "10.30.2.5/32+1"])
+        self.assertEqual(targets.units["10.30.0.1/32+1"], ["10.30.0.1/32", "10.30.0.8/29"])
+        self.assertNotIn("10.30.1.0/24", targets.units)
+
+    def test_mid_size_cidrs_are_not_packed(self):
+        targets = self._load(["10.40.0.0/27", "10.40.0.64/26"])
+        self.assertEqual(targets.subnets, ["10.40.0.0/27", "10.40.0.64/26"])
+        self.assertEqual(targets.units, {})
+
+    def test_packed_units_respect_unit_size(self):
+        targets = self._load([f"10.50.{i}.0/28" for i in range(40)])
+        for name in targets.subnets:
+            self.assertLessEqual(sum(cidr_size(cidr) for cidr in targets.units.get(name, [name])), PACK_UNIT_SIZE)
+
+    def test_split_prefix_splits_large_networks(self):
+        targets = self._load(["10.60.0.0/22"], split_prefix=23)
+        self.assertEqual(targets.subnets, ["10.60.0.0/23", "10.60.2.0/23"])
+
+
+if __name__ == "__main__":
+    unittest.main()